@@ -0,0 +1,258 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.controllers import archive as archive_controller
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.table import Table
+from app.models.waitstaff import Waitstaff
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+GROUP_BYS = ("item", "category", "waiter", "table", "payment_method")
+MAX_BUCKETS = 10000
+FETCH_BATCH_SIZE = 50000
+
+# 1970-01-01 was a Thursday: shifting by three days makes Monday weekday 0
+# and week buckets start on Mondays
+WEEKDAY_OFFSET = 3
+WEEK_ORIGIN = -WEEKDAY_OFFSET * 86400
+
+# Group key for rows without a waiter/table/category
+NO_KEY = -1
+
+def to_seconds(values: Sequence[datetime]) -> np.ndarray:
+    """Naive datetimes as int64 seconds since the epoch"""
+    return np.array(values, dtype="datetime64[s]").astype(np.int64)
+
+def to_ids(values: Sequence[Optional[int]]) -> np.ndarray:
+    """Nullable integer ids as int64, with None mapped to NO_KEY"""
+    return np.nan_to_num(np.array(values, dtype=np.float64), nan=NO_KEY).astype(np.int64)
+
+def _fetch_columns(db: Session, statement, converters: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Stream a select in FETCH_BATCH_SIZE partitions and convert each
+    partition to NumPy columns, so no full list of row objects is built.
+    """
+    result = db.execute(statement.execution_options(yield_per=FETCH_BATCH_SIZE))
+    chunks: Dict[str, List[np.ndarray]] = {name: [] for name in converters}
+    for partition in result.partitions():
+        columns = list(zip(*partition))
+        for (name, convert), column in zip(converters.items(), columns):
+            chunks[name].append(convert(column))
+    return {
+        name: np.concatenate(parts) if parts else convert(())
+        for (name, convert), parts in zip(converters.items(), chunks.values())
+    }
+
+def load_item_columns(db: Session, start: datetime, end: datetime) -> Dict[str, np.ndarray]:
+    """
+    Every order item sold in [start, end), hot and archived, in one columnar
+    fetch. Cancelled items and the items of cancelled orders are left out.
+    """
+    order_items = archive_controller.order_items_source(db, start, end)
+    return _fetch_columns(db, select(
+        order_items.c.order_date, order_items.c.order_id, order_items.c.menu_item_id,
+        order_items.c.waiter_id, order_items.c.table_id,
+        order_items.c.quantity, order_items.c.line_total
+    ).where(
+        order_items.c.status != 'cancelled', order_items.c.order_status != 'cancelled'
+    ), {
+        "timestamp": to_seconds,
+        "order_id": to_ids,
+        "menu_item_id": to_ids,
+        "waiter_id": to_ids,
+        "table_id": to_ids,
+        "quantity": lambda column: np.array(column, dtype=np.float64),
+        "revenue": lambda column: np.array(column, dtype=np.float64),
+    })
+
+def load_payment_columns(db: Session, start: datetime, end: datetime) -> Dict[str, np.ndarray]:
+    """Every payment in [start, end), hot and archived, in one columnar fetch"""
+    payments = archive_controller.payments_source(db, start, end)
+    return _fetch_columns(db, select(
+        payments.c.payment_date, payments.c.order_id, payments.c.payment_method, payments.c.amount
+    ), {
+        "timestamp": to_seconds,
+        "order_id": to_ids,
+        "payment_method": lambda column: np.array(column, dtype=object).astype(str),
+        "revenue": lambda column: np.array(column, dtype=np.float64),
+    })
+
+def item_positions(item_ids: np.ndarray, menu_item_ids: np.ndarray):
+    """
+    Index of each row's item in the sorted item_ids, and a mask of the rows
+    whose item is in item_ids (lines of deleted items are not)
+    """
+    position = np.searchsorted(item_ids, menu_item_ids)
+    known = position < len(item_ids)
+    known[known] = item_ids[position[known]] == menu_item_ids[known]
+    return position, known
+
+def bucket_edges(start: datetime, end: datetime, bucket: str) -> np.ndarray:
+    """Start of every bucket overlapping [start, end), in epoch seconds"""
+    step = BUCKET_SECONDS[bucket]
+    origin = WEEK_ORIGIN if bucket == "week" else 0
+    start_s, end_s = to_seconds([start, end])
+    first = origin + ((start_s - origin) // step) * step
+    return np.arange(first, end_s, step, dtype=np.int64)
+
+def count_distinct(cells: np.ndarray, order_ids: np.ndarray, size: int) -> np.ndarray:
+    """Number of distinct orders per cell"""
+    if not len(cells):
+        return np.zeros(size, dtype=np.int64)
+    stride = np.int64(order_ids.max()) + 1
+    # Sort and keep first occurrences; cheaper than np.unique for plain int64
+    pairs = np.sort(cells.astype(np.int64) * stride + order_ids, kind="quicksort")
+    first = np.empty(len(pairs), dtype=bool)
+    first[0] = True
+    np.not_equal(pairs[1:], pairs[:-1], out=first[1:])
+    return np.bincount(pairs[first] // stride, minlength=size)
+
+def factorize(groups: np.ndarray):
+    """Sorted distinct keys and each row's index into them"""
+    if groups.dtype.kind in "iu" and len(groups):
+        # Small integer ids (items, waiters, tables): a lookup table beats sorting
+        low = groups.min()
+        span = int(groups.max() - low) + 1
+        if span <= 10 * len(groups) + 1024:
+            present = np.bincount(groups - low, minlength=span) > 0
+            lookup = np.cumsum(present) - 1
+            return np.flatnonzero(present) + low, lookup[groups - low]
+    return np.unique(groups, return_inverse=True)
+
+def aggregate(
+    timestamps: np.ndarray, order_ids: np.ndarray, quantity: np.ndarray, revenue: np.ndarray,
+    edges: np.ndarray, groups: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Bucket rows with searchsorted and sum every (group, bucket) cell with
+    one bincount per metric. Returns the group keys and (groups x buckets)
+    matrices of orders, quantity and revenue.
+    """
+    bucket_index = np.searchsorted(edges, timestamps, side="right") - 1
+    if groups is None:
+        keys = np.array([NO_KEY])
+        group_index = np.zeros(len(timestamps), dtype=np.int64)
+    else:
+        keys, group_index = factorize(groups)
+    shape = (len(keys), len(edges))
+    size = shape[0] * shape[1]
+    cells = group_index * len(edges) + bucket_index
+    return {
+        "keys": keys,
+        "orders": count_distinct(cells, order_ids, size).reshape(shape),
+        "quantity": np.bincount(cells, weights=quantity, minlength=size).reshape(shape),
+        "revenue": np.bincount(cells, weights=revenue, minlength=size).reshape(shape),
+    }
+
+def hour_of_week_heatmap(
+    timestamps: np.ndarray, order_ids: np.ndarray, quantity: np.ndarray, revenue: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """7 x 24 matrices (Monday first) of orders, quantity and revenue"""
+    weekday = (timestamps // 86400 + WEEKDAY_OFFSET) % 7
+    hour = (timestamps // 3600) % 24
+    cells = weekday * 24 + hour
+    return {
+        "orders": count_distinct(cells, order_ids, 168).reshape(7, 24),
+        "quantity": np.bincount(cells, weights=quantity, minlength=168).reshape(7, 24),
+        "revenue": np.bincount(cells, weights=revenue, minlength=168).reshape(7, 24),
+    }
+
+def group_labels(db: Session, group_by: str, keys: Sequence) -> Dict[Any, str]:
+    if group_by == "payment_method":
+        return {key: key for key in keys}
+    key_column, label_column = {
+        "item": (MenuItem.menu_item_id, MenuItem.name),
+        "category": (Category.category_id, Category.name),
+        "waiter": (Waitstaff.staff_id, Waitstaff.name),
+        "table": (Table.table_id, Table.table_number),
+    }[group_by]
+    ids = [int(key) for key in keys if key != NO_KEY]
+    labels = dict(db.query(key_column, label_column).filter(key_column.in_(ids)).all()) if ids else {}
+    labels[NO_KEY] = "None"
+    return labels
+
+def sales_report(
+    db: Session, start: datetime, end: datetime, bucket: str = "day",
+    group_by: Optional[str] = None, heatmap: bool = False, limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Time series of orders, quantity and revenue over [start, end), split by
+    group_by. Item, category, waiter and table series come from order items
+    (quantity is units sold); payment_method series come from payments
+    (quantity is the number of payments, revenue the amount paid).
+    Only the top `limit` groups by revenue are returned.
+    """
+    started = time.perf_counter()
+    if group_by == "payment_method":
+        columns = load_payment_columns(db, start, end)
+        columns["quantity"] = np.ones(len(columns["timestamp"]))
+        groups = columns["payment_method"]
+    else:
+        columns = load_item_columns(db, start, end)
+        groups = None
+        if group_by == "item":
+            groups = columns["menu_item_id"]
+        elif group_by == "waiter":
+            groups = columns["waiter_id"]
+        elif group_by == "table":
+            groups = columns["table_id"]
+        elif group_by == "category":
+            # Map items to categories with one lookup array
+            categories = db.query(MenuItem.menu_item_id, MenuItem.category_id).all()
+            max_id = max([menu_item_id for menu_item_id, _ in categories] + [int(columns["menu_item_id"].max(initial=0))])
+            category_of = np.full(max_id + 1, NO_KEY, dtype=np.int64)
+            for menu_item_id, category_id in categories:
+                category_of[menu_item_id] = category_id if category_id is not None else NO_KEY
+            groups = category_of[columns["menu_item_id"]]
+    fetched = time.perf_counter()
+
+    edges = bucket_edges(start, end, bucket)
+    result = aggregate(
+        columns["timestamp"], columns["order_id"], columns["quantity"], columns["revenue"],
+        edges, groups
+    )
+    top = np.argsort(-result["revenue"].sum(axis=1), kind="stable")[:limit]
+    heatmap_result = None
+    if heatmap:
+        heatmap_result = hour_of_week_heatmap(
+            columns["timestamp"], columns["order_id"], columns["quantity"], columns["revenue"]
+        )
+    aggregated = time.perf_counter()
+
+    keys = result["keys"][top].tolist()
+    labels = group_labels(db, group_by, keys) if group_by else {}
+    series = []
+    for row, key in zip(top, keys):
+        series.append({
+            "key": None if group_by is None else (key if group_by == "payment_method" else int(key)),
+            "label": labels.get(key, str(key)) if group_by else "All",
+            "orders": result["orders"][row].astype(int).tolist(),
+            "quantity": result["quantity"][row].round().astype(int).tolist(),
+            "revenue": result["revenue"][row].round(2).tolist(),
+            "total_orders": int(result["orders"][row].sum()),
+            "total_quantity": int(round(result["quantity"][row].sum())),
+            "total_revenue": round(float(result["revenue"][row].sum()), 2),
+        })
+
+    return {
+        "start": start,
+        "end": end,
+        "bucket": bucket,
+        "group_by": group_by,
+        "buckets": edges.astype("datetime64[s]").tolist(),
+        "series": series,
+        "heatmap": None if heatmap_result is None else {
+            "orders": heatmap_result["orders"].astype(int).tolist(),
+            "quantity": heatmap_result["quantity"].round().astype(int).tolist(),
+            "revenue": heatmap_result["revenue"].round(2).tolist(),
+        },
+        "rows": int(len(columns["timestamp"])),
+        "fetch_ms": round((fetched - started) * 1000, 3),
+        "aggregate_ms": round((aggregated - fetched) * 1000, 3),
+    }
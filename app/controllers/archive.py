@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.archive import OrderArchive, OrderItemArchive, PaymentArchive, FeedbackArchive, ArchiveWatermark
+from app.models.feedback import Feedback
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.payment import Payment
+
+ARCHIVABLE_STATUSES = ('completed', 'cancelled')
+WATERMARK_ID = 1
+
+def get_archive_watermark(db: Session, column: str = "order_date") -> Optional[datetime]:
+    """
+    Newest archived order_date, or payment_date (None = nothing archived).
+    One primary key read of the shared watermark row, so every process
+    sees a batch as soon as it commits.
+    """
+    return db.query(getattr(ArchiveWatermark, column)).filter(
+        ArchiveWatermark.watermark_id == WATERMARK_ID
+    ).scalar()
+
+def raise_watermark(db: Session, order_date: Optional[datetime], payment_date: Optional[datetime]) -> None:
+    """Move the watermarks up to order_date and payment_date, in the caller's transaction"""
+    watermark = db.query(ArchiveWatermark).filter(
+        ArchiveWatermark.watermark_id == WATERMARK_ID
+    ).with_for_update().first()
+    if watermark is None:
+        watermark = ArchiveWatermark(watermark_id=WATERMARK_ID)
+        db.add(watermark)
+    if order_date is not None and (watermark.order_date is None or order_date > watermark.order_date):
+        watermark.order_date = order_date
+    if payment_date is not None and (watermark.payment_date is None or payment_date > watermark.payment_date):
+        watermark.payment_date = payment_date
+
+def ensure_watermark(db: Session) -> Optional[datetime]:
+    """
+    Create the watermark row from the archive tables if it is missing
+    (archives written before it existed). Scans the archive only then.
+    """
+    exists = db.query(ArchiveWatermark.watermark_id).filter(
+        ArchiveWatermark.watermark_id == WATERMARK_ID
+    ).first()
+    if exists is None:
+        try:
+            raise_watermark(
+                db,
+                db.query(func.max(OrderArchive.order_date)).scalar(),
+                db.query(func.max(PaymentArchive.payment_date)).scalar()
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return get_archive_watermark(db)
+
+def needs_archive(db: Session, start: Optional[datetime] = None, column: str = "order_date") -> bool:
+    """Whether a report starting at start (None = all time) must read the archive"""
+    watermark = get_archive_watermark(db, column)
+    return watermark is not None and (start is None or start <= watermark)
+
+def _archive_batch(db: Session, order_ids: List[int]) -> None:
+    """Copy one batch of orders with their children to the archive and delete them"""
+    db.execute(insert(OrderArchive).from_select(
+        ["order_id", "order_date", "customer_id", "table_id", "waiter_id", "status",
+         "total_amount", "paid_amount"],
+        select(
+            Order.order_id, Order.order_date, Order.customer_id, Order.table_id,
+            Order.waiter_id, Order.status, Order.total_amount, Order.paid_amount
+        ).where(Order.order_id.in_(order_ids))
+    ))
+    db.execute(insert(OrderItemArchive).from_select(
+        ["order_item_id", "order_date", "order_id", "menu_item_id", "quantity",
+         "unit_price", "line_total", "special_request", "status"],
+        select(
+            OrderItem.order_item_id, Order.order_date, OrderItem.order_id, OrderItem.menu_item_id,
+            OrderItem.quantity, OrderItem.unit_price, OrderItem.line_total,
+            OrderItem.special_request, OrderItem.status
+        ).join(Order, Order.order_id == OrderItem.order_id).where(OrderItem.order_id.in_(order_ids))
+    ))
+    db.execute(insert(PaymentArchive).from_select(
+        ["payment_id", "payment_date", "order_id", "amount", "payment_method"],
+        select(
+            Payment.payment_id, Payment.payment_date, Payment.order_id,
+            Payment.amount, Payment.payment_method
+        ).where(Payment.order_id.in_(order_ids))
+    ))
+    db.execute(insert(FeedbackArchive).from_select(
+        ["feedback_id", "feedback_date", "customer_id", "order_id", "rating", "comment"],
+        select(
+            Feedback.feedback_id, Feedback.feedback_date, Feedback.customer_id,
+            Feedback.order_id, Feedback.rating, Feedback.comment
+        ).where(Feedback.order_id.in_(order_ids))
+    ))
+
+    raise_watermark(
+        db,
+        db.query(func.max(Order.order_date)).filter(Order.order_id.in_(order_ids)).scalar(),
+        db.query(func.max(Payment.payment_date)).filter(Payment.order_id.in_(order_ids)).scalar()
+    )
+
+    # Children first, the foreign keys have no ON DELETE CASCADE
+    for model in (OrderItem, Payment, Feedback):
+        db.query(model).filter(model.order_id.in_(order_ids)).delete(synchronize_session=False)
+    db.query(Order).filter(Order.order_id.in_(order_ids)).delete(synchronize_session=False)
+
+def archive_orders(
+    db: Session, older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None, max_batches: Optional[int] = None
+) -> int:
+    """
+    Move completed and cancelled orders older than the horizon, with their
+    items, payments and feedback, into the archive tables. Each batch is
+    its own short transaction so the hot tables are never locked for long.
+    Returns the number of orders archived.
+    """
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    before = datetime.now() - timedelta(days=older_than_days)
+    # Archives written before the shared watermark row existed
+    ensure_watermark(db)
+
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        order_ids = [
+            order_id for (order_id,) in
+            db.query(Order.order_id)
+            .filter(Order.status.in_(ARCHIVABLE_STATUSES), Order.order_date < before)
+            .order_by(Order.order_id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not order_ids:
+            break
+        try:
+            _archive_batch(db, order_ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        archived += len(order_ids)
+        batches += 1
+        print(f"Archived {archived} orders so far")
+
+    return archived
+
+def orders_source(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Orders in [start, end) as a subquery named "orders", reading the
+    archive too only when the range reaches back into it.
+    """
+    hot = select(
+        Order.order_id, Order.customer_id, Order.table_id, Order.waiter_id,
+        Order.order_date, Order.status, Order.total_amount, Order.paid_amount
+    )
+    if start is not None:
+        hot = hot.where(Order.order_date >= start)
+    if end is not None:
+        hot = hot.where(Order.order_date < end)
+    if not needs_archive(db, start):
+        return hot.subquery("orders")
+
+    cold = select(
+        OrderArchive.order_id, OrderArchive.customer_id, OrderArchive.table_id, OrderArchive.waiter_id,
+        OrderArchive.order_date, OrderArchive.status, OrderArchive.total_amount, OrderArchive.paid_amount
+    )
+    if start is not None:
+        cold = cold.where(OrderArchive.order_date >= start)
+    if end is not None:
+        cold = cold.where(OrderArchive.order_date < end)
+    return union_all(hot, cold).subquery("orders")
+
+def order_items_source(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Order items in [start, end) with their order's date, table, waiter and
+    status (order_status), as a subquery named "order_items", reading the
+    archive only when needed.
+    """
+    hot = select(
+        OrderItem.order_item_id, OrderItem.order_id, OrderItem.menu_item_id, OrderItem.quantity,
+        OrderItem.unit_price, OrderItem.line_total, OrderItem.status,
+        Order.order_date, Order.table_id, Order.waiter_id, Order.status.label("order_status")
+    ).join(Order, Order.order_id == OrderItem.order_id)
+    if start is not None:
+        hot = hot.where(Order.order_date >= start)
+    if end is not None:
+        hot = hot.where(Order.order_date < end)
+    if not needs_archive(db, start):
+        return hot.subquery("order_items")
+
+    cold = select(
+        OrderItemArchive.order_item_id, OrderItemArchive.order_id, OrderItemArchive.menu_item_id,
+        OrderItemArchive.quantity, OrderItemArchive.unit_price, OrderItemArchive.line_total,
+        OrderItemArchive.status, OrderItemArchive.order_date, OrderArchive.table_id, OrderArchive.waiter_id,
+        OrderArchive.status.label("order_status")
+    ).join(
+        OrderArchive,
+        (OrderArchive.order_id == OrderItemArchive.order_id) & (OrderArchive.order_date == OrderItemArchive.order_date)
+    )
+    if start is not None:
+        cold = cold.where(OrderItemArchive.order_date >= start)
+    if end is not None:
+        cold = cold.where(OrderItemArchive.order_date < end)
+    return union_all(hot, cold).subquery("order_items")
+
+def payments_source(db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Payments made in [start, end) as a subquery named "payments", reading
+    the archive only when the range reaches back into it.
+    """
+    hot = select(
+        Payment.payment_id, Payment.order_id, Payment.amount,
+        Payment.payment_method, Payment.payment_date
+    )
+    if start is not None:
+        hot = hot.where(Payment.payment_date >= start)
+    if end is not None:
+        hot = hot.where(Payment.payment_date < end)
+    # Archived orders can have been paid long after their order date
+    if not needs_archive(db, start, column="payment_date"):
+        return hot.subquery("payments")
+
+    cold = select(
+        PaymentArchive.payment_id, PaymentArchive.order_id, PaymentArchive.amount,
+        PaymentArchive.payment_method, PaymentArchive.payment_date
+    )
+    if start is not None:
+        cold = cold.where(PaymentArchive.payment_date >= start)
+    if end is not None:
+        cold = cold.where(PaymentArchive.payment_date < end)
+    return union_all(hot, cold).subquery("payments")
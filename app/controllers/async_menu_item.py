@@ -0,0 +1,23 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers import menu_catalog
+from app.controllers.menu_catalog import MenuCatalog
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+
+# Async variant of the menu catalog load for use with get_async_db.
+# Menu writes stay on the sync controller.
+
+async def get_catalog(db: AsyncSession) -> MenuCatalog:
+    """
+    Same as menu_catalog.get_catalog, but a stale or missing catalog is
+    loaded with the async driver instead of blocking the event loop
+    """
+    catalog = menu_catalog.peek_catalog()
+    if menu_catalog.is_fresh(catalog):
+        return catalog
+    loaded_version = menu_catalog.get_version()
+    categories = (await db.execute(select(Category).order_by(Category.category_id))).scalars().all()
+    menu_items = (await db.execute(select(MenuItem).order_by(MenuItem.menu_item_id))).scalars().all()
+    return menu_catalog.install_catalog(list(categories), list(menu_items), loaded_version)
@@ -0,0 +1,45 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+
+# Async variants of the app.controllers.order reads for use with get_async_db.
+# Writes stay on the sync controller, which the batch API also runs.
+
+async def get_order_with_details(db: AsyncSession, order_id: int) -> Optional[Order]:
+    """
+    Load an order with the relationships used by OrderWithDetails; an
+    AsyncSession cannot lazy-load them while the response is serialized
+    """
+    result = await db.execute(
+        select(Order)
+        .options(
+            selectinload(Order.order_items),
+            selectinload(Order.customer),
+            selectinload(Order.table),
+            selectinload(Order.waiter),
+        )
+        .filter(Order.order_id == order_id)
+    )
+    return result.scalars().first()
+
+async def get_orders(
+    db: AsyncSession, skip: int = 0, limit: int = 100,
+    status: Optional[str] = None, customer_id: Optional[int] = None,
+    table_id: Optional[int] = None, waiter_id: Optional[int] = None
+) -> List[Order]:
+    query = select(Order)
+    
+    if status:
+        query = query.filter(Order.status == status)
+    if customer_id:
+        query = query.filter(Order.customer_id == customer_id)
+    if table_id:
+        query = query.filter(Order.table_id == table_id)
+    if waiter_id:
+        query = query.filter(Order.waiter_id == waiter_id)
+        
+    result = await db.execute(query.order_by(Order.order_date.desc()).offset(skip).limit(limit))
+    return list(result.scalars().all())
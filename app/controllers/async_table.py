@@ -0,0 +1,18 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.table import Table
+
+# Async variants of the app.controllers.table reads for use with get_async_db.
+# Writes stay on the sync controller, which the batch API also runs.
+
+async def get_table(db: AsyncSession, table_id: int) -> Optional[Table]:
+    result = await db.execute(select(Table).filter(Table.table_id == table_id))
+    return result.scalars().first()
+
+async def get_tables(
+    db: AsyncSession, skip: int = 0, limit: int = 100
+) -> List[Table]:
+    result = await db.execute(select(Table).offset(skip).limit(limit))
+    return list(result.scalars().all())
@@ -1,8 +1,10 @@
 from typing import List, Optional, Any, Dict
 from sqlalchemy.orm import Session
 
+from app.core import events
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.controllers import menu_catalog
 
 def get_category(db: Session, category_id: int) -> Optional[Category]:
     return db.query(Category).filter(Category.category_id == category_id).first()
@@ -23,6 +25,7 @@ def create_category(db: Session, category: CategoryCreate) -> Category:
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    events.run_after_commit(db, menu_catalog.refresh_catalog, db)
     return db_category
 
 def update_category(
@@ -35,6 +38,7 @@ def update_category(
             setattr(db_category, field, value)
         db.commit()
         db.refresh(db_category)
+        events.run_after_commit(db, menu_catalog.refresh_catalog, db)
     return db_category
 
 def delete_category(db: Session, category_id: int) -> Optional[Category]:
@@ -42,5 +46,6 @@ def delete_category(db: Session, category_id: int) -> Optional[Category]:
     if db_category:
         db.delete(db_category)
         db.commit()
+        events.run_after_commit(db, menu_catalog.refresh_catalog, db)
         return db_category
     return None
\ No newline at end of file
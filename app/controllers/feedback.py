@@ -1,10 +1,19 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
+from datetime import date, datetime
+from sqlalchemy import Date, insert, select, union_all
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
+from app.models.archive import FeedbackArchive
 from app.models.feedback import Feedback
+from app.models.rollup import FeedbackDaily, FeedbackTotal
 from app.schemas.feedback import FeedbackCreate, FeedbackUpdate
 
+RATINGS = range(1, 6)
+TOTAL_ID = 1
+COUNTER_COLUMNS = ("feedback_count", "rating_sum") + tuple(f"rating_{rating}" for rating in RATINGS)
+
 def get_feedback(db: Session, feedback_id: int) -> Optional[Feedback]:
     return db.query(Feedback).filter(Feedback.feedback_id == feedback_id).first()
 
@@ -19,6 +28,45 @@ def get_feedbacks(
 ) -> List[Feedback]:
     return db.query(Feedback).order_by(Feedback.feedback_date.desc()).offset(skip).limit(limit).all()
 
+def rating_deltas(old_rating: Optional[int], new_rating: Optional[int]) -> Dict[str, int]:
+    """Counter changes for a rating going from old_rating to new_rating (None = no feedback)"""
+    deltas = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for rating, sign in ((old_rating, -1), (new_rating, 1)):
+        if rating is not None:
+            deltas["feedback_count"] += sign
+            deltas["rating_sum"] += sign * rating
+            deltas[f"rating_{rating}"] += sign
+    return {column: delta for column, delta in deltas.items() if delta}
+
+def _increment(db: Session, model, key: Dict[str, Any], deltas: Dict[str, int]) -> None:
+    query = db.query(model).filter_by(**key)
+    values = {getattr(model, column): getattr(model, column) + delta for column, delta in deltas.items()}
+    if query.update(values, synchronize_session=False):
+        return
+    try:
+        # First feedback of the day (or ever): create the row
+        with db.begin_nested():
+            db.add(model(**key, **{**dict.fromkeys(COUNTER_COLUMNS, 0), **deltas}))
+    except IntegrityError:
+        # Another transaction created it first
+        query.update(values, synchronize_session=False)
+
+def apply_rating_change(
+    db: Session, feedback_date: datetime, old_rating: Optional[int], new_rating: Optional[int]
+) -> None:
+    """Update the rating histograms in the caller's transaction"""
+    deltas = rating_deltas(old_rating, new_rating)
+    if not deltas:
+        return
+    # Always the totals row first, then the day: writers and rebuilds never deadlock
+    _increment(db, FeedbackTotal, {"total_id": TOTAL_ID}, deltas)
+    _increment(db, FeedbackDaily, {"day": feedback_date.date()}, deltas)
+
+def uncount_feedbacks(db: Session, feedbacks: Iterable[Feedback]) -> None:
+    """Remove feedback about to be deleted along with its order from the histograms"""
+    for db_feedback in feedbacks:
+        apply_rating_change(db, db_feedback.feedback_date, db_feedback.rating, None)
+
 def create_feedback(db: Session, feedback: FeedbackCreate) -> Feedback:
     db_feedback = Feedback(
         customer_id=feedback.customer_id,
@@ -27,6 +75,8 @@ def create_feedback(db: Session, feedback: FeedbackCreate) -> Feedback:
         comment=feedback.comment,
     )
     db.add(db_feedback)
+    db.flush()
+    apply_rating_change(db, db_feedback.feedback_date, None, db_feedback.rating)
     db.commit()
     db.refresh(db_feedback)
     return db_feedback
@@ -36,9 +86,15 @@ def update_feedback(
 ) -> Optional[Feedback]:
     db_feedback = get_feedback(db, feedback_id)
     if db_feedback:
+        old_rating = db_feedback.rating
         update_data = feedback.dict(exclude_unset=True)
+        # A feedback always has a rating: null leaves it as it is
+        if update_data.get("rating") is None:
+            update_data.pop("rating", None)
         for field, value in update_data.items():
             setattr(db_feedback, field, value)
+        if "rating" in update_data:
+            apply_rating_change(db, db_feedback.feedback_date, old_rating, db_feedback.rating)
         db.commit()
         db.refresh(db_feedback)
     return db_feedback
@@ -46,26 +102,83 @@ def update_feedback(
 def delete_feedback(db: Session, feedback_id: int) -> Optional[Feedback]:
     db_feedback = get_feedback(db, feedback_id)
     if db_feedback:
+        apply_rating_change(db, db_feedback.feedback_date, db_feedback.rating, None)
         db.delete(db_feedback)
         db.commit()
         return db_feedback
     return None
 
-def get_average_rating(db: Session) -> float:
-    """Get the average rating of all feedbacks"""
-    avg_rating = db.query(func.avg(Feedback.rating)).scalar()
-    return float(avg_rating) if avg_rating else 0.0
-
-def get_rating_statistics(db: Session) -> Dict[str, Any]:
-    """Get statistics about ratings"""
-    total = db.query(Feedback).count()
-    ratings = {}
-    
-    for i in range(1, 6):  # Ratings from 1 to 5
-        ratings[i] = db.query(Feedback).filter(Feedback.rating == i).count()
-        
+def statistics_from_counters(values: Optional[Iterable[Any]]) -> Dict[str, Any]:
+    counters = dict(zip(COUNTER_COLUMNS, (int(value or 0) for value in (values or ()))))
+    total = counters.get("feedback_count", 0)
     return {
         "total": total,
-        "average": get_average_rating(db),
-        "ratings": ratings
-    }
\ No newline at end of file
+        "average": counters["rating_sum"] / total if total else 0.0,
+        "ratings": {rating: counters.get(f"rating_{rating}", 0) for rating in RATINGS}
+    }
+
+def get_average_rating(db: Session) -> float:
+    """Get the average rating of all feedbacks"""
+    return get_rating_statistics(db)["average"]
+
+def get_rating_statistics(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Get statistics about ratings. All-time figures are one primary key
+    read of the totals row; a window of days start..end (inclusive) sums
+    its daily buckets.
+    """
+    if start is None and end is None:
+        row = db.query(
+            *(getattr(FeedbackTotal, column) for column in COUNTER_COLUMNS)
+        ).filter(FeedbackTotal.total_id == TOTAL_ID).first()
+        return statistics_from_counters(row)
+
+    query = db.query(*(func.sum(getattr(FeedbackDaily, column)) for column in COUNTER_COLUMNS))
+    if start is not None:
+        query = query.filter(FeedbackDaily.day >= start)
+    if end is not None:
+        query = query.filter(FeedbackDaily.day <= end)
+    return statistics_from_counters(query.one())
+
+def count_ratings_by_day(db: Session) -> Dict[date, Dict[str, int]]:
+    """Counters per day of all feedback, hot and archived, from one GROUP BY"""
+    ratings = union_all(*(
+        select(model.feedback_date.label("feedback_date"), model.rating.label("rating"))
+        for model in (Feedback, FeedbackArchive)
+    )).subquery()
+    day = func.date(ratings.c.feedback_date, type_=Date)
+    days: Dict[date, Dict[str, int]] = {}
+    for feedback_day, rating, count in db.execute(
+        select(day, ratings.c.rating, func.count()).group_by(day, ratings.c.rating)
+    ):
+        counters = days.setdefault(feedback_day, dict.fromkeys(COUNTER_COLUMNS, 0))
+        counters["feedback_count"] += count
+        counters["rating_sum"] += rating * count
+        counters[f"rating_{rating}"] += count
+    return days
+
+def rebuild_rating_statistics(db: Session) -> int:
+    """
+    Recompute the rating histograms from the feedback tables. Feedback
+    writes wait on the locked totals row until the rebuild commits.
+    Returns the number of days rebuilt.
+    """
+    try:
+        db.query(FeedbackTotal).filter(FeedbackTotal.total_id == TOTAL_ID).with_for_update().first()
+        days = count_ratings_by_day(db)
+        db.query(FeedbackDaily).delete(synchronize_session=False)
+        db.query(FeedbackTotal).delete(synchronize_session=False)
+        totals = dict.fromkeys(COUNTER_COLUMNS, 0)
+        for counters in days.values():
+            for column, value in counters.items():
+                totals[column] += value
+        db.execute(insert(FeedbackTotal), [{"total_id": TOTAL_ID, **totals}])
+        if days:
+            db.execute(insert(FeedbackDaily), [{"day": day, **counters} for day, counters in days.items()])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(days)
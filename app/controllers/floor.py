@@ -0,0 +1,77 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.controllers.table import ACTIVE_ORDER_STATUSES
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.table import Table
+from app.schemas.floor import FloorSnapshot
+
+def get_floor(db: Session) -> Dict[str, Any]:
+    """
+    Every table with its active orders, items, waiter and amount due.
+    Always three queries (tables, active orders with their waiter and
+    paid amount, their items with menu names) however many tables there are.
+    Nothing in it depends on the clock, so its ETag (a hash of the body)
+    only changes with the data: clients work out elapsed times from
+    order_date and seated_since.
+    """
+    tables = db.query(Table).order_by(Table.table_number).all()
+    orders = (
+        db.query(Order)
+        .options(
+            joinedload(Order.waiter),
+            selectinload(Order.order_items).joinedload(OrderItem.menu_item),
+        )
+        .filter(Order.table_id.isnot(None), Order.status.in_(ACTIVE_ORDER_STATUSES))
+        .order_by(Order.order_date, Order.order_id)
+        .all()
+    )
+
+    orders_by_table: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for order in orders:
+        total = order.total_amount or Decimal('0.00')
+        paid_amount = order.paid_amount or Decimal('0.00')
+        orders_by_table[order.table_id].append({
+            "order_id": order.order_id,
+            "status": order.status,
+            "order_date": order.order_date,
+            "waiter_id": order.waiter_id,
+            "waiter_name": order.waiter.name if order.waiter else None,
+            "total_amount": total,
+            "paid_amount": paid_amount,
+            "amount_due": max(total - paid_amount, Decimal('0.00')),
+            "items": [
+                {
+                    "order_item_id": item.order_item_id,
+                    "menu_item_id": item.menu_item_id,
+                    "menu_item_name": item.menu_item.name if item.menu_item else None,
+                    "quantity": item.quantity,
+                    "special_request": item.special_request,
+                    "status": item.status,
+                }
+                for item in order.order_items
+            ],
+        })
+
+    floor_tables = []
+    for table in tables:
+        table_orders = orders_by_table.get(table.table_id, [])
+        floor_tables.append({
+            "table_id": table.table_id,
+            "table_number": table.table_number,
+            "capacity": table.capacity,
+            "status": table.status,
+            "current_order_id": table.current_order_id,
+            "seated_since": table.seated_since,
+            "running_total": table.running_total or Decimal('0.00'),
+            "amount_due": sum((order["amount_due"] for order in table_orders), Decimal('0.00')),
+            "orders": table_orders,
+        })
+    return {"tables": floor_tables}
+
+def get_floor_json(db: Session) -> bytes:
+    """The serialized snapshot, which the floor ETag is computed from"""
+    return FloorSnapshot.model_validate(get_floor(db)).model_dump_json().encode()
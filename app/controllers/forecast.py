@@ -0,0 +1,235 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.controllers import analytics as analytics_controller
+from app.models.menu_item import MenuItem
+
+MODELS = ("seasonal_naive", "smoothing")
+
+# Smoothing factors tried for every item; the one with the lowest
+# training error wins
+ALPHAS = np.array([0.05, 0.1, 0.2, 0.3, 0.5, 0.8])
+
+# Forecasts per (history start, history end, backtest weeks)
+forecast_cache = TTLCache(maxsize=16, ttl=settings.FORECAST_CACHE_TTL_SECONDS)
+
+def parse_services(value: str) -> List[Tuple[str, int, int]]:
+    """"lunch:11-15,dinner:17-22" -> [("lunch", 11, 15), ("dinner", 17, 22)]"""
+    services = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, hours = part.strip().split(":")
+        start_hour, end_hour = (int(hour) for hour in hours.split("-"))
+        services.append((name, start_hour, end_hour))
+    return services
+
+SERVICES = parse_services(settings.FORECAST_SERVICES)
+
+def history_window(today: date, history_days: int) -> Tuple[datetime, datetime]:
+    """Whole weeks of history ending at midnight today (today itself is partial)"""
+    end = datetime.combine(today, datetime.min.time())
+    weeks = max(history_days // 7, 1)
+    return end - timedelta(weeks=weeks), end
+
+def demand_series(
+    columns: Dict[str, np.ndarray], item_ids: np.ndarray, start: datetime, weeks: int, step: int
+) -> np.ndarray:
+    """
+    Units sold per item and step-second period, folded by week:
+    (items, weeks, periods per week). Period j of every week is the same
+    weekday/hour, counted from the weekday of start.
+    """
+    periods = weeks * 7 * 86400 // step
+    position, known = analytics_controller.item_positions(item_ids, columns["menu_item_id"])
+    period = (columns["timestamp"] - analytics_controller.to_seconds([start])[0]) // step
+    known &= (period >= 0) & (period < periods)
+    series = np.bincount(
+        position[known] * periods + period[known],
+        weights=columns["quantity"][known], minlength=len(item_ids) * periods
+    )
+    # bincount returns int64 for empty input even with weights; fit needs floats
+    return series.astype(np.float64, copy=False).reshape(len(item_ids), weeks, periods // weeks)
+
+def fit(series: np.ndarray, backtest_weeks: int) -> Dict[str, np.ndarray]:
+    """
+    Fit both models to every item at once and forecast the next week.
+
+    seasonal_naive repeats last week. smoothing keeps, per item and
+    period of the week, an exponentially weighted level of that period's
+    past weeks. Alpha is chosen per item on the training weeks; the last
+    backtest_weeks are then forecast one week ahead, as in production,
+    to measure each model's error. The model with the lower training
+    error is selected per item.
+    """
+    items, weeks, periods = series.shape
+    train_weeks = weeks - backtest_weeks
+    alphas = ALPHAS[:, None, None]
+    level = np.repeat(series[None, :, 0, :], len(ALPHAS), axis=0)
+    # Absolute errors per phase (0 = training, 1 = backtest)
+    smoothing_error = np.zeros((2, len(ALPHAS), items))
+    naive_error = np.zeros((2, items))
+    actual = np.zeros((2, items))
+    for week in range(1, weeks):
+        phase = 0 if week < train_weeks else 1
+        observed = series[:, week, :]
+        smoothing_error[phase] += np.abs(observed - level).sum(axis=2)
+        naive_error[phase] += np.abs(observed - series[:, week - 1, :]).sum(axis=1)
+        actual[phase] += observed.sum(axis=1)
+        level += alphas * (observed - level)
+
+    rows = np.arange(items)
+    best = smoothing_error[0].argmin(axis=0)
+    smoothing_error = smoothing_error[:, best, rows]
+    use_smoothing = smoothing_error[0] <= naive_error[0]
+    return {
+        "alpha": ALPHAS[best],
+        "seasonal_naive": series[:, -1, :],
+        "smoothing": level[best, rows],
+        "use_smoothing": use_smoothing,
+        "naive_error": naive_error[1],
+        "smoothing_error": smoothing_error[1],
+        "selected_error": np.where(use_smoothing, smoothing_error[1], naive_error[1]),
+        "actual": actual[1],
+        "cells": max(weeks - train_weeks, 0) * periods,
+    }
+
+def error_summary(model: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Backtest MAE per item-period and WAPE (sum |error| / sum actual) of each model"""
+    actual = model["actual"].sum()
+    cells = model["cells"] * len(model["actual"])
+    summary = {}
+    for name, errors in (
+        ("seasonal_naive", model["naive_error"]),
+        ("smoothing", model["smoothing_error"]),
+        ("selected", model["selected_error"]),
+    ):
+        summary[name] = {
+            "mae": round(float(errors.sum() / cells), 4) if cells else None,
+            "wape": round(float(errors.sum() / actual), 4) if actual > 0 else None,
+        }
+    return summary
+
+def next_service(now: datetime) -> Optional[Tuple[str, datetime, datetime]]:
+    """The service in progress, or else the next one to start"""
+    for offset in range(8):
+        day = now.date() + timedelta(days=offset)
+        for name, start_hour, end_hour in SERVICES:
+            start = datetime.combine(day, datetime.min.time()) + timedelta(hours=start_hour)
+            end = datetime.combine(day, datetime.min.time()) + timedelta(hours=end_hour)
+            if end > now:
+                return name, start, end
+    return None
+
+def prediction(model: Dict[str, np.ndarray], cells) -> Dict[str, np.ndarray]:
+    """Both models' forecasts summed over the given periods of the week"""
+    naive = model["seasonal_naive"][:, cells].sum(axis=1)
+    smoothing = model["smoothing"][:, cells].sum(axis=1)
+    return {
+        "seasonal_naive": naive,
+        "smoothing": smoothing,
+        "selected": np.where(model["use_smoothing"], smoothing, naive),
+    }
+
+def train(db: Session, start: datetime, end: datetime, backtest_weeks: int) -> Dict[str, Any]:
+    """
+    The forecasting job: one columnar fetch of [start, end), then daily
+    and hourly models for every menu item.
+    """
+    started = time.perf_counter()
+    menu = db.query(MenuItem.menu_item_id, MenuItem.name).order_by(MenuItem.menu_item_id).all()
+    columns = analytics_controller.load_item_columns(db, start, end)
+    fetched = time.perf_counter()
+
+    item_ids = np.array([menu_item_id for menu_item_id, _ in menu], dtype=np.int64)
+    weeks = (end - start).days // 7
+    daily = fit(demand_series(columns, item_ids, start, weeks, 86400), backtest_weeks)
+    hourly = fit(demand_series(columns, item_ids, start, weeks, 3600), backtest_weeks)
+    trained = time.perf_counter()
+
+    return {
+        "start": start,
+        "end": end,
+        "item_ids": item_ids,
+        "names": [name for _, name in menu],
+        "daily": daily,
+        "hourly": hourly,
+        "rows": int(len(columns["timestamp"])),
+        "fetch_ms": round((fetched - started) * 1000, 3),
+        "fit_ms": round((trained - fetched) * 1000, 3),
+    }
+
+def get_models(
+    db: Session, start: datetime, end: datetime, backtest_weeks: int, refresh: bool = False
+) -> Tuple[Dict[str, Any], bool]:
+    """Cached models for the history window, and whether they came from the cache"""
+    key = (start, end, backtest_weeks)
+    if not refresh:
+        models = forecast_cache.get(key)
+        if models is not None:
+            return models, True
+    models = train(db, start, end, backtest_weeks)
+    forecast_cache.set(key, models)
+    return models, False
+
+def forecast(
+    db: Session, day: date, history_days: int = 365, backtest_weeks: int = 4,
+    now: Optional[datetime] = None, refresh: bool = False
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Units of every menu item expected on `day` (within the week after
+    the history) and in the next service, with backtest errors
+    """
+    now = now or datetime.now()
+    start, end = history_window(now.date(), history_days)
+    models, cached = get_models(db, start, end, backtest_weeks, refresh=refresh)
+
+    day_cell = (day - start.date()).days % 7
+    next_day = prediction(models["daily"], [day_cell])
+    service = next_service(now)
+    service_forecast = None
+    if service is not None:
+        name, service_start, service_end = service
+        first_cell = (service_start.date() - start.date()).days % 7 * 24 + service_start.hour
+        service_forecast = prediction(
+            models["hourly"], [(first_cell + hour) % 168 for hour in range(service_end.hour - service_start.hour)]
+        )
+
+    items = []
+    daily = models["daily"]
+    for index, (menu_item_id, name) in enumerate(zip(models["item_ids"].tolist(), models["names"])):
+        actual = daily["actual"][index]
+        items.append({
+            "menu_item_id": menu_item_id,
+            "name": name,
+            "model": "smoothing" if daily["use_smoothing"][index] else "seasonal_naive",
+            "alpha": float(daily["alpha"][index]),
+            "next_day": {key: round(float(values[index]), 2) for key, values in next_day.items()},
+            "next_service": None if service_forecast is None else {
+                key: round(float(values[index]), 2) for key, values in service_forecast.items()
+            },
+            "backtest_wape": round(float(daily["selected_error"][index] / actual), 4) if actual > 0 else None,
+        })
+
+    return {
+        "generated_at": now,
+        "history_start": start,
+        "history_end": end,
+        "day": day,
+        "service": None if service is None else {"name": service[0], "start": service[1], "end": service[2]},
+        "items": items,
+        "backtest": {
+            "weeks": backtest_weeks,
+            "daily": error_summary(models["daily"]),
+            "hourly": error_summary(models["hourly"]),
+        },
+        "rows": models["rows"],
+        "fetch_ms": models["fetch_ms"],
+        "fit_ms": models["fit_ms"],
+    }, cached
@@ -0,0 +1,314 @@
+import bisect
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.config import settings
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.schemas.kitchen import KitchenTicket
+
+# Statuses shown on the kitchen display
+ACTIVE_STATUSES = ('pending', 'preparing', 'ready')
+
+# Statuses an item may be bumped from, by target status
+ALLOWED_FROM = {
+    'pending': ('preparing',),
+    'preparing': ('pending',),
+    'ready': ('pending', 'preparing'),
+    'delivered': ('ready',),
+    'cancelled': ('pending', 'preparing', 'ready'),
+}
+
+DEFAULT_STATION = "kitchen"
+
+def _parse_station_map(value: str) -> Dict[str, str]:
+    stations = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            category, station = pair.split("=", 1)
+            stations[category.strip().lower()] = station.strip()
+    return stations
+
+STATION_MAP = _parse_station_map(settings.KITCHEN_STATIONS)
+
+def station_for_category(category_name: Optional[str]) -> str:
+    """KITCHEN_STATIONS mapping, otherwise every category is its own station"""
+    if not category_name:
+        return DEFAULT_STATION
+    return STATION_MAP.get(category_name.lower(), category_name)
+
+def _ticket_query(db: Session):
+    return (
+        db.query(
+            OrderItem.order_item_id, OrderItem.order_id, Order.table_id,
+            OrderItem.menu_item_id, MenuItem.name, MenuItem.category_id, Category.name,
+            OrderItem.quantity, OrderItem.special_request, OrderItem.status, Order.order_date
+        )
+        .join(Order, Order.order_id == OrderItem.order_id)
+        .join(MenuItem, MenuItem.menu_item_id == OrderItem.menu_item_id)
+        .outerjoin(Category, Category.category_id == MenuItem.category_id)
+        # Items of cancelled orders are off the board whatever their own status
+        .filter(Order.status != 'cancelled')
+    )
+
+def _ticket_from_row(row) -> KitchenTicket:
+    (order_item_id, order_id, table_id, menu_item_id, menu_item_name, category_id,
+     category_name, quantity, special_request, status, order_date) = row
+    return KitchenTicket(
+        order_item_id=order_item_id,
+        order_id=order_id,
+        table_id=table_id,
+        menu_item_id=menu_item_id,
+        menu_item_name=menu_item_name,
+        category_id=category_id,
+        station=station_for_category(category_name),
+        quantity=quantity,
+        special_request=special_request,
+        status=status,
+        order_date=order_date,
+    )
+
+class KitchenBoard:
+    """
+    In-memory kitchen display: active items grouped into per-station queues
+    ordered by order time. Committed item changes are applied from order
+    and item events; new items are fetched by primary key on the next read,
+    and a periodic resync picks up writes made by other worker processes.
+    """
+
+    def __init__(self):
+        self.tickets: Dict[int, KitchenTicket] = {}
+        self.queues: Dict[str, List[Tuple[datetime, int]]] = {}
+        self.by_order: Dict[int, Set[int]] = {}
+        self.pending_items: Set[int] = set()
+        self.pending_orders: Set[int] = set()
+        self.loaded_at: Optional[float] = None
+        # Items and orders changed by events while a load was querying, so
+        # its rows for them may already be stale
+        self._loads_in_flight = 0
+        self._touched_items: Set[int] = set()
+        self._touched_orders: Set[int] = set()
+        self._lock = threading.RLock()
+
+    def _add(self, ticket: KitchenTicket) -> None:
+        self._remove(ticket.order_item_id)
+        self.tickets[ticket.order_item_id] = ticket
+        bisect.insort(self.queues.setdefault(ticket.station, []), (ticket.order_date, ticket.order_item_id))
+        self.by_order.setdefault(ticket.order_id, set()).add(ticket.order_item_id)
+
+    def _remove(self, order_item_id: int) -> None:
+        ticket = self.tickets.pop(order_item_id, None)
+        if ticket is None:
+            return
+        queue = self.queues.get(ticket.station, [])
+        key = (ticket.order_date, ticket.order_item_id)
+        index = bisect.bisect_left(queue, key)
+        if index < len(queue) and queue[index] == key:
+            del queue[index]
+        items = self.by_order.get(ticket.order_id)
+        if items is not None:
+            items.discard(order_item_id)
+            if not items:
+                del self.by_order[ticket.order_id]
+
+    def _touch(self, order_item_ids: Iterable[int] = (), order_id: Optional[int] = None) -> None:
+        if self._loads_in_flight:
+            self._touched_items.update(order_item_ids)
+            if order_id is not None:
+                self._touched_orders.add(order_id)
+
+    def _end_load(self) -> Tuple[Set[int], Set[int]]:
+        """The items and orders touched during the load (call under the lock)"""
+        touched = self._touched_items, self._touched_orders
+        self._loads_in_flight -= 1
+        if not self._loads_in_flight:
+            self._touched_items, self._touched_orders = set(), set()
+        else:
+            touched = set(self._touched_items), set(self._touched_orders)
+        return touched
+
+    def _apply_rows(self, rows, touched_items: Set[int], touched_orders: Set[int]) -> Set[int]:
+        """Apply loaded rows, re-queueing those changed while they were read; returns the ids seen"""
+        seen = set()
+        for row in rows:
+            ticket = _ticket_from_row(row)
+            seen.add(ticket.order_item_id)
+            if ticket.order_item_id in touched_items or ticket.order_id in touched_orders:
+                self.pending_items.add(ticket.order_item_id)
+            elif ticket.status in ACTIVE_STATUSES:
+                self._add(ticket)
+            else:
+                self._remove(ticket.order_item_id)
+        return seen
+
+    def _set_status(self, order_item_ids: Iterable[int], status: str) -> None:
+        for order_item_id in order_item_ids:
+            if status not in ACTIVE_STATUSES:
+                self._remove(order_item_id)
+            elif order_item_id in self.tickets:
+                self.tickets[order_item_id].status = status
+            else:
+                self.pending_items.add(order_item_id)
+
+    def load(self, db: Session) -> None:
+        """Rebuild the board from the active order items"""
+        with self._lock:
+            self._loads_in_flight += 1
+        try:
+            rows = _ticket_query(db).filter(OrderItem.status.in_(ACTIVE_STATUSES)).all()
+        except Exception:
+            with self._lock:
+                self._end_load()
+            raise
+        # Ending the load and applying its rows under one lock: no event slips in between
+        with self._lock:
+            touched_items, touched_orders = self._end_load()
+            self.tickets.clear()
+            self.queues.clear()
+            self.by_order.clear()
+            self.pending_items.clear()
+            self.pending_orders.clear()
+            self._apply_rows(rows, touched_items, touched_orders)
+            # Items changed during the query that it did not return
+            self.pending_items.update(touched_items)
+            self.pending_orders.update(touched_orders)
+            self.loaded_at = time.monotonic()
+
+    def _load_pending(self, db: Session) -> None:
+        with self._lock:
+            item_ids, order_ids = self.pending_items, self.pending_orders
+            self.pending_items, self.pending_orders = set(), set()
+            self._loads_in_flight += 1
+        query = _ticket_query(db)
+        if item_ids and order_ids:
+            query = query.filter(OrderItem.order_item_id.in_(item_ids) | OrderItem.order_id.in_(order_ids))
+        elif item_ids:
+            query = query.filter(OrderItem.order_item_id.in_(item_ids))
+        else:
+            query = query.filter(OrderItem.order_id.in_(order_ids))
+        try:
+            rows = query.all()
+        except Exception:
+            with self._lock:
+                self._end_load()
+                # Try again on the next read
+                self.pending_items |= item_ids
+                self.pending_orders |= order_ids
+            raise
+        with self._lock:
+            touched_items, touched_orders = self._end_load()
+            seen = self._apply_rows(rows, touched_items, touched_orders)
+            for order_item_id in item_ids - seen - touched_items:
+                self._remove(order_item_id)
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > settings.KITCHEN_RESYNC_SECONDS:
+            self.load(db)
+        elif self.pending_items or self.pending_orders:
+            self._load_pending(db)
+
+    def get_queue(self, station: str, statuses: Iterable[str] = ACTIVE_STATUSES) -> List[KitchenTicket]:
+        """Copies of the station's tickets; the board's own are changed by events from other threads"""
+        statuses = set(statuses)
+        with self._lock:
+            tickets = (self.tickets[order_item_id] for _, order_item_id in self.queues.get(station, []))
+            return [ticket.model_copy() for ticket in tickets if ticket.status in statuses]
+
+    def get_stations(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            stations = {}
+            for station, queue in self.queues.items():
+                counts = {status: 0 for status in ACTIVE_STATUSES}
+                for _, order_item_id in queue:
+                    counts[self.tickets[order_item_id].status] += 1
+                stations[station] = counts
+            return stations
+
+    # Event listeners, called after commit in the committing thread
+    def on_order_item_event(self, type: str, data: dict) -> None:
+        with self._lock:
+            if type == "item.batch_status":
+                self._touch(data["order_item_ids"])
+            else:
+                self._touch([data["order_item_id"]])
+            if self.loaded_at is None:
+                return
+            if type == "item.deleted":
+                self._remove(data["order_item_id"])
+            elif type == "item.status":
+                self._set_status([data["order_item_id"]], data["status"])
+            elif type == "item.batch_status":
+                self._set_status(data["order_item_ids"], data["status"])
+            else:
+                # Created or edited items: fetched by primary key on the next read
+                self.pending_items.add(data["order_item_id"])
+
+    def on_order_event(self, type: str, data: dict) -> None:
+        with self._lock:
+            self._touch(order_id=data["order_id"])
+            if self.loaded_at is None:
+                return
+            if type == "order.created":
+                self.pending_orders.add(data["order_id"])
+            elif type == "order.deleted" or data.get("status") == "cancelled":
+                for order_item_id in list(self.by_order.get(data["order_id"], ())):
+                    self._remove(order_item_id)
+
+board = KitchenBoard()
+events.add_listener(events.TOPIC_ORDER_ITEMS, board.on_order_item_event)
+events.add_listener(events.TOPIC_ORDERS, board.on_order_event)
+
+def get_stations(db: Session) -> Dict[str, Dict[str, int]]:
+    board.ensure_fresh(db)
+    return board.get_stations()
+
+def get_station_queue(
+    db: Session, station: str, statuses: Iterable[str] = ACTIVE_STATUSES
+) -> List[KitchenTicket]:
+    board.ensure_fresh(db)
+    return board.get_queue(station, statuses)
+
+def bulk_update_status(db: Session, order_item_ids: List[int], status: str) -> List[int]:
+    """
+    Move many items, across orders, to a new status in one transaction.
+    Items not in an allowed source status are left alone. Returns the ids
+    that were updated.
+    """
+    rows = (
+        db.query(OrderItem.order_item_id)
+        .filter(
+            OrderItem.order_item_id.in_(order_item_ids),
+            OrderItem.status.in_(ALLOWED_FROM[status])
+        )
+        .with_for_update()
+        .all()
+    )
+    updated_ids = [order_item_id for (order_item_id,) in rows]
+    if updated_ids:
+        db.query(OrderItem).filter(OrderItem.order_item_id.in_(updated_ids)).update(
+            {OrderItem.status: status}, synchronize_session=False
+        )
+        events.publish_after_commit(db, events.TOPIC_ORDER_ITEMS, "item.batch_status", {
+            "order_id": None,
+            "status": status,
+            "order_item_ids": updated_ids,
+        })
+    db.commit()
+    return updated_ids
+
+def bump_station(
+    db: Session, station: str, from_status: str, status: str, limit: Optional[int] = None
+) -> List[int]:
+    """Move the oldest items of a station from one status to the next"""
+    tickets = get_station_queue(db, station, [from_status])
+    if limit:
+        tickets = tickets[:limit]
+    if not tickets:
+        return []
+    return bulk_update_status(db, [ticket.order_item_id for ticket in tickets], status)
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import List, Optional, Dict
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.schemas.category import Category as CategorySchema
+from app.schemas.menu_item import MenuItem as MenuItemSchema
+
+class MenuCatalog:
+    """
+    Immutable snapshot of the menu: categories, items and their
+    pre-serialized JSON. A new snapshot with a higher version replaces the
+    old one whenever the menu is written.
+    """
+
+    def __init__(
+        self, version: int,
+        categories: List[CategorySchema], menu_items: List[MenuItemSchema]
+    ):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.categories = categories
+        self.menu_items = menu_items
+        self.items_by_id: Dict[int, MenuItemSchema] = {
+            item.menu_item_id: item for item in menu_items
+        }
+        self.categories_by_id: Dict[int, CategorySchema] = {
+            category.category_id: category for category in categories
+        }
+        # JSON fragments are built once so reads only need to join bytes
+        self.item_json: Dict[int, bytes] = {
+            item.menu_item_id: item.model_dump_json().encode() for item in menu_items
+        }
+        self.category_json: Dict[int, bytes] = {
+            category.category_id: category.model_dump_json().encode() for category in categories
+        }
+        self.menu_items_json = self.join_json(self.item_json[item.menu_item_id] for item in menu_items)
+        self.categories_json = self.join_json(self.category_json[c.category_id] for c in categories)
+
+    @staticmethod
+    def join_json(fragments) -> bytes:
+        return b"[" + b",".join(fragments) + b"]"
+
+    def filter_items(
+        self, skip: int = 0, limit: int = 100,
+        category_id: Optional[int] = None, available_only: bool = False
+    ) -> List[MenuItemSchema]:
+        items = self.menu_items
+        if category_id:
+            items = [item for item in items if item.category_id == category_id]
+        if available_only:
+            items = [item for item in items if item.is_available]
+        return items[skip:skip + limit]
+
+    def filter_items_json(
+        self, skip: int = 0, limit: int = 100,
+        category_id: Optional[int] = None, available_only: bool = False
+    ) -> bytes:
+        if not category_id and not available_only and skip == 0 and limit >= len(self.menu_items):
+            return self.menu_items_json
+        items = self.filter_items(skip, limit, category_id, available_only)
+        return self.join_json(self.item_json[item.menu_item_id] for item in items)
+
+    def filter_categories(self, skip: int = 0, limit: int = 100) -> List[CategorySchema]:
+        return self.categories[skip:skip + limit]
+
+    def filter_categories_json(self, skip: int = 0, limit: int = 100) -> bytes:
+        if skip == 0 and limit >= len(self.categories):
+            return self.categories_json
+        categories = self.filter_categories(skip, limit)
+        return self.join_json(self.category_json[c.category_id] for c in categories)
+
+_catalog: Optional[MenuCatalog] = None
+_version = 0
+_lock = threading.RLock()
+
+def refresh_catalog(db: Session) -> MenuCatalog:
+    """Load the menu from the database and swap in a new catalog version"""
+    global _catalog, _version
+    with _lock:
+        categories = db.query(Category).order_by(Category.category_id).all()
+        menu_items = db.query(MenuItem).order_by(MenuItem.menu_item_id).all()
+        _version += 1
+        _catalog = MenuCatalog(
+            _version,
+            [CategorySchema.model_validate(category) for category in categories],
+            [MenuItemSchema.model_validate(item) for item in menu_items],
+        )
+        return _catalog
+
+def install_catalog(
+    categories: List[Category], menu_items: List[MenuItem], loaded_version: int
+) -> MenuCatalog:
+    """
+    Swap in a catalog loaded outside the lock (by the async menu reads).
+    If a write refreshed the catalog while the rows were loading, those
+    rows may be older than it, so the current catalog is kept.
+    """
+    global _catalog, _version
+    with _lock:
+        if _version != loaded_version and _catalog is not None:
+            return _catalog
+        _version += 1
+        _catalog = MenuCatalog(
+            _version,
+            [CategorySchema.model_validate(category) for category in categories],
+            [MenuItemSchema.model_validate(item) for item in menu_items],
+        )
+        return _catalog
+
+def is_fresh(catalog: Optional[MenuCatalog]) -> bool:
+    return catalog is not None and time.monotonic() - catalog.built_at <= settings.MENU_CACHE_TTL_SECONDS
+
+def get_catalog(db: Session) -> MenuCatalog:
+    """
+    Return the current catalog, loading it on first use. Writes in this
+    process refresh it immediately; the TTL bounds how stale it can be
+    after writes made by other worker processes.
+    """
+    catalog = _catalog
+    if not is_fresh(catalog):
+        with _lock:
+            # Another request may have refreshed it while we waited
+            if _catalog is not None and _catalog is not catalog:
+                return _catalog
+            return refresh_catalog(db)
+    return catalog
+
+def get_version() -> int:
+    return _version
+
+def peek_catalog() -> Optional[MenuCatalog]:
+    """The current catalog without loading it"""
+    return _catalog
\ No newline at end of file
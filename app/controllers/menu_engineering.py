@@ -0,0 +1,173 @@
+import csv
+import io
+import time
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.controllers import analytics as analytics_controller
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+
+SCOPES = ("category", "menu")
+CLASSES = ("star", "plowhorse", "puzzle", "dog", "unknown")
+
+# An item is popular when it sells at least 70% of its fair share
+# (1 / number of items) of the units in its scope
+POPULARITY_FACTOR = 0.7
+
+CSV_COLUMNS = (
+    "menu_item_id", "name", "category_id", "category_name", "price", "cost",
+    "units_sold", "revenue", "avg_price", "unit_margin", "total_margin",
+    "menu_mix", "category_share", "category_revenue_share", "popularity", "profitability",
+    "classification",
+)
+
+# Reports per (start, end, scope) window
+report_cache = TTLCache(maxsize=64, ttl=settings.MENU_ENGINEERING_CACHE_TTL_SECONDS)
+
+def share(values: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """values / totals, 0 where the total is 0"""
+    return np.divide(values, totals, out=np.zeros(len(values)), where=totals > 0)
+
+def classify(
+    units: np.ndarray, revenue: np.ndarray, price: np.ndarray, cost: np.ndarray, scopes: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Popularity x contribution matrix for every item at once. scopes holds
+    each item's comparison group (0..n-1). Items without a cost (NaN) have
+    no margin (NaN): they count towards popularity but are left out of
+    their scope's average margin and classified as unknown. Unsold items
+    are priced at their list price.
+    """
+    size = int(scopes.max(initial=-1)) + 1
+    avg_price = np.divide(revenue, units, out=price.copy(), where=units > 0)
+    has_cost = ~np.isnan(cost)
+    unit_margin = avg_price - cost
+    total_margin = unit_margin * units
+
+    scope_units = np.bincount(scopes, weights=units, minlength=size)[scopes]
+    scope_items = np.bincount(scopes, minlength=size)[scopes]
+    menu_mix = share(units, scope_units)
+    # Weighted average margin of the scope's costed items: what an average
+    # costed unit sold contributes
+    costed_units = np.bincount(scopes, weights=np.where(has_cost, units, 0), minlength=size)[scopes]
+    costed_margin = np.bincount(scopes, weights=np.where(has_cost, total_margin, 0), minlength=size)[scopes]
+    average_margin = share(costed_margin, costed_units)
+
+    popular = (units > 0) & (menu_mix >= POPULARITY_FACTOR / scope_items)
+    profitable = has_cost & (np.where(has_cost, unit_margin, 0) >= average_margin)
+    # star: popular & profitable, plowhorse: popular only, puzzle: profitable only,
+    # dog: neither, unknown: no cost
+    classification = np.where(popular, np.where(profitable, 0, 1), np.where(profitable, 2, 3))
+    classification = np.where(has_cost, classification, 4)
+    return {
+        "avg_price": avg_price,
+        "unit_margin": unit_margin,
+        "total_margin": total_margin,
+        "has_cost": has_cost,
+        "menu_mix": menu_mix,
+        "popular": popular,
+        "profitable": profitable,
+        "classification": classification,
+    }
+
+def build_report(db: Session, start: datetime, end: datetime, scope: str = "category") -> Dict[str, Any]:
+    """
+    Menu engineering report for every menu item over [start, end), from
+    one columnar fetch of the order items (hot and archived). Items are
+    compared within their category, or across the whole menu.
+    """
+    started = time.perf_counter()
+    menu = db.query(
+        MenuItem.menu_item_id, MenuItem.name, MenuItem.category_id, Category.name,
+        MenuItem.price, MenuItem.cost
+    ).outerjoin(
+        Category, Category.category_id == MenuItem.category_id
+    ).order_by(MenuItem.menu_item_id).all()
+    columns = analytics_controller.load_item_columns(db, start, end)
+    fetched = time.perf_counter()
+
+    item_ids = np.array([row[0] for row in menu], dtype=np.int64)
+    category_ids = analytics_controller.to_ids([row[2] for row in menu])
+    price = np.array([row[4] for row in menu], dtype=np.float64)
+    cost = np.array([np.nan if row[5] is None else row[5] for row in menu], dtype=np.float64)
+
+    # Map every sold line onto its menu item
+    position, known = analytics_controller.item_positions(item_ids, columns["menu_item_id"])
+    units = np.bincount(position[known], weights=columns["quantity"][known], minlength=len(item_ids))
+    revenue = np.bincount(position[known], weights=columns["revenue"][known], minlength=len(item_ids))
+
+    _, categories = analytics_controller.factorize(category_ids)
+    if scope == "menu":
+        scopes = np.zeros(len(item_ids), dtype=np.int64)
+    else:
+        scopes = categories
+    result = classify(units, revenue, price, cost, scopes)
+    category_size = int(categories.max(initial=-1)) + 1
+    category_share = share(units, np.bincount(categories, weights=units, minlength=category_size)[categories])
+    category_revenue_share = share(revenue, np.bincount(categories, weights=revenue, minlength=category_size)[categories])
+    computed = time.perf_counter()
+
+    items = []
+    for index, (menu_item_id, name, category_id, category_name, item_price, item_cost) in enumerate(menu):
+        items.append({
+            "menu_item_id": menu_item_id,
+            "name": name,
+            "category_id": category_id,
+            "category_name": category_name,
+            "price": float(item_price),
+            "cost": None if item_cost is None else float(item_cost),
+            "units_sold": int(round(units[index])),
+            "revenue": round(float(revenue[index]), 2),
+            "avg_price": round(float(result["avg_price"][index]), 2),
+            "unit_margin": round(float(result["unit_margin"][index]), 2) if result["has_cost"][index] else None,
+            "total_margin": round(float(result["total_margin"][index]), 2) if result["has_cost"][index] else None,
+            "menu_mix": round(float(result["menu_mix"][index]), 4),
+            "category_share": round(float(category_share[index]), 4),
+            "category_revenue_share": round(float(category_revenue_share[index]), 4),
+            "popularity": "high" if result["popular"][index] else "low",
+            "profitability": (
+                "high" if result["profitable"][index] else "low"
+            ) if result["has_cost"][index] else "unknown",
+            "classification": CLASSES[result["classification"][index]],
+        })
+
+    return {
+        "start": start,
+        "end": end,
+        "scope": scope,
+        "items": items,
+        "summary": {
+            name: int(count) for name, count in
+            zip(CLASSES, np.bincount(result["classification"], minlength=len(CLASSES)))
+        },
+        "items_without_cost": int((~result["has_cost"]).sum()),
+        "rows": int(len(columns["timestamp"])),
+        "fetch_ms": round((fetched - started) * 1000, 3),
+        "compute_ms": round((computed - fetched) * 1000, 3),
+    }
+
+def get_report(
+    db: Session, start: datetime, end: datetime, scope: str = "category", refresh: bool = False
+) -> Tuple[Dict[str, Any], bool]:
+    """Cached report for the window, and whether it came from the cache"""
+    key = (start, end, scope)
+    if not refresh:
+        report = report_cache.get(key)
+        if report is not None:
+            return report, True
+    report = build_report(db, start, end, scope)
+    report_cache.set(key, report)
+    return report, False
+
+def report_csv(report: Dict[str, Any]) -> str:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(report["items"])
+    return output.getvalue()
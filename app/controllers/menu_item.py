@@ -3,8 +3,10 @@ from sqlalchemy.orm import Session
 import os
 from pathlib import Path
 
+from app.core import events
 from app.models.menu_item import MenuItem
 from app.schemas.menu_item import MenuItemCreate, MenuItemUpdate
+from app.controllers import menu_catalog
 
 def get_menu_item(db: Session, menu_item_id: int) -> Optional[MenuItem]:
     return db.query(MenuItem).filter(MenuItem.menu_item_id == menu_item_id).first()
@@ -30,12 +32,14 @@ def create_menu_item(db: Session, menu_item: MenuItemCreate) -> MenuItem:
         name=menu_item.name,
         description=menu_item.description,
         price=menu_item.price,
+        cost=menu_item.cost,
         is_available=menu_item.is_available,
         image_url=menu_item.image_url if hasattr(menu_item, 'image_url') else None
     )
     db.add(db_menu_item)
     db.commit()
     db.refresh(db_menu_item)
+    events.run_after_commit(db, menu_catalog.refresh_catalog, db)
     return db_menu_item
 
 def update_menu_item(
@@ -65,6 +69,7 @@ def update_menu_item(
             
         db.commit()
         db.refresh(db_menu_item)
+        events.run_after_commit(db, menu_catalog.refresh_catalog, db)
     return db_menu_item
 
 def delete_menu_item(db: Session, menu_item_id: int) -> Optional[MenuItem]:
@@ -86,6 +91,7 @@ def delete_menu_item(db: Session, menu_item_id: int) -> Optional[MenuItem]:
                 
         db.delete(db_menu_item)
         db.commit()
+        events.run_after_commit(db, menu_catalog.refresh_catalog, db)
         return db_menu_item
     return None
 
@@ -95,4 +101,5 @@ def toggle_availability(db: Session, menu_item_id: int) -> Optional[MenuItem]:
         db_menu_item.is_available = not db_menu_item.is_available
         db.commit()
         db.refresh(db_menu_item)
+        events.run_after_commit(db, menu_catalog.refresh_catalog, db)
     return db_menu_item
\ No newline at end of file
@@ -1,16 +1,43 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Tuple, Union
+from sqlalchemy import insert, func
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.menu_item import MenuItem
+from app.models.customer import Customer
+from app.core import etag, events
 from app.schemas.order import OrderCreate, OrderUpdate
-from app.controllers import order_item as order_item_controller
+from app.schemas.customer import CustomerCreate
+from app.controllers import customer as customer_controller
+from app.controllers import table as table_controller
+from app.controllers import feedback as feedback_controller
+
+def publish_order_event(db: Session, db_order: Order, type: str) -> None:
+    """Queue an order delta for real-time clients, sent after commit"""
+    data = {
+        "order_id": db_order.order_id,
+        "table_id": db_order.table_id,
+        "waiter_id": db_order.waiter_id,
+        "status": db_order.status,
+        "total_amount": db_order.total_amount,
+    }
+    if type == "order.deleted":
+        # Listeners can no longer look the order up once it is gone
+        data["order_date"] = db_order.order_date
+    events.publish_after_commit(db, events.TOPIC_ORDERS, type, data, table_id=db_order.table_id)
 
 def get_order(db: Session, order_id: int) -> Optional[Order]:
     return db.query(Order).filter(Order.order_id == order_id).first()
 
+def get_order_for_update(db: Session, order_id: int) -> Optional[Order]:
+    """Load an order with its row locked (SELECT ... FOR UPDATE) until commit"""
+    return (
+        db.query(Order).filter(Order.order_id == order_id)
+        .with_for_update().populate_existing().first()
+    )
+
 def get_orders(
     db: Session, skip: int = 0, limit: int = 100, 
     status: Optional[str] = None, customer_id: Optional[int] = None,
@@ -31,73 +58,186 @@ def get_orders(
 
 def calculate_order_total(db: Session, order_id: int) -> Decimal:
     """Calculate the total amount for an order based on its items"""
-    total = Decimal('0.00')
+    total = db.query(func.sum(OrderItem.line_total)).filter(
+        OrderItem.order_id == order_id
+    ).scalar()
     
-    order_items = db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
-    for item in order_items:
-        menu_item = db.query(MenuItem).filter(MenuItem.menu_item_id == item.menu_item_id).first()
-        if menu_item:
-            total += menu_item.price * Decimal(item.quantity)
-            
-    return total
+    return Decimal(total) if total is not None else Decimal('0.00')
 
-def create_order(db: Session, order: OrderCreate) -> Order:
-    # Create the order
+def reconcile_order_total(db: Session, order_id: int) -> Optional[Order]:
+    """
+    Recompute the stored total from the order items.
+    Item changes maintain the total incrementally, so this is only needed
+    to repair totals that have drifted.
+    """
+    db_order = get_order(db, order_id)
+    if db_order:
+        total = calculate_order_total(db, order_id)
+        delta = total - (db_order.total_amount or Decimal('0.00'))
+        # The table's running total drifted by the same amount
+        table_controller.apply_running_total_delta(db, order_id, delta)
+        db_order.total_amount = total
+        db.commit()
+        if delta:
+            events.run_after_commit(db, etag.bump_version, "table")
+        db.refresh(db_order)
+    return db_order
+
+def get_menu_prices(db: Session, menu_item_ids) -> Dict[int, Decimal]:
+    """Current prices for a set of menu items in one IN query"""
+    if not menu_item_ids:
+        return {}
+    return dict(
+        db.query(MenuItem.menu_item_id, MenuItem.price)
+        .filter(MenuItem.menu_item_id.in_(menu_item_ids))
+        .all()
+    )
+
+def add_order(db: Session, order: OrderCreate, prices: Optional[Dict[int, Decimal]] = None) -> Order:
+    """
+    Add an order with its items to the current transaction without
+    committing. prices can be passed in when creating many orders at once.
+    """
     db_order = Order(
         customer_id=order.customer_id,
         table_id=order.table_id,
         waiter_id=order.waiter_id,
         status=order.status,
-        total_amount=Decimal('0.00')  # Will be calculated after adding items
+        total_amount=Decimal('0.00')
     )
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
     
-    # Add order items if provided
+    # Flush to get the order_id for the item rows
+    db.flush()
+    
     if order.order_items:
-        for item in order.order_items:
-            order_item = OrderItem(
-                order_id=db_order.order_id,
-                menu_item_id=item.menu_item_id,
-                quantity=item.quantity,
-                special_request=item.special_request,
-                status=item.status
-            )
-            db.add(order_item)
+        if prices is None:
+            prices = get_menu_prices(db, {item.menu_item_id for item in order.order_items})
         
-        db.commit()
+        total = Decimal('0.00')
+        order_item_rows = []
+        for item in order.order_items:
+            unit_price = prices.get(item.menu_item_id, Decimal('0.00'))
+            line_total = unit_price * Decimal(item.quantity)
+            order_item_rows.append({
+                "order_id": db_order.order_id,
+                "menu_item_id": item.menu_item_id,
+                "quantity": item.quantity,
+                "unit_price": unit_price,
+                "line_total": line_total,
+                "special_request": item.special_request,
+                "status": item.status
+            })
+            total += line_total
         
-        # Calculate and update the total amount
-        db_order.total_amount = calculate_order_total(db, db_order.order_id)
-        db.commit()
-        db.refresh(db_order)
+        db.execute(insert(OrderItem), order_item_rows)
+        db_order.total_amount = total
     
+    table_controller.sync_table_occupancy(db, db_order.table_id)
+    publish_order_event(db, db_order, "order.created")
+    return db_order
+
+def create_order(db: Session, order: OrderCreate) -> Order:
+    """Create an order with its items in a single transaction.
+
+    Menu prices are resolved with one IN query, the items are bulk inserted
+    and the total is computed in memory, so the number of round trips does
+    not grow with the number of items.
+    """
+    db_order = add_order(db, order)
+    table_id = db_order.table_id
+    db.commit()
+    if table_id:
+        events.run_after_commit(db, etag.bump_version, "table")
+    db.refresh(db_order)
     return db_order
 
+def create_customer_order(db: Session, customer: CustomerCreate, order: OrderCreate) -> Order:
+    """Find or create the customer, then create their order"""
+    db_customer = customer_controller.get_or_create_customer(db, customer=customer)
+    order.customer_id = db_customer.customer_id
+    return create_order(db, order=order)
+
+def create_customer_orders_batch(
+    db: Session, entries: List[Tuple[CustomerCreate, OrderCreate]]
+) -> List[Union[Order, Exception]]:
+    """
+    Create many customer orders in one transaction (group commit).
+    Prices and existing customers are loaded with one query each for the
+    whole batch. Every order runs in its own savepoint, so a bad order only
+    fails itself. Returns the created order or the error, per entry.
+    """
+    prices = get_menu_prices(db, {
+        item.menu_item_id for _, order in entries for item in order.order_items
+    })
+    contact_numbers = {customer.contact_number for customer, _ in entries if customer.contact_number}
+    customers: Dict[str, Customer] = {}
+    if contact_numbers:
+        customers = {
+            db_customer.contact_number: db_customer for db_customer in
+            db.query(Customer).filter(Customer.contact_number.in_(contact_numbers)).all()
+        }
+    
+    results: List[Union[Order, Exception]] = []
+    for customer, order in entries:
+        mark = events.pending_mark(db)
+        try:
+            with db.begin_nested():
+                db_customer = customers.get(customer.contact_number) if customer.contact_number else None
+                if db_customer is None:
+                    db_customer = Customer(name=customer.name, contact_number=customer.contact_number)
+                    db.add(db_customer)
+                    db.flush()
+                elif customer.name and customer.name != db_customer.name:
+                    db_customer.name = customer.name
+                order.customer_id = db_customer.customer_id
+                db_order = add_order(db, order, prices)
+        except Exception as e:
+            events.discard_pending_since(db, mark)
+            results.append(e)
+            continue
+        if customer.contact_number:
+            customers[customer.contact_number] = db_customer
+        results.append(db_order)
+    
+    db.commit()
+    events.run_after_commit(db, etag.bump_version, "table")
+    return results
+
 def update_order(
     db: Session, order_id: int, order: OrderUpdate
 ) -> Optional[Order]:
     db_order = get_order(db, order_id)
     if db_order:
+        old_table_id = db_order.table_id
         update_data = order.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_order, field, value)
         
-        # Recalculate total if needed
-        if 'total_amount' not in update_data:
-            db_order.total_amount = calculate_order_total(db, order_id)
-            
+        # The order may have moved tables or changed status
+        changed = [
+            table_controller.sync_table_occupancy(db, table_id)
+            for table_id in {old_table_id, db_order.table_id}
+        ]
+        publish_order_event(db, db_order, "order.updated")
         db.commit()
+        if any(changed):
+            events.run_after_commit(db, etag.bump_version, "table")
         db.refresh(db_order)
     return db_order
 
 def delete_order(db: Session, order_id: int) -> Optional[Order]:
     db_order = get_order(db, order_id)
     if db_order:
+        # Its feedback goes with it (cascade), so take it out of the rating statistics
+        feedback_controller.uncount_feedbacks(db, db_order.feedbacks)
         # Delete associated order items (should be handled by cascade)
         db.delete(db_order)
+        changed = table_controller.sync_table_occupancy(db, db_order.table_id)
+        publish_order_event(db, db_order, "order.deleted")
         db.commit()
+        if changed:
+            events.run_after_commit(db, etag.bump_version, "table")
         return db_order
     return None
 
@@ -106,6 +246,10 @@ def update_order_status(db: Session, order_id: int, status: str) -> Optional[Ord
     db_order = get_order(db, order_id)
     if db_order:
         db_order.status = status
+        changed = table_controller.sync_table_occupancy(db, db_order.table_id)
+        publish_order_event(db, db_order, "order.status")
         db.commit()
+        if changed:
+            events.run_after_commit(db, etag.bump_version, "table")
         db.refresh(db_order)
     return db_order
\ No newline at end of file
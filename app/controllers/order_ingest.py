@@ -0,0 +1,160 @@
+import queue
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.controllers import order as order_controller
+from app.schemas.customer import CustomerCreate
+from app.schemas.order import OrderCreate
+
+# Ticket statuses
+QUEUED = "queued"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+
+class IngestTicket:
+    """A customer order accepted into the ingest queue"""
+
+    def __init__(self, customer: CustomerCreate, order: OrderCreate):
+        self.token = secrets.token_urlsafe(16)
+        self.customer = customer
+        self.order = order
+        self.status = QUEUED
+        self.order_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self.queued_at = time.monotonic()
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "token": self.token,
+            "status": self.status,
+            "order_id": self.order_id,
+            "error": self.error,
+        }
+
+class OrderIngest:
+    """
+    Group-commit pipeline for public customer orders. Requests only
+    validate and enqueue; one writer thread drains the queue in
+    micro-batches of up to ORDER_INGEST_BATCH_SIZE orders or
+    ORDER_INGEST_BATCH_MS milliseconds and writes each batch in one
+    transaction. Tickets are kept for ORDER_INGEST_TOKEN_TTL_SECONDS so
+    clients can poll for their order id.
+    """
+
+    def __init__(self, batch_size: int, batch_ms: int, queue_size: int, token_ttl: int):
+        self.batch_size = batch_size
+        self.batch_seconds = batch_ms / 1000
+        self.queue: "queue.Queue[Optional[IngestTicket]]" = queue.Queue(maxsize=queue_size)
+        self.tickets = TTLCache(maxsize=max(queue_size * 4, 1024), ttl=token_ttl)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.orders = 0
+        self.failed = 0
+        self.last_batch_size = 0
+        self.last_batch_ms = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name="order-ingest", daemon=True)
+                self._writer.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Flush what is queued and stop the writer"""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            self.queue.put(None)
+            writer.join(timeout)
+
+    def submit(self, customer: CustomerCreate, order: OrderCreate) -> IngestTicket:
+        """Enqueue an order; raises queue.Full when the pipeline is saturated"""
+        self.start()
+        ticket = IngestTicket(customer, order)
+        self.tickets.set(ticket.token, ticket)
+        self.queue.put_nowait(ticket)
+        return ticket
+
+    def get_ticket(self, token: str) -> Optional[IngestTicket]:
+        return self.tickets.get(token)
+
+    def _next_batch(self) -> List[Optional[IngestTicket]]:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.batch_seconds
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is None
+            tickets = [ticket for ticket in batch if ticket is not None]
+            if tickets:
+                self._write_batch(tickets)
+            if stopping:
+                return
+
+    def _write_batch(self, tickets: List[IngestTicket]) -> None:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            results = order_controller.create_customer_orders_batch(
+                db, [(ticket.customer, ticket.order) for ticket in tickets]
+            )
+            for ticket, result in zip(tickets, results):
+                if isinstance(result, Exception):
+                    ticket.status, ticket.error = FAILED, str(result)
+                else:
+                    ticket.status, ticket.order_id = CONFIRMED, result.order_id
+        except Exception as e:
+            db.rollback()
+            print(f"Order ingest batch failed: {str(e)}")
+            for ticket in tickets:
+                ticket.status, ticket.error = FAILED, str(e)
+        finally:
+            db.close()
+
+        for ticket in tickets:
+            if ticket.status == FAILED:
+                self.failed += 1
+            ticket.done.set()
+        self.batches += 1
+        self.orders += len(tickets)
+        self.last_batch_size = len(tickets)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "batches": self.batches,
+            "orders": self.orders,
+            "failed": self.failed,
+            "avg_batch_size": self.orders / self.batches if self.batches else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+        }
+
+ingest = OrderIngest(
+    batch_size=settings.ORDER_INGEST_BATCH_SIZE,
+    batch_ms=settings.ORDER_INGEST_BATCH_MS,
+    queue_size=settings.ORDER_INGEST_QUEUE_SIZE,
+    token_ttl=settings.ORDER_INGEST_TOKEN_TTL_SECONDS,
+)
+
+def is_enabled() -> bool:
+    return settings.ORDER_INGEST_MODE == "queue"
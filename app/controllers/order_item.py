@@ -1,8 +1,24 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from decimal import Decimal
 
+from app.core import etag, events
+from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.menu_item import MenuItem
 from app.schemas.order_item import OrderItemCreate, OrderItemUpdate
+from app.controllers import table as table_controller
+
+def publish_order_item_event(db: Session, db_order_item: OrderItem, type: str) -> None:
+    """Queue an order item delta for real-time clients, sent after commit"""
+    events.publish_after_commit(db, events.TOPIC_ORDER_ITEMS, type, {
+        "order_item_id": db_order_item.order_item_id,
+        "order_id": db_order_item.order_id,
+        "menu_item_id": db_order_item.menu_item_id,
+        "quantity": db_order_item.quantity,
+        "status": db_order_item.status,
+        "line_total": db_order_item.line_total,
+    })
 
 def get_order_item(db: Session, order_item_id: int) -> Optional[OrderItem]:
     return db.query(OrderItem).filter(OrderItem.order_item_id == order_item_id).first()
@@ -12,16 +28,39 @@ def get_order_items_by_order(
 ) -> List[OrderItem]:
     return db.query(OrderItem).filter(OrderItem.order_id == order_id).offset(skip).limit(limit).all()
 
+def get_menu_item_price(db: Session, menu_item_id: int) -> Decimal:
+    price = db.query(MenuItem.price).filter(MenuItem.menu_item_id == menu_item_id).scalar()
+    return price if price is not None else Decimal('0.00')
+
+def apply_order_total_delta(db: Session, order_id: int, delta: Decimal) -> None:
+    """Add delta to the order total, and its table's running total, inside the current transaction"""
+    if delta:
+        db.query(Order).filter(Order.order_id == order_id).update(
+            {Order.total_amount: Order.total_amount + delta},
+            synchronize_session=False
+        )
+        table_controller.apply_running_total_delta(db, order_id, delta)
+
 def create_order_item(db: Session, order_item: OrderItemCreate) -> OrderItem:
+    unit_price = get_menu_item_price(db, order_item.menu_item_id)
     db_order_item = OrderItem(
         order_id=order_item.order_id,
         menu_item_id=order_item.menu_item_id,
         quantity=order_item.quantity,
+        unit_price=unit_price,
+        line_total=unit_price * Decimal(order_item.quantity),
         special_request=order_item.special_request,
         status=order_item.status,
     )
     db.add(db_order_item)
+    
+    # Keep the order total in sync within the same transaction
+    apply_order_total_delta(db, order_item.order_id, db_order_item.line_total)
+    
+    db.flush()
+    publish_order_item_event(db, db_order_item, "item.created")
     db.commit()
+    events.run_after_commit(db, etag.bump_version, "table")
     db.refresh(db_order_item)
     return db_order_item
 
@@ -31,17 +70,47 @@ def update_order_item(
     db_order_item = get_order_item(db, order_item_id)
     if db_order_item:
         update_data = order_item.dict(exclude_unset=True)
+        old_order_id = db_order_item.order_id
+        old_menu_item_id = db_order_item.menu_item_id
+        old_line_total = db_order_item.line_total
+        moved = update_data.get('order_id', old_order_id) != old_order_id
+        if moved:
+            # Clients and listeners see a move as a delete from the old order
+            # and a create in the new one
+            publish_order_item_event(db, db_order_item, "item.deleted")
+        
         for field, value in update_data.items():
             setattr(db_order_item, field, value)
+        
+        if 'quantity' in update_data or 'menu_item_id' in update_data:
+            # Only a different menu item takes a new price snapshot
+            if db_order_item.menu_item_id != old_menu_item_id:
+                db_order_item.unit_price = get_menu_item_price(db, db_order_item.menu_item_id)
+            db_order_item.line_total = db_order_item.unit_price * Decimal(db_order_item.quantity)
+        
+        if moved:
+            apply_order_total_delta(db, old_order_id, -old_line_total)
+            apply_order_total_delta(db, db_order_item.order_id, db_order_item.line_total)
+        else:
+            apply_order_total_delta(db, db_order_item.order_id, db_order_item.line_total - old_line_total)
+        
+        total_changed = moved or db_order_item.line_total != old_line_total
+        publish_order_item_event(db, db_order_item, "item.created" if moved else "item.updated")
         db.commit()
+        if total_changed:
+            events.run_after_commit(db, etag.bump_version, "table")
         db.refresh(db_order_item)
     return db_order_item
 
 def delete_order_item(db: Session, order_item_id: int) -> Optional[OrderItem]:
     db_order_item = get_order_item(db, order_item_id)
     if db_order_item:
+        apply_order_total_delta(db, db_order_item.order_id, -db_order_item.line_total)
+        
         db.delete(db_order_item)
+        publish_order_item_event(db, db_order_item, "item.deleted")
         db.commit()
+        events.run_after_commit(db, etag.bump_version, "table")
         return db_order_item
     return None
 
@@ -50,16 +119,25 @@ def update_order_item_status(db: Session, order_item_id: int, status: str) -> Op
     db_order_item = get_order_item(db, order_item_id)
     if db_order_item:
         db_order_item.status = status
+        publish_order_item_event(db, db_order_item, "item.status")
         db.commit()
         db.refresh(db_order_item)
     return db_order_item
 
 def batch_update_status(db: Session, order_id: int, status: str) -> List[OrderItem]:
-    """Update the status of all items in an order"""
-    db_order_items = get_order_items_by_order(db, order_id)
-    
-    for item in db_order_items:
-        item.status = status
+    """Update the status of all items in an order with one set-based UPDATE"""
+    order_item_ids = [
+        order_item_id for (order_item_id,) in
+        db.query(OrderItem.order_item_id).filter(OrderItem.order_id == order_id).all()
+    ]
+    db.query(OrderItem).filter(OrderItem.order_id == order_id).update(
+        {OrderItem.status: status}, synchronize_session=False
+    )
     
+    events.publish_after_commit(db, events.TOPIC_ORDER_ITEMS, "item.batch_status", {
+        "order_id": order_id,
+        "status": status,
+        "order_item_ids": order_item_ids,
+    })
     db.commit()
-    return db_order_items
\ No newline at end of file
+    return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
\ No newline at end of file
@@ -1,10 +1,23 @@
 from typing import List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
+from app.core import etag, events
+from app.models.order import Order
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 from app.controllers import order as order_controller
+from app.controllers import table as table_controller
+
+def publish_payment_event(db: Session, db_payment: Payment, type: str, table_id: Optional[int] = None) -> None:
+    """Queue a payment delta for real-time clients, sent after commit"""
+    events.publish_after_commit(db, events.TOPIC_PAYMENTS, type, {
+        "payment_id": db_payment.payment_id,
+        "order_id": db_payment.order_id,
+        "amount": db_payment.amount,
+        "payment_method": db_payment.payment_method,
+    }, table_id=table_id)
 
 def get_payment(db: Session, payment_id: int) -> Optional[Payment]:
     return db.query(Payment).filter(Payment.payment_id == payment_id).first()
@@ -17,20 +30,34 @@ def get_payments(
 ) -> List[Payment]:
     return db.query(Payment).order_by(Payment.payment_date.desc()).offset(skip).limit(limit).all()
 
+def apply_paid_delta(order, delta: Decimal) -> None:
+    """Add delta to a locked order's paid amount"""
+    if order is not None and delta:
+        order.paid_amount = (order.paid_amount or Decimal('0.00')) + delta
+
 def create_payment(db: Session, payment: PaymentCreate) -> Payment:
+    # Lock the order first so concurrent split payments apply one at a time
+    order = order_controller.get_order_for_update(db, payment.order_id)
     db_payment = Payment(
         order_id=payment.order_id,
         amount=payment.amount,
         payment_method=payment.payment_method,
     )
     db.add(db_payment)
+    apply_paid_delta(order, payment.amount)
     
-    # Update order status to completed if payment is made
-    order = order_controller.get_order(db, payment.order_id)
+    # Update order status to completed if payment is made, freeing the table
+    changed = None
     if order and order.status != 'completed':
         order.status = 'completed'
+        changed = table_controller.sync_table_occupancy(db, order.table_id)
+        order_controller.publish_order_event(db, order, "order.status")
     
+    db.flush()
+    publish_payment_event(db, db_payment, "payment.created", table_id=order.table_id if order else None)
     db.commit()
+    if changed:
+        events.run_after_commit(db, etag.bump_version, "table")
     db.refresh(db_payment)
     return db_payment
 
@@ -39,9 +66,20 @@ def update_payment(
 ) -> Optional[Payment]:
     db_payment = get_payment(db, payment_id)
     if db_payment:
+        old_order_id, old_amount = db_payment.order_id, db_payment.amount
         update_data = payment.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_payment, field, value)
+        
+        if db_payment.order_id != old_order_id or db_payment.amount != old_amount:
+            # Lock in id order so two moves between the same orders cannot deadlock
+            orders = {
+                order_id: order_controller.get_order_for_update(db, order_id)
+                for order_id in sorted({old_order_id, db_payment.order_id})
+            }
+            apply_paid_delta(orders[old_order_id], -old_amount)
+            apply_paid_delta(orders[db_payment.order_id], db_payment.amount)
+        publish_payment_event(db, db_payment, "payment.updated")
         db.commit()
         db.refresh(db_payment)
     return db_payment
@@ -49,21 +87,34 @@ def update_payment(
 def delete_payment(db: Session, payment_id: int) -> Optional[Payment]:
     db_payment = get_payment(db, payment_id)
     if db_payment:
+        order = order_controller.get_order_for_update(db, db_payment.order_id)
+        apply_paid_delta(order, -db_payment.amount)
         db.delete(db_payment)
+        publish_payment_event(db, db_payment, "payment.deleted")
         db.commit()
         return db_payment
     return None
 
 def get_total_payments_for_order(db: Session, order_id: int) -> Decimal:
-    """Calculate the total amount paid for an order"""
-    payments = get_payments_by_order(db, order_id)
-    return sum(payment.amount for payment in payments)
+    """The amount paid for an order, read from its running paid_amount"""
+    paid = db.query(Order.paid_amount).filter(Order.order_id == order_id).scalar()
+    return paid if paid is not None else Decimal('0.00')
 
 def is_order_fully_paid(db: Session, order_id: int) -> bool:
     """Check if an order is fully paid"""
-    order = order_controller.get_order(db, order_id)
-    if not order:
-        return False
-        
-    total_paid = get_total_payments_for_order(db, order_id)
-    return total_paid >= order.total_amount
\ No newline at end of file
+    balance_due = db.query(Order.balance_due).filter(Order.order_id == order_id).scalar()
+    return balance_due is not None and balance_due <= 0
+
+def reconcile_paid_amount(db: Session, order_id: int) -> Optional[Order]:
+    """
+    Recompute an order's paid amount from its payments.
+    Payment changes maintain it incrementally, so this is only needed to
+    repair amounts that have drifted.
+    """
+    db_order = order_controller.get_order_for_update(db, order_id)
+    if db_order:
+        paid = db.query(func.sum(Payment.amount)).filter(Payment.order_id == order_id).scalar()
+        db_order.paid_amount = paid if paid is not None else Decimal('0.00')
+        db.commit()
+        db.refresh(db_order)
+    return db_order
\ No newline at end of file
@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Set
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.controllers import archive as archive_controller
+from app.models.archive import OrderArchive
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.rollup import SalesHourly, ItemSalesHourly, WaiterSalesHourly
+
+HOUR = timedelta(hours=1)
+
+# Changes that cannot move any rolled-up figure (every status is counted)
+STATUS_ONLY_EVENTS = {"order.status", "item.status", "item.batch_status"}
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+def rebuild_range(db: Session, start: datetime, end: datetime) -> None:
+    """
+    Recompute the rollup rows of every hour in [start, end) from the
+    orders, hot and archived, without committing. start and end must be
+    on hour boundaries.
+    """
+    for model in (SalesHourly, ItemSalesHourly, WaiterSalesHourly):
+        db.query(model).filter(model.bucket >= start, model.bucket < end).delete(synchronize_session=False)
+
+    sales: Dict[datetime, Dict[str, Any]] = defaultdict(
+        lambda: {"order_count": 0, "revenue": Decimal('0.00'), "paid_amount": Decimal('0.00')}
+    )
+    waiters: Dict[tuple, Dict[str, Any]] = defaultdict(lambda: {"order_count": 0, "revenue": Decimal('0.00')})
+    orders = archive_controller.orders_source(db, start, end)
+    for order_date, waiter_id, total_amount, paid_amount in db.execute(
+        select(orders.c.order_date, orders.c.waiter_id, orders.c.total_amount, orders.c.paid_amount)
+    ).yield_per(1000):
+        bucket = hour_bucket(order_date)
+        row = sales[bucket]
+        row["order_count"] += 1
+        row["revenue"] += total_amount or Decimal('0.00')
+        row["paid_amount"] += paid_amount or Decimal('0.00')
+        if waiter_id is not None:
+            waiter = waiters[(bucket, waiter_id)]
+            waiter["order_count"] += 1
+            waiter["revenue"] += total_amount or Decimal('0.00')
+
+    items: Dict[tuple, Dict[str, Any]] = defaultdict(
+        lambda: {"category_id": None, "line_count": 0, "quantity": 0, "revenue": Decimal('0.00')}
+    )
+    order_items = archive_controller.order_items_source(db, start, end)
+    for order_date, menu_item_id, quantity, line_total, category_id in db.execute(
+        select(
+            order_items.c.order_date, order_items.c.menu_item_id, order_items.c.quantity,
+            order_items.c.line_total, MenuItem.category_id
+        ).outerjoin(MenuItem, MenuItem.menu_item_id == order_items.c.menu_item_id)
+    ).yield_per(1000):
+        item = items[(hour_bucket(order_date), menu_item_id)]
+        item["category_id"] = category_id
+        item["line_count"] += 1
+        item["quantity"] += quantity
+        item["revenue"] += line_total or Decimal('0.00')
+
+    if sales:
+        db.execute(insert(SalesHourly), [{"bucket": bucket, **row} for bucket, row in sales.items()])
+    if waiters:
+        db.execute(insert(WaiterSalesHourly), [
+            {"bucket": bucket, "waiter_id": waiter_id, **row}
+            for (bucket, waiter_id), row in waiters.items()
+        ])
+    if items:
+        db.execute(insert(ItemSalesHourly), [
+            {"bucket": bucket, "menu_item_id": menu_item_id, **row}
+            for (bucket, menu_item_id), row in items.items()
+        ])
+
+def rebuild_all(
+    db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+    chunk: timedelta = timedelta(days=1)
+) -> int:
+    """
+    Backfill the rollups for [start, end), by default all history, one
+    chunk per transaction. Returns the number of chunks rebuilt.
+    """
+    if start is None:
+        start = min(
+            (value for value in (
+                db.query(func.min(Order.order_date)).scalar(),
+                db.query(func.min(OrderArchive.order_date)).scalar(),
+            ) if value is not None),
+            default=None
+        )
+        if start is None:
+            return 0
+    start = hour_bucket(start)
+    end = hour_bucket(end or datetime.now()) + HOUR
+
+    chunks = 0
+    while start < end:
+        chunk_end = min(start + chunk, end)
+        try:
+            rebuild_range(db, start, chunk_end)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        chunks += 1
+        print(f"Rebuilt sales rollups up to {chunk_end.isoformat()}")
+        start = chunk_end
+    return chunks
+
+class RollupRefresher:
+    """
+    Keeps the hourly rollups current. Event listeners note the orders
+    touched by each committed change; a background thread waits
+    ROLLUP_REFRESH_MS to coalesce bursts, then recomputes only the hours
+    those orders fall in, one transaction per hour. Recomputing an hour is
+    idempotent, so an hour that fails is simply retried on the next round.
+    """
+
+    def __init__(self, refresh_ms: int):
+        self.refresh_seconds = refresh_ms / 1000
+        self._order_ids: Set[int] = set()
+        self._buckets: Set[datetime] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._worker: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.failed = 0
+        self.last_refresh_ms = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._stopping = False
+                self._worker = threading.Thread(target=self._run, name="rollup-refresh", daemon=True)
+                self._worker.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Refresh what is pending and stop the worker"""
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+            self._stopping = True
+        if worker is not None and worker.is_alive():
+            self._wakeup.set()
+            worker.join(timeout)
+
+    def mark_orders(self, order_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._order_ids.update(order_ids)
+        self.start()
+        self._wakeup.set()
+
+    def mark_buckets(self, buckets: Iterable[datetime]) -> None:
+        with self._lock:
+            self._buckets.update(buckets)
+        self.start()
+        self._wakeup.set()
+
+    def on_event(self, type: str, data: Dict[str, Any]) -> None:
+        if type in STATUS_ONLY_EVENTS:
+            return
+        order_date = data.get("order_date")
+        if isinstance(order_date, datetime):
+            self.mark_buckets([hour_bucket(order_date)])
+        elif data.get("order_id") is not None:
+            self.mark_orders([data["order_id"]])
+
+    def _take_pending(self):
+        with self._lock:
+            order_ids, self._order_ids = self._order_ids, set()
+            buckets, self._buckets = self._buckets, set()
+        return order_ids, buckets
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._stopping:
+                time.sleep(self.refresh_seconds)
+            order_ids, buckets = self._take_pending()
+            if order_ids or buckets:
+                self.refresh(order_ids, buckets)
+            if self._stopping:
+                return
+
+    def refresh(self, order_ids: Set[int], buckets: Set[datetime]) -> None:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if order_ids:
+                buckets = buckets | {
+                    hour_bucket(order_date) for (order_date,) in
+                    db.query(Order.order_date).filter(Order.order_id.in_(order_ids)).all()
+                }
+            for bucket in sorted(buckets):
+                try:
+                    rebuild_range(db, bucket, bucket + HOUR)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    self.failed += 1
+                    print(f"Rollup refresh failed for {bucket.isoformat()}: {str(e)}")
+                    with self._lock:
+                        self._buckets.add(bucket)
+        except Exception as e:
+            print(f"Rollup refresh failed: {str(e)}")
+            with self._lock:
+                self._order_ids.update(order_ids)
+                self._buckets.update(buckets)
+        finally:
+            db.close()
+        self.refreshes += 1
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_orders": len(self._order_ids),
+            "pending_hours": len(self._buckets),
+            "refreshes": self.refreshes,
+            "failed": self.failed,
+            "last_refresh_ms": round(self.last_refresh_ms, 3),
+        }
+
+refresher = RollupRefresher(refresh_ms=settings.ROLLUP_REFRESH_MS)
+
+for topic in (events.TOPIC_ORDERS, events.TOPIC_ORDER_ITEMS, events.TOPIC_PAYMENTS):
+    events.add_listener(topic, refresher.on_event)
@@ -1,9 +1,27 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from decimal import Decimal
 
+from app.core import etag, events
+from app.models.order import Order
 from app.models.table import Table
 from app.schemas.table import TableCreate, TableUpdate
 
+def publish_table_event(db: Session, db_table: Table, type: str) -> None:
+    """Queue a table delta for real-time clients, sent after commit"""
+    events.publish_after_commit(db, events.TOPIC_TABLES, type, {
+        "table_id": db_table.table_id,
+        "table_number": db_table.table_number,
+        "capacity": db_table.capacity,
+        "status": db_table.status,
+        "current_order_id": db_table.current_order_id,
+        "seated_since": db_table.seated_since,
+        "running_total": db_table.running_total,
+    }, table_id=db_table.table_id)
+
+# Orders that keep a table occupied
+ACTIVE_ORDER_STATUSES = ('pending', 'processing')
+
 def get_table(db: Session, table_id: int) -> Optional[Table]:
     return db.query(Table).filter(Table.table_id == table_id).first()
 
@@ -21,7 +39,10 @@ def create_table(db: Session, table: TableCreate) -> Table:
         capacity=table.capacity,
     )
     db.add(db_table)
+    db.flush()
+    publish_table_event(db, db_table, "table.created")
     db.commit()
+    events.run_after_commit(db, etag.bump_version, "table")
     db.refresh(db_table)
     return db_table
 
@@ -33,7 +54,9 @@ def update_table(
         update_data = table.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_table, field, value)
+        publish_table_event(db, db_table, "table.updated")
         db.commit()
+        events.run_after_commit(db, etag.bump_version, "table")
         db.refresh(db_table)
     return db_table
 
@@ -41,6 +64,61 @@ def delete_table(db: Session, table_id: int) -> Optional[Table]:
     db_table = get_table(db, table_id)
     if db_table:
         db.delete(db_table)
+        publish_table_event(db, db_table, "table.deleted")
         db.commit()
+        events.run_after_commit(db, etag.bump_version, "table")
         return db_table
-    return None
\ No newline at end of file
+    return None
+
+def sync_table_occupancy(db: Session, table_id: Optional[int]) -> Optional[Table]:
+    """
+    Recompute the stored occupancy of a table from its active orders inside
+    the current transaction. The table row is locked first so concurrent
+    order transitions on one table apply in turn. Manual statuses such as
+    reserved are only replaced while the table has active orders.
+    Returns the table if its occupancy changed, so the caller can bump the
+    table ETag version after committing.
+    """
+    if table_id is None:
+        return None
+    db.flush()
+    db_table = db.query(Table).filter(Table.table_id == table_id).with_for_update().first()
+    if not db_table:
+        return None
+    
+    active_orders = (
+        db.query(Order.order_id, Order.order_date, Order.total_amount)
+        .filter(Order.table_id == table_id, Order.status.in_(ACTIVE_ORDER_STATUSES))
+        .order_by(Order.order_date, Order.order_id)
+        .all()
+    )
+    if active_orders:
+        occupancy = (
+            'occupied',
+            active_orders[-1].order_id,
+            active_orders[0].order_date,
+            sum((order.total_amount or Decimal('0.00') for order in active_orders), Decimal('0.00')),
+        )
+    else:
+        status = 'available' if db_table.status == 'occupied' else db_table.status
+        occupancy = (status, None, None, Decimal('0.00'))
+    
+    current = (db_table.status, db_table.current_order_id, db_table.seated_since, db_table.running_total)
+    if current == occupancy:
+        return None
+    db_table.status, db_table.current_order_id, db_table.seated_since, db_table.running_total = occupancy
+    publish_table_event(db, db_table, "table.occupancy")
+    return db_table
+
+def apply_running_total_delta(db: Session, order_id: int, delta: Decimal) -> None:
+    """Add an order total change to its table, if the order is active"""
+    if delta:
+        table_id = (
+            db.query(Order.table_id)
+            .filter(Order.order_id == order_id, Order.status.in_(ACTIVE_ORDER_STATUSES))
+            .scalar_subquery()
+        )
+        db.query(Table).filter(Table.table_id == table_id).update(
+            {Table.running_total: Table.running_total + delta},
+            synchronize_session=False
+        )
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
+from app.core import etag, events
+from app.core.principal import invalidate_principal
 from app.models.waitstaff import Waitstaff
 from app.schemas.waitstaff import WaitstaffCreate, WaitstaffUpdate
 from app.core.security import get_password_hash, verify_password
@@ -27,6 +29,7 @@ def create_waitstaff(db: Session, waitstaff: WaitstaffCreate) -> Waitstaff:
     )
     db.add(db_waitstaff)
     db.commit()
+    events.run_after_commit(db, etag.bump_version, "waitstaff")
     db.refresh(db_waitstaff)
     return db_waitstaff
 
@@ -44,6 +47,8 @@ def update_waitstaff(
             db_waitstaff.password_hash = get_password_hash(waitstaff.password)
             
         db.commit()
+        events.run_after_commit(db, etag.bump_version, "waitstaff")
+        invalidate_principal(staff_id)
         db.refresh(db_waitstaff)
     return db_waitstaff
 
@@ -52,6 +57,8 @@ def delete_waitstaff(db: Session, staff_id: int) -> Optional[Waitstaff]:
     if db_waitstaff:
         db.delete(db_waitstaff)
         db.commit()
+        events.run_after_commit(db, etag.bump_version, "waitstaff")
+        invalidate_principal(staff_id)
         return db_waitstaff
     return None
 
@@ -0,0 +1,151 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+class Access:
+    """
+    Who may call a route: everyone (public), any signed-in staff member
+    (roles is None) or only the listed roles.
+    """
+    __slots__ = ("public", "roles")
+
+    def __init__(self, public: bool = False, roles: Optional[Iterable[str]] = None):
+        self.public = public
+        self.roles: Optional[FrozenSet[str]] = frozenset(roles) if roles is not None else None
+
+    def allows(self, role: Optional[str]) -> bool:
+        return self.public or self.roles is None or role in self.roles
+
+    def __repr__(self):
+        if self.public:
+            return "<Access public>"
+        return f"<Access roles={sorted(self.roles) if self.roles is not None else 'any'}>"
+
+PUBLIC = Access(public=True)
+AUTHENTICATED = Access()
+MANAGERS = Access(roles=["Manager"])
+# Waiters only work the menu and the tables board
+BACK_OFFICE = Access(roles=["Manager", "Cashier"])
+
+ANY = ("*",)
+GET = ("GET",)
+WRITE = ("POST", "PUT", "PATCH", "DELETE")
+
+# Declarative access policy: (path pattern, methods, access).
+# Patterns match whole path segments, trailing slashes are ignored,
+# "*" matches one segment and a trailing "**" matches the path and
+# everything below it. Exact patterns win over "**" ones and the deepest
+# "**" wins; a method-specific rule wins over "*" on the same pattern.
+ROUTE_POLICIES: List[Tuple[str, Tuple[str, ...], Access]] = [
+    # Staff area by default, including order writes, order items, the
+    # kitchen, the floor snapshot, the batch API and live events
+    ("/**", ANY, BACK_OFFICE),
+
+    # Public pages
+    ("/", GET, PUBLIC),
+    ("/login", ANY, PUBLIC),
+    ("/logout", ANY, PUBLIC),
+    ("/admin-login", ANY, PUBLIC),
+    ("/test", ANY, PUBLIC),
+    ("/favicon.ico", ANY, PUBLIC),
+    ("/static/**", ANY, PUBLIC),
+    ("/docs/**", ANY, PUBLIC),
+    ("/redoc/**", ANY, PUBLIC),
+    ("/api/v1/openapi.json", ANY, PUBLIC),
+    ("/order", ANY, PUBLIC),
+    ("/menu", ANY, PUBLIC),
+    ("/tables", ANY, PUBLIC),
+
+    # Authentication
+    ("/api/v1/auth/login/**", ANY, PUBLIC),
+    ("/api/v1/auth/logout", ANY, PUBLIC),
+    # Every page reads the signed-in user's role from here, waiters included
+    ("/api/v1/auth/check-auth", GET, AUTHENTICATED),
+
+    # Customer facing APIs
+    ("/api/v1/customer/orders/**", ANY, PUBLIC),
+    ("/api/v1/feedback", ("POST",), PUBLIC),
+
+    # Menu
+    ("/api/v1/menu-items/**", GET, PUBLIC),
+    ("/api/v1/menu-items/**", WRITE, MANAGERS),
+    ("/api/v1/categories/**", GET, PUBLIC),
+
+    # Reference data read by the tables and orders boards
+    ("/api/v1/dashboard/stats", GET, PUBLIC),
+    ("/api/v1/tables/**", GET, PUBLIC),
+    ("/api/v1/tables/**", ANY, AUTHENTICATED),
+    ("/api/v1/waitstaff/**", GET, AUTHENTICATED),
+    ("/api/v1/customers/**", GET, AUTHENTICATED),
+    ("/api/v1/orders/**", GET, AUTHENTICATED),
+]
+
+class _Node:
+    __slots__ = ("children", "wildcard", "exact", "subtree")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.wildcard: Optional["_Node"] = None
+        self.exact: Dict[str, Access] = {}
+        self.subtree: Dict[str, Access] = {}
+
+def _split(path: str) -> List[str]:
+    return [segment for segment in path.split("/") if segment]
+
+def _for_method(rules: Dict[str, Access], method: str) -> Optional[Access]:
+    return rules.get(method) or rules.get("*")
+
+class RoutePolicy:
+    """Access policy compiled into a trie over path segments"""
+
+    def __init__(self, policies: Iterable[Tuple[str, Tuple[str, ...], Access]], default: Access = AUTHENTICATED):
+        self.root = _Node()
+        self.default = default
+        for pattern, methods, access in policies:
+            self.add(pattern, methods, access)
+
+    def add(self, pattern: str, methods: Tuple[str, ...], access: Access) -> None:
+        segments = _split(pattern)
+        is_subtree = bool(segments) and segments[-1] == "**"
+        if is_subtree:
+            segments = segments[:-1]
+        node = self.root
+        for segment in segments:
+            if segment == "*":
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment, _Node())
+        rules = node.subtree if is_subtree else node.exact
+        for method in methods:
+            rules[method.upper()] = access
+
+    def lookup(self, method: str, path: str) -> Access:
+        """Resolve the access rule for a request in O(path length)"""
+        method = method.upper()
+        # CORS preflight requests carry no credentials
+        if method == "OPTIONS":
+            return PUBLIC
+        if method == "HEAD":
+            method = "GET"
+        access = self._match(self.root, _split(path), 0, method)
+        return access or self.default
+
+    def _match(self, node: _Node, segments: List[str], index: int, method: str) -> Optional[Access]:
+        if index == len(segments):
+            return _for_method(node.exact, method) or _for_method(node.subtree, method)
+        child = node.children.get(segments[index])
+        if child is not None:
+            access = self._match(child, segments, index + 1, method)
+            if access:
+                return access
+        if node.wildcard is not None:
+            access = self._match(node.wildcard, segments, index + 1, method)
+            if access:
+                return access
+        return _for_method(node.subtree, method)
+
+# Compiled once at import (application startup)
+route_policy = RoutePolicy(ROUTE_POLICIES)
+
+def get_access(method: str, path: str) -> Access:
+    return route_policy.lookup(method, path)
\ No newline at end of file
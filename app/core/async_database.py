@@ -0,0 +1,56 @@
+from typing import AsyncGenerator
+
+from app.core.config import settings
+from app.core.database import get_engine_options
+
+# Sync driver -> async driver used when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+def get_async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, _, rest = settings.DATABASE_URL.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+def get_async_engine():
+    """
+    Create the AsyncEngine on first use, so the async drivers (aiomysql,
+    asyncmy or aiosqlite) are only needed when the async layer is used.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+        database_url = get_async_database_url()
+        _async_engine = create_async_engine(database_url, **get_engine_options(database_url))
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_engine
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_session_factory()
+
+# Dependency to get an async database session
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
\ No newline at end of file
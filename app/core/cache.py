@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ttl seconds.
+    Keeps hit, miss, eviction and invalidation counters for monitoring.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+# Outcomes reported by SingleFlightCache.get
+HIT = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+
+class SingleFlightCache:
+    """
+    Async cache for a few expensive values, with stale-while-revalidate.
+    Entries younger than ttl are served as is. Until stale_ttl they are
+    still served, while one background task recomputes them. Older or
+    missing entries are computed with concurrent callers sharing one
+    in-flight computation, so N simultaneous misses cost one compute.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._inflight: Dict[Hashable, "asyncio.Task"] = {}
+        # Bumped by invalidate, so computations started before it are not stored
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.computes = 0
+        self.total_compute_ms = 0.0
+        self.last_compute_ms = 0.0
+
+    async def get(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, float, str]:
+        """Return (value, age in seconds, HIT/STALE/MISS)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, computed_at = entry
+            age = time.monotonic() - computed_at
+            if age < self.ttl:
+                self.hits += 1
+                return value, age, HIT
+            if age < self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start(key, compute)
+                return value, age, STALE
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, compute)
+        else:
+            self.coalesced += 1
+        # Shield so a cancelled caller does not cancel the shared computation
+        value = await asyncio.shield(task)
+        # The entry may have been invalidated while the caller waited
+        entry = self._entries.get(key)
+        return value, time.monotonic() - entry[1] if entry is not None else 0.0, MISS
+
+    def _start(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+        task = asyncio.ensure_future(self._compute(key, compute, self._generation))
+        self._inflight[key] = task
+        # Background refreshes nobody awaits must not log "exception never retrieved"
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        started = time.perf_counter()
+        task = asyncio.current_task()
+        try:
+            value = await compute()
+        except Exception as e:
+            self.errors += 1
+            print(f"Cache refresh failed for {key}: {str(e)}")
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        self.last_compute_ms = (time.perf_counter() - started) * 1000
+        self.total_compute_ms += self.last_compute_ms
+        self.computes += 1
+        if generation == self._generation:
+            self._entries[key] = (value, time.monotonic())
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry; a computation already in flight is not shared or stored"""
+        self._generation += 1
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        now = time.monotonic()
+        return {
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "computes": self.computes,
+            "last_compute_ms": round(self.last_compute_ms, 3),
+            "avg_compute_ms": round(self.total_compute_ms / self.computes, 3) if self.computes else 0.0,
+            "ages": {str(key): round(now - computed_at, 3) for key, (_, computed_at) in self._entries.items()},
+            "inflight": len(self._inflight),
+        }
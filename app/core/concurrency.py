@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import logging
+import traceback
+from typing import Any, Callable, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_db_limiter = None
+
+def get_db_limiter() -> CapacityLimiter:
+    # Created lazily because the limiter has to be created inside the event loop
+    global _db_limiter
+    if _db_limiter is None:
+        _db_limiter = CapacityLimiter(settings.DB_EXECUTOR_THREADS)
+    return _db_limiter
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking database work from an async handler in a worker thread.
+    The number of threads is bounded by DB_EXECUTOR_THREADS, which defaults
+    to the size of the connection pool, so threads never queue on the pool.
+    """
+    return await to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=get_db_limiter()
+    )
+
+def is_event_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def install_event_loop_guard(engine, mode: str = settings.DB_LOOP_GUARD) -> None:
+    """
+    Development guard that logs or raises when a sync engine executes a
+    statement on the event loop thread. mode is "off", "log" or "raise".
+    """
+    if mode not in ("log", "raise"):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def check_event_loop(conn, cursor, statement, parameters, context, executemany):
+        if not is_event_loop_thread():
+            return
+        message = f"Blocking database call on the event loop thread: {statement[:200]}"
+        if mode == "raise":
+            raise RuntimeError(message)
+        logger.warning("%s\n%s", message, "".join(traceback.format_stack(limit=12)))
\ No newline at end of file
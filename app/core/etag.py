@@ -0,0 +1,72 @@
+import hashlib
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Versions live in this process only, so the ETag carries a per-process
+# epoch to keep one worker's version numbers from matching another's.
+# With several workers, a write bumps only the version of the worker that
+# handled it: the others keep answering 304 until their version ages out
+# after ETAG_MAX_AGE_SECONDS, so revalidation across workers is time-based.
+_epoch = secrets.token_hex(4)
+_versions: Dict[str, int] = {}
+_bumped_at: Dict[str, float] = {}
+_lock = threading.Lock()
+
+def bump_version(entity: str) -> int:
+    """Mark every cached representation of an entity type as changed"""
+    with _lock:
+        _versions[entity] = _versions.get(entity, 0) + 1
+        _bumped_at[entity] = time.monotonic()
+        return _versions[entity]
+
+def get_version(entity: str) -> int:
+    """
+    Current version of an entity type. Writes made by other worker
+    processes are not seen here, so versions also advance once they are
+    older than ETAG_MAX_AGE_SECONDS.
+    """
+    bumped_at = _bumped_at.get(entity)
+    if bumped_at is None or time.monotonic() - bumped_at > settings.ETAG_MAX_AGE_SECONDS:
+        return bump_version(entity)
+    return _versions[entity]
+
+def make_etag(entity: str, *params: Any, version: Optional[int] = None) -> str:
+    """Build a strong ETag from the entity version and the request parameters"""
+    if version is None:
+        version = get_version(entity)
+    params_hash = hashlib.md5(repr(params).encode()).hexdigest()[:8]
+    return f'"{_epoch}-{entity}-{version}-{params_hash}"'
+
+def make_content_etag(content: bytes) -> str:
+    """
+    Strong ETag from the response body itself. It needs no version, so
+    every worker process agrees on it, but the body has to be built first.
+    """
+    return f'"{hashlib.md5(content).hexdigest()}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check the If-None-Match header against the current ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function, so W/ is ignored
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let clients keep the body but always revalidate it
+    response.headers["Cache-Control"] = "no-cache"
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag_headers(response, etag)
+    return response
\ No newline at end of file
@@ -0,0 +1,214 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Topics clients can subscribe to
+TOPIC_ORDERS = "orders"
+TOPIC_ORDER_ITEMS = "order_items"
+TOPIC_TABLES = "tables"
+TOPIC_PAYMENTS = "payments"
+TOPICS = (TOPIC_ORDERS, TOPIC_ORDER_ITEMS, TOPIC_TABLES, TOPIC_PAYMENTS)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class Event:
+    """A small delta, serialized once and shared by every subscriber"""
+    __slots__ = ("id", "topic", "type", "table_id", "data", "payload", "sse")
+
+    def __init__(self, id: int, topic: str, type: str, data: Dict[str, Any], table_id: Optional[int] = None):
+        self.id = id
+        self.topic = topic
+        self.type = type
+        self.table_id = table_id
+        self.data = data
+        self.payload = json.dumps(
+            {"id": id, "topic": topic, "type": type, "data": data},
+            default=_json_default
+        )
+        self.sse = f"id: {id}\nevent: {type}\ndata: {self.payload}\n\n"
+
+class Subscription:
+    """One connected client: a bounded queue plus its topic/table filter"""
+
+    def __init__(self, topics: Iterable[str], table_id: Optional[int] = None, maxsize: int = 100):
+        self.topics = frozenset(topics)
+        self.table_id = table_id
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, event: Event) -> bool:
+        return self.table_id is None or event.table_id == self.table_id
+
+    def offer(self, event: Event, resync: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and tell it to reload instead
+            # of buffering without bound
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync)
+
+class EventBroker:
+    """
+    In-process publish/subscribe broker. Controllers publish from worker
+    threads; delivery happens on the event loop, which owns the subscriber
+    queues. Events are only seen by clients connected to this process.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._by_topic: Dict[str, Set[Subscription]] = {topic: set() for topic in TOPICS}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.last_fanout_ms = 0.0
+
+    def subscribe(self, topics: Iterable[str], table_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber (must be called on the event loop)"""
+        self._loop = asyncio.get_running_loop()
+        topics = [topic for topic in topics if topic in self._by_topic] or list(TOPICS)
+        subscription = Subscription(topics, table_id=table_id, maxsize=self.queue_size)
+        for topic in subscription.topics:
+            self._by_topic[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            self._by_topic[topic].discard(subscription)
+
+    def subscriber_count(self) -> int:
+        return len(set().union(*self._by_topic.values()))
+
+    def publish(self, topic: str, type: str, data: Dict[str, Any], table_id: Optional[int] = None) -> None:
+        """Publish an event; safe to call from any thread"""
+        if not self._by_topic.get(topic) or self._loop is None:
+            return
+        with self._lock:
+            event = Event(next(self._ids), topic, type, data, table_id=table_id)
+            self.published += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event: Event) -> None:
+        started = time.perf_counter()
+        resync = None
+        for subscription in list(self._by_topic[event.topic]):
+            if not subscription.matches(event):
+                continue
+            if subscription.queue.full() and resync is None:
+                resync = Event(event.id, event.topic, "resync", {})
+            subscription.offer(event, resync)
+            self.delivered += 1
+        self.last_fanout_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count(),
+            "by_topic": {topic: len(subs) for topic, subs in self._by_topic.items()},
+            "published": self.published,
+            "delivered": self.delivered,
+            "last_fanout_ms": round(self.last_fanout_ms, 3),
+        }
+
+broker = EventBroker(queue_size=settings.EVENT_QUEUE_SIZE)
+
+# Events are queued on the session and published only once the transaction
+# commits, so clients never see changes that were rolled back.
+_PENDING_KEY = "pending_events"
+
+def publish_after_commit(
+    db: Session, topic: str, type: str, data: Dict[str, Any], table_id: Optional[int] = None
+) -> None:
+    """Queue an event on the session; call before db.commit()"""
+    db.info.setdefault(_PENDING_KEY, []).append((topic, type, data, table_id))
+
+def pending_mark(db: Session) -> int:
+    """Position in the session's queued events, for discard_pending_since"""
+    return len(db.info.get(_PENDING_KEY, ()))
+
+def discard_pending_since(db: Session, mark: int) -> None:
+    """Drop events queued after mark, e.g. when a savepoint rolls back"""
+    pending = db.info.get(_PENDING_KEY)
+    if pending:
+        del pending[mark:]
+
+# In-process consumers (e.g. the kitchen board) called with (type, data)
+# in the committing thread after each commit
+_listeners: Dict[str, List[Callable[[str, Dict[str, Any]], None]]] = {topic: [] for topic in TOPICS}
+
+def add_listener(topic: str, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+    _listeners[topic].append(callback)
+
+# Sessions whose commits are not final (e.g. savepoints inside the batch
+# API's outer transaction) hold their events until publish_pending()
+_DEFER_KEY = "defer_events"
+
+def defer_events(db: Session) -> None:
+    db.info[_DEFER_KEY] = True
+
+# Other post-commit side effects (cache versions, the menu catalog) wait
+# for the outer transaction the same way
+_CALLBACKS_KEY = "after_commit_callbacks"
+
+def run_after_commit(db: Session, func: Callable[..., Any], *args: Any) -> None:
+    """Call func(*args) now, or at publish_pending() if the session defers its events; call after db.commit()"""
+    if db.info.get(_DEFER_KEY):
+        db.info.setdefault(_CALLBACKS_KEY, []).append((func, args))
+    else:
+        func(*args)
+
+def publish_pending(db: Session) -> None:
+    """Publish held events once the outer transaction has committed"""
+    db.info.pop(_DEFER_KEY, None)
+    for func, args in db.info.pop(_CALLBACKS_KEY, None) or []:
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"After-commit callback error: {str(e)}")
+    _deliver(db)
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    if session.info.get(_DEFER_KEY):
+        return
+    _deliver(session)
+
+def _deliver(session: Session) -> None:
+    pending: List[tuple] = session.info.pop(_PENDING_KEY, None) or []
+    for topic, type, data, table_id in pending:
+        for callback in _listeners[topic]:
+            try:
+                callback(type, data)
+            except Exception as e:
+                print(f"Event listener error for {type}: {str(e)}")
+        broker.publish(topic, type, data, table_id=table_id)
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_CALLBACKS_KEY, None)
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.idempotency import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: bytes
+
+def make_key(scope: str, key: str, principal_id: Optional[Any] = None) -> str:
+    """Keys are scoped by endpoint and caller so clients cannot collide"""
+    return f"{scope}:{principal_id if principal_id is not None else 'public'}:{key}"[:255]
+
+def fingerprint(payload: Any) -> str:
+    """Hash of the request body, to reject a key reused for another request"""
+    if hasattr(payload, "model_dump_json"):
+        data = payload.model_dump_json()
+    else:
+        data = json.dumps(jsonable_encoder(payload), sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def replay(stored: StoredResponse) -> Response:
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"}
+    )
+
+class IdempotencyStore:
+    """
+    Completed responses in a bounded in-process LRU with a TTL, plus the
+    keys currently executing. A duplicate of an in-flight request waits
+    for the first one to finish and then replays its response. With
+    IDEMPOTENCY_DB_BACKEND the keys are also claimed in the
+    idempotency_key table, which covers duplicates sent to other workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, wait_seconds: int, use_db: bool = False):
+        self.responses = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.use_db = use_db
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _check(self, stored: StoredResponse, request_fingerprint: str) -> StoredResponse:
+        if stored.fingerprint != request_fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+            )
+        return stored
+
+    def _still_running(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A request with this {IDEMPOTENCY_HEADER} is still being processed"
+        )
+
+    def begin(self, key: str, request_fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Return the stored response for a completed key, waiting for an
+        in-flight duplicate first. Returns None when the caller now owns
+        the key and must call complete() or abandon(). Blocking.
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            with self._lock:
+                stored = self.responses.get(key)
+                if stored is not None:
+                    return self._check(stored, request_fingerprint)
+                running = self._in_flight.get(key)
+                if running is None:
+                    self._in_flight[key] = threading.Event()
+                    break
+            if not running.wait(timeout=max(deadline - time.monotonic(), 0)):
+                raise self._still_running()
+
+        if not self.use_db:
+            return None
+        try:
+            stored = self._claim_in_db(key, request_fingerprint, deadline)
+        except BaseException:
+            self._release(key)
+            raise
+        if stored is not None:
+            self._release(key)
+            self.responses.set(key, stored)
+            return self._check(stored, request_fingerprint)
+        return None
+
+    def complete(self, key: str, request_fingerprint: str, status_code: int, body: bytes) -> None:
+        stored = StoredResponse(request_fingerprint, status_code, body)
+        if self.use_db:
+            db = SessionLocal()
+            try:
+                db.query(IdempotencyRecord).filter(IdempotencyRecord.key == key).update({
+                    IdempotencyRecord.status_code: status_code,
+                    IdempotencyRecord.response_body: body.decode(),
+                }, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+        self.responses.set(key, stored)
+        self._release(key)
+
+    def abandon(self, key: str) -> None:
+        """The request failed; let a retry with the same key run again"""
+        if self.use_db:
+            db = SessionLocal()
+            try:
+                db.query(IdempotencyRecord).filter(
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.status_code.is_(None)
+                ).delete(synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+        self._release(key)
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            running = self._in_flight.pop(key, None)
+        if running is not None:
+            running.set()
+
+    def _claim_in_db(self, key: str, request_fingerprint: str, deadline: float) -> Optional[StoredResponse]:
+        """Insert the key as in flight, or return the response another worker stored"""
+        db = SessionLocal()
+        try:
+            while True:
+                try:
+                    db.add(IdempotencyRecord(key=key, fingerprint=request_fingerprint))
+                    db.commit()
+                    return None
+                except IntegrityError:
+                    db.rollback()
+
+                record = db.query(IdempotencyRecord).filter(IdempotencyRecord.key == key).first()
+                if record is None:
+                    continue
+                age = datetime.now() - record.created_at
+                if age > timedelta(seconds=self.ttl) or (
+                    record.status_code is None and age > timedelta(seconds=self.wait_seconds)
+                ):
+                    # Expired, or left in flight by a worker that died
+                    db.delete(record)
+                    db.commit()
+                    continue
+                if record.status_code is not None:
+                    return StoredResponse(record.fingerprint, record.status_code, record.response_body.encode())
+                if time.monotonic() >= deadline:
+                    raise self._still_running()
+                db.expire_all()
+                time.sleep(0.1)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.responses.stats()
+        stats["in_flight"] = len(self._in_flight)
+        return stats
+
+store = IdempotencyStore(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    use_db=settings.IDEMPOTENCY_DB_BACKEND,
+)
+
+def serialize(result: Any, response_model: Optional[Any] = None) -> bytes:
+    if response_model is not None:
+        return response_model.model_validate(result).model_dump_json().encode()
+    return json.dumps(jsonable_encoder(result)).encode()
+
+def run_idempotent(
+    scope: str, idempotency_key: Optional[str], principal_id: Optional[Any], payload: Any,
+    func: Callable[[], Any], response_model: Optional[Any] = None,
+    status_code: int = status.HTTP_200_OK
+) -> Any:
+    """
+    Run func once per Idempotency-Key (blocking). Without a key func runs
+    as usual; with one, retries get the first response replayed.
+    """
+    if not idempotency_key:
+        return func()
+    key = make_key(scope, idempotency_key, principal_id)
+    request_fingerprint = fingerprint(payload)
+    stored = store.begin(key, request_fingerprint)
+    if stored is not None:
+        return replay(stored)
+    try:
+        body = serialize(func(), response_model)
+    except BaseException:
+        store.abandon(key)
+        raise
+    store.complete(key, request_fingerprint, status_code, body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+async def run_idempotent_async(
+    scope: str, idempotency_key: Optional[str], principal_id: Optional[Any], payload: Any,
+    func: Callable[[], Awaitable[Any]], response_model: Optional[Any] = None,
+    status_code: int = status.HTTP_200_OK
+) -> Any:
+    """run_idempotent for async handlers; waiting and bookkeeping run off the event loop"""
+    if not idempotency_key:
+        return await func()
+    key = make_key(scope, idempotency_key, principal_id)
+    request_fingerprint = fingerprint(payload)
+    stored = await run_in_threadpool(store.begin, key, request_fingerprint)
+    if stored is not None:
+        return replay(stored)
+    try:
+        body = serialize(await func(), response_model)
+    except BaseException:
+        await run_in_threadpool(store.abandon, key)
+        raise
+    await run_in_threadpool(store.complete, key, request_fingerprint, status_code, body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
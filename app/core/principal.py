@@ -0,0 +1,123 @@
+from typing import Any, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.concurrency import run_in_db_executor
+from app.core.database import SessionLocal
+from app.models.waitstaff import Waitstaff
+from app.schemas.waitstaff import Waitstaff as WaitstaffSchema
+
+# Authenticated staff keyed by staff_id. Entries are dropped when the staff
+# member is updated or deleted in this process; the TTL bounds staleness for
+# changes made by other worker processes.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+def _cache_key(staff_id: Any) -> Optional[int]:
+    try:
+        return int(staff_id)
+    except (TypeError, ValueError):
+        return None
+
+def get_cached_principal(staff_id: Any) -> Optional[WaitstaffSchema]:
+    """Return the cached principal without touching the database"""
+    key = _cache_key(staff_id)
+    if key is None:
+        return None
+    return principal_cache.get(key)
+
+def load_principal(staff_id: Any) -> Optional[WaitstaffSchema]:
+    """Return the principal for a staff_id, loading it from the database on a miss (blocking)"""
+    key = _cache_key(staff_id)
+    if key is None:
+        return None
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+
+    db = SessionLocal()
+    try:
+        user = db.query(Waitstaff).filter(Waitstaff.staff_id == key).first()
+        if user is None:
+            return None
+        principal = WaitstaffSchema.model_validate(user)
+    finally:
+        db.close()
+
+    principal_cache.set(key, principal)
+    return principal
+
+def invalidate_principal(staff_id: Any) -> None:
+    key = _cache_key(staff_id)
+    if key is not None:
+        principal_cache.delete(key)
+
+# Why a request has no principal, stored on request.state.auth_error
+AUTH_MISSING = "missing"
+AUTH_INVALID = "invalid"
+AUTH_UNKNOWN_USER = "unknown_user"
+
+def get_request_token(request: Request) -> Optional[str]:
+    """Bearer token from the Authorization header, falling back to the cookie"""
+    auth_header = request.headers.get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header[7:]
+    return request.cookies.get("access_token")
+
+def _decode_request_subject(request: Request) -> None:
+    """Decode the JWT once and store user_id / auth_error on request.state"""
+    request.state.user_id = None
+    request.state.auth_error = None
+    token = get_request_token(request)
+    if not token:
+        request.state.auth_error = AUTH_MISSING
+        return
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        print(f"JWT error: {str(e)}")
+        request.state.auth_error = AUTH_INVALID
+        return
+    user_id = payload.get("sub")
+    if user_id is None:
+        request.state.auth_error = AUTH_INVALID
+        return
+    request.state.user_id = user_id
+
+def _store_principal(request: Request, principal: Optional[WaitstaffSchema]) -> Optional[WaitstaffSchema]:
+    if principal is None and request.state.auth_error is None:
+        request.state.auth_error = AUTH_UNKNOWN_USER
+    request.state.principal = principal
+    request.state.principal_resolved = True
+    return principal
+
+def resolve_principal(request: Request) -> Optional[WaitstaffSchema]:
+    """
+    Resolve the authenticated principal for this request, reusing the one
+    stored on request.state by the auth middleware. Blocking on a cache miss.
+    """
+    if getattr(request.state, "principal_resolved", False):
+        return request.state.principal
+    if not hasattr(request.state, "auth_error"):
+        _decode_request_subject(request)
+    if request.state.user_id is None:
+        return _store_principal(request, None)
+    return _store_principal(request, load_principal(request.state.user_id))
+
+async def resolve_principal_async(request: Request) -> Optional[WaitstaffSchema]:
+    """Same as resolve_principal, with cache misses loaded in the DB executor"""
+    if getattr(request.state, "principal_resolved", False):
+        return request.state.principal
+    if not hasattr(request.state, "auth_error"):
+        _decode_request_subject(request)
+    if request.state.user_id is None:
+        return _store_principal(request, None)
+    principal = get_cached_principal(request.state.user_id)
+    if principal is None:
+        principal = await run_in_db_executor(load_principal, request.state.user_id)
+    return _store_principal(request, principal)
\ No newline at end of file
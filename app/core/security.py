@@ -4,13 +4,13 @@ from typing import Any, Union, Optional
 from jose import jwt
 import bcrypt
 import hashlib
-from fastapi import Depends, HTTPException, status, Request, Cookie
+from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models.waitstaff import Waitstaff
-from app.core.database import get_db
+from app.core.access_policy import get_access
+from app.core.principal import resolve_principal, AUTH_MISSING, AUTH_UNKNOWN_USER
+from app.schemas.waitstaff import Waitstaff as WaitstaffSchema
 
 # OAuth2 password bearer for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
@@ -52,80 +52,39 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-# Danh sách các đường dẫn không cần xác thực
-PUBLIC_PATHS = [
-    "/api/v1/auth/login",
-    "/api/v1/auth/login/json",
-    "/api/v1/menu-items",
-    "/menu",
-    "/static/",
-    "/login",
-    "/favicon.ico",
-]
-
-def is_public_path(path: str) -> bool:
-    """Kiểm tra xem đường dẫn có thuộc diện public không"""
-    for public_path in PUBLIC_PATHS:
-        if path.startswith(public_path):
-            return True
-    # Thêm kiểm tra riêng cho tables
-    if path.startswith('/api/v1/tables'):
-        return True
-    return False
+def is_public_path(path: str, method: str = "GET") -> bool:
+    """Kiểm tra xem đường dẫn có thuộc diện public không (theo access policy)"""
+    return get_access(method, path).public
 
 def get_current_user(
-    request: Request = None,
-    db: Session = Depends(get_db), 
-    token: Optional[str] = Cookie(None, alias="access_token"),
+    request: Request,
     header_token: Optional[str] = Depends(oauth2_scheme)
-) -> Optional[Waitstaff]:
-    """Get current user from JWT token (either from cookie or header)"""
-    # Cho phép truy cập vào các đường dẫn công khai mà không cần xác thực
-    if request and is_public_path(request.url.path):
-        # Nếu là GET hoặc path /tables, cho phép truy cập
-        if request.method == "GET" or request.url.path.startswith('/tables'):
-            return None
+) -> Optional[WaitstaffSchema]:
+    """
+    Get current user from the principal resolved for this request.
+    The auth middleware decodes the JWT and loads the user once; this
+    dependency reuses that result instead of decoding or querying again.
+    header_token is only declared so the OpenAPI docs show the bearer scheme.
+    """
+    user = resolve_principal(request)
+    if user is not None:
+        return user
     
-    # Ưu tiên sử dụng token từ header nếu có
-    actual_token = header_token if header_token else token
+    # Cho phép truy cập vào các đường dẫn công khai mà không cần xác thực
+    if is_public_path(request.url.path, request.method):
+        return None
     
-    # Nếu không có token, trả về lỗi
-    if not actual_token:
+    auth_error = request.state.auth_error
+    if auth_error == AUTH_MISSING:
         print("No token found in request")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    try:
-        # Giải mã JWT token
-        payload = jwt.decode(actual_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None: 
-            print("No user_id in token payload")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    except jwt.JWTError as e:
-        print(f"JWT error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-        
-    # Lấy thông tin người dùng từ database
-    user = db.query(Waitstaff).filter(Waitstaff.staff_id == user_id).first()
-    if user is None:
-        print(f"User with ID {user_id} not found in database")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    print(f"User authenticated: {user.username} (role: {user.role})")
-    return user
\ No newline at end of file
+        detail = "Not authenticated"
+    elif auth_error == AUTH_UNKNOWN_USER:
+        print(f"User with ID {request.state.user_id} not found in database")
+        detail = "User not found"
+    else:
+        detail = "Could not validate credentials"
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
\ No newline at end of file
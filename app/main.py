@@ -1,8 +1,9 @@
-from fastapi import FastAPI, Request, Response, Depends, HTTPException, status
+from fastapi import FastAPI, Request, Response, Depends, HTTPException, status, Header
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
@@ -10,26 +11,33 @@ from app.core.config import settings
 from app.routers import api_router
 from app.routers import __init__
 from app.middleware.auth import auth_middleware
-from app.core.database import get_db
+from app.core.database import get_db, engine
+from app.core.async_database import dispose_async_engine
+from app.core.concurrency import run_in_db_executor, install_event_loop_guard
+from app.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent_async
 from app.controllers import waitstaff as waitstaff_controller
-from app.controllers import menu_item as menu_item_controller
 from app.controllers import table as table_controller
-from app.controllers import category as category_controller
 from app.controllers import order as order_controller
-from app.controllers import customer as customer_controller
+from app.controllers import menu_catalog
+from app.controllers import order_ingest
+from app.controllers import rollup as rollup_controller
 from app.schemas.customer import CustomerCreate
 from app.schemas.order import OrderCreate
 from app.schemas.order import OrderItemCreate
 from app.core.security import create_access_token
-from app.models.waitstaff import Waitstaff
 
 import os
+import queue
+from typing import Optional
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Log or raise on sync database calls made on the event loop (DB_LOOP_GUARD)
+install_event_loop_guard(engine)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -53,6 +61,14 @@ async def add_auth_middleware(request: Request, call_next):
             content={"detail": f"Internal server error: {str(e)}"}
         )
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Write out customer orders still waiting in the ingest queue
+    await run_in_threadpool(order_ingest.ingest.stop)
+    # Recompute the rollup hours touched since the last refresh
+    await run_in_threadpool(rollup_controller.refresher.stop)
+    await dispose_async_engine()
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -101,7 +117,9 @@ async def login_process(request: Request, db: Session = Depends(get_db)):
         print(f"Login attempt for user: {username}")
         
         # Xác thực người dùng
-        user = waitstaff_controller.authenticate_waitstaff(db, username, password)
+        user = await run_in_db_executor(
+            waitstaff_controller.authenticate_waitstaff, db, username, password
+        )
         if not user:
             print("Authentication failed")
             return templates.TemplateResponse("login.html", {
@@ -147,7 +165,9 @@ async def admin_login(response: Response, db: Session = Depends(get_db)):
     """Temporary admin login bypass"""
     try:
         # Lấy admin user từ database - sửa lại tên class
-        admin = db.query(Waitstaff).filter(Waitstaff.username == "admin").first()
+        admin = await run_in_db_executor(
+            waitstaff_controller.get_waitstaff_by_username, db, "admin"
+        )
         if not admin:
             print("Admin user not found")
             return {"error": "Admin user not found in database"}
@@ -177,7 +197,7 @@ async def admin_login(response: Response, db: Session = Depends(get_db)):
         )
 
 @app.get("/dashboard")
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request):
     try:
         # Lấy thông tin user từ token
         user_id = request.state.user_id if hasattr(request.state, "user_id") else None
@@ -214,9 +234,10 @@ async def menu(request: Request, db: Session = Depends(get_db)):
         user_id = request.state.user_id if hasattr(request.state, "user_id") else None
         print(f"Menu accessed by user_id: {user_id}")
         
-        # Lấy dữ liệu categories và menu items
-        categories = category_controller.get_categories(db)
-        menu_items = menu_item_controller.get_menu_items(db)
+        # Lấy dữ liệu categories và menu items từ menu catalog
+        catalog = await run_in_db_executor(menu_catalog.get_catalog, db)
+        categories = catalog.filter_categories()
+        menu_items = catalog.filter_items()
         
         print(f"Categories loaded: {len(categories)}")
         print(f"Menu items loaded: {len(menu_items)}")
@@ -274,10 +295,11 @@ async def customer_order_page(request: Request, db: Session = Depends(get_db)):
     Trang công khai cho khách hàng đặt món không cần đăng nhập
     """
     try:
-        # Lấy dữ liệu categories và menu items
-        categories = category_controller.get_categories(db)
-        menu_items = menu_item_controller.get_available_menu_items(db)
-        tables = table_controller.get_tables(db)
+        # Lấy dữ liệu categories và menu items từ menu catalog
+        catalog = await run_in_db_executor(menu_catalog.get_catalog, db)
+        categories = catalog.filter_categories()
+        menu_items = catalog.filter_items(available_only=True)
+        tables = await run_in_db_executor(table_controller.get_tables, db)
         
         print("Rendering customer order page")
         print(f"Categories loaded: {len(categories)}")
@@ -307,10 +329,12 @@ async def customer_order_page(request: Request, db: Session = Depends(get_db)):
 @app.post("/api/v1/customer/orders")
 async def create_customer_order(
     order_data: dict,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
     """
-    API để xử lý đơn hàng từ trang đặt món của khách hàng
+    API để xử lý đơn hàng từ trang đặt món của khách hàng.
+    Gửi lại cùng Idempotency-Key sẽ nhận lại kết quả lần đầu, không tạo đơn trùng
     """
     try:
         print("Processing customer order")
@@ -322,9 +346,6 @@ async def create_customer_order(
             contact_number=order_data.get("customer", {}).get("contact_number", "")
         )
         
-        # Tìm hoặc tạo mới khách hàng
-        customer = customer_controller.get_or_create_customer(db, customer=customer_data)
-        
         # Xây dựng order items
         order_items = []
         for item in order_data.get("order_items", []):
@@ -338,23 +359,47 @@ async def create_customer_order(
         
         # Tạo order mới
         order_create = OrderCreate(
-            customer_id=customer.customer_id,
             table_id=order_data.get("table_id"),
             status="pending",
             order_items=order_items
         )
         
-        # Tạo đơn hàng mới
-        new_order = order_controller.create_order(db, order=order_create)
-        
-        print(f"Order created successfully with ID: {new_order.order_id}")
+        async def create():
+            if order_ingest.is_enabled():
+                # Chế độ ingest: đưa đơn vào hàng đợi, ghi theo lô (group commit).
+                # Khách nhận token ngay và hỏi lại trạng thái qua /api/v1/customer/orders/{token}
+                try:
+                    ticket = order_ingest.ingest.submit(customer_data, order_create)
+                except queue.Full:
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Hệ thống đang quá tải, vui lòng thử lại"
+                    )
+                return {
+                    "status": "queued",
+                    "message": "Đơn hàng đã được tiếp nhận",
+                    "token": ticket.token
+                }
+            
+            # Tìm hoặc tạo mới khách hàng và tạo đơn hàng mới
+            new_order = await run_in_db_executor(
+                order_controller.create_customer_order, db, customer_data, order_create
+            )
+            
+            print(f"Order created successfully with ID: {new_order.order_id}")
+            
+            return {
+                "status": "success",
+                "message": "Đơn hàng đã được tạo thành công",
+                "order_id": new_order.order_id
+            }
         
-        return {
-            "status": "success",
-            "message": "Đơn hàng đã được tạo thành công",
-            "order_id": new_order.order_id
-        }
+        return await run_idempotent_async(
+            "customer-orders", idempotency_key, None, order_data, create
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error creating customer order: {str(e)}")
         return JSONResponse(
@@ -362,9 +407,25 @@ async def create_customer_order(
             content={"detail": f"Lỗi khi tạo đơn hàng: {str(e)}"}
         )
 
+@app.get("/api/v1/customer/orders/{token}")
+async def get_customer_order_status(token: str, wait: float = 0):
+    """
+    Trạng thái của đơn hàng đã đưa vào hàng đợi ingest (queued / confirmed / failed).
+    wait: số giây tối đa chờ đơn được ghi trước khi trả kết quả (long polling)
+    """
+    ticket = order_ingest.ingest.get_ticket(token)
+    if ticket is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order token not found"
+        )
+    if wait > 0 and not ticket.done.is_set():
+        await run_in_threadpool(ticket.done.wait, min(wait, 30))
+    return ticket.to_dict()
+
 #Thêm route cho staff pagepage
 @app.get("/staff")
-async def staff(request: Request, db: Session = Depends(get_db)):
+async def staff(request: Request):
     try:
         # Lấy thông tin user từ token
         user_id = request.state.user_id if hasattr(request.state, "user_id") else None
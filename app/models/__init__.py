@@ -7,4 +7,7 @@ from app.models.table import Table
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.payment import Payment
-from app.models.feedback import Feedback
\ No newline at end of file
+from app.models.feedback import Feedback
+from app.models.idempotency import IdempotencyRecord
+from app.models.archive import OrderArchive, OrderItemArchive, PaymentArchive, FeedbackArchive, ArchiveWatermark
+from app.models.rollup import SalesHourly, ItemSalesHourly, WaiterSalesHourly, FeedbackDaily, FeedbackTotal
\ No newline at end of file
@@ -0,0 +1,83 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, DECIMAL
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+# Cold copies of completed and cancelled orders moved out of the hot tables
+# by app/controllers/archive.py. There are no foreign keys and the date
+# column is part of the primary key, so on MySQL the tables can be
+# RANGE partitioned by date (see archive_orders.py --partition).
+
+class OrderArchive(Base):
+    __tablename__ = "order_archive"
+    
+    order_id = Column(Integer, primary_key=True, autoincrement=False)
+    order_date = Column(DateTime, primary_key=True)
+    customer_id = Column(Integer, nullable=True)
+    table_id = Column(Integer, nullable=True)
+    waiter_id = Column(Integer, nullable=True, index=True)
+    status = Column(String(20), nullable=False)
+    total_amount = Column(DECIMAL(10, 2), default=0.00)
+    paid_amount = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    archived_at = Column(DateTime, default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<OrderArchive(id={self.order_id}, status={self.status}, total={self.total_amount})>"
+
+class OrderItemArchive(Base):
+    __tablename__ = "order_item_archive"
+    
+    order_item_id = Column(Integer, primary_key=True, autoincrement=False)
+    # Copied from the order so items can be partitioned and filtered by date
+    order_date = Column(DateTime, primary_key=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    menu_item_id = Column(Integer, nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    line_total = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    special_request = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False)
+    
+    def __repr__(self):
+        return f"<OrderItemArchive(id={self.order_item_id}, order_id={self.order_id}, item_id={self.menu_item_id})>"
+
+class PaymentArchive(Base):
+    __tablename__ = "payment_archive"
+    
+    payment_id = Column(Integer, primary_key=True, autoincrement=False)
+    payment_date = Column(DateTime, primary_key=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    amount = Column(DECIMAL(10, 2), nullable=False)
+    payment_method = Column(String(20), nullable=False)
+    
+    def __repr__(self):
+        return f"<PaymentArchive(id={self.payment_id}, order_id={self.order_id}, amount={self.amount})>"
+
+class FeedbackArchive(Base):
+    __tablename__ = "feedback_archive"
+    
+    feedback_id = Column(Integer, primary_key=True, autoincrement=False)
+    feedback_date = Column(DateTime, primary_key=True)
+    customer_id = Column(Integer, nullable=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    rating = Column(Integer, nullable=False)
+    comment = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<FeedbackArchive(id={self.feedback_id}, order_id={self.order_id}, rating={self.rating})>"
+
+
+# Newest archived order_date and payment_date, raised by the archiver in
+# the same transaction as each batch. A single row (watermark_id = 1)
+# shared by every process, so reports can skip the archive when their
+# range is newer.
+class ArchiveWatermark(Base):
+    __tablename__ = "archive_watermark"
+    
+    watermark_id = Column(Integer, primary_key=True, autoincrement=False)
+    order_date = Column(DateTime, nullable=True)
+    payment_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ArchiveWatermark(order_date={self.order_date}, payment_date={self.payment_date})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_key"
+    
+    # Scope, principal and the client's Idempotency-Key
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    # NULL while the first request is still executing
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyRecord(key={self.key}, status_code={self.status_code})>"
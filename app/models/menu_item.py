@@ -11,6 +11,8 @@ class MenuItem(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     price = Column(DECIMAL(10, 2), nullable=False)
+    # Ingredient cost per portion, for contribution margins (NULL = unknown)
+    cost = Column(DECIMAL(10, 2), nullable=True)
     is_available = Column(Boolean, default=True)
     image_url = Column(String(255))
     
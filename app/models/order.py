@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, DECIMAL
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, DECIMAL, Computed
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,9 +11,13 @@ class Order(Base):
     customer_id = Column(Integer, ForeignKey("customer.customer_id"), nullable=True)
     table_id = Column(Integer, ForeignKey("table.table_id"), nullable=True)
     waiter_id = Column(Integer, ForeignKey("waitstaff.staff_id"), nullable=True)
-    order_date = Column(DateTime, default=func.now(), nullable=False)
+    order_date = Column(DateTime, default=func.now(), nullable=False, index=True)
     status = Column(Enum('pending', 'processing', 'completed', 'cancelled'), default='pending', nullable=False)
     total_amount = Column(DECIMAL(10, 2), default=0.00)
+    # Sum of the order's payments, maintained by the payment controller
+    # under a row lock; the database derives balance_due from it
+    paid_amount = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    balance_due = Column(DECIMAL(10, 2), Computed("total_amount - paid_amount", persisted=True))
     
     # Relationships
     customer = relationship("Customer", back_populates="orders")
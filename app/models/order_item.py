@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, ForeignKey, Text, Enum, DECIMAL
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -10,6 +10,10 @@ class OrderItem(Base):
     order_id = Column(Integer, ForeignKey("order.order_id"), nullable=False)
     menu_item_id = Column(Integer, ForeignKey("menu_item.menu_item_id"), nullable=False)
     quantity = Column(Integer, default=1, nullable=False)
+    # Price snapshot taken when the item is ordered, so later menu price
+    # changes do not rewrite historic totals
+    unit_price = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    line_total = Column(DECIMAL(10, 2), default=0.00, nullable=False)
     special_request = Column(Text, nullable=True)
     status = Column(Enum('pending', 'preparing', 'ready', 'delivered', 'cancelled'), default='pending', nullable=False)
     
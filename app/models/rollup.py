@@ -0,0 +1,78 @@
+from sqlalchemy import Column, Integer, Date, DateTime, DECIMAL
+
+from app.core.database import Base
+
+# Hourly sales aggregates read by the dashboard, kept up to date by
+# app/controllers/rollup.py. bucket is the start of the hour (order time).
+
+class SalesHourly(Base):
+    __tablename__ = "sales_rollup_hourly"
+    
+    bucket = Column(DateTime, primary_key=True)
+    order_count = Column(Integer, default=0, nullable=False)
+    revenue = Column(DECIMAL(12, 2), default=0.00, nullable=False)
+    paid_amount = Column(DECIMAL(12, 2), default=0.00, nullable=False)
+    
+    def __repr__(self):
+        return f"<SalesHourly(bucket={self.bucket}, orders={self.order_count}, revenue={self.revenue})>"
+
+class ItemSalesHourly(Base):
+    __tablename__ = "item_sales_rollup_hourly"
+    
+    bucket = Column(DateTime, primary_key=True)
+    menu_item_id = Column(Integer, primary_key=True, autoincrement=False)
+    # Category at the time the hour was last computed
+    category_id = Column(Integer, nullable=True, index=True)
+    line_count = Column(Integer, default=0, nullable=False)
+    quantity = Column(Integer, default=0, nullable=False)
+    revenue = Column(DECIMAL(12, 2), default=0.00, nullable=False)
+    
+    def __repr__(self):
+        return f"<ItemSalesHourly(bucket={self.bucket}, item_id={self.menu_item_id}, quantity={self.quantity})>"
+
+class WaiterSalesHourly(Base):
+    __tablename__ = "waiter_sales_rollup_hourly"
+    
+    bucket = Column(DateTime, primary_key=True)
+    waiter_id = Column(Integer, primary_key=True, autoincrement=False)
+    order_count = Column(Integer, default=0, nullable=False)
+    revenue = Column(DECIMAL(12, 2), default=0.00, nullable=False)
+    
+    def __repr__(self):
+        return f"<WaiterSalesHourly(bucket={self.bucket}, waiter_id={self.waiter_id}, orders={self.order_count})>"
+
+
+# Feedback rating histograms, updated in the same transaction as every
+# feedback change by app/controllers/feedback.py. Archived feedback stays
+# counted.
+
+class FeedbackDaily(Base):
+    __tablename__ = "feedback_rollup_daily"
+    
+    day = Column(Date, primary_key=True)
+    feedback_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_1 = Column(Integer, default=0, nullable=False)
+    rating_2 = Column(Integer, default=0, nullable=False)
+    rating_3 = Column(Integer, default=0, nullable=False)
+    rating_4 = Column(Integer, default=0, nullable=False)
+    rating_5 = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<FeedbackDaily(day={self.day}, count={self.feedback_count}, sum={self.rating_sum})>"
+
+# All-time totals: a single row with total_id = 1
+class FeedbackTotal(Base):
+    __tablename__ = "feedback_rollup_total"
+    
+    total_id = Column(Integer, primary_key=True, autoincrement=False)
+    feedback_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_1 = Column(Integer, default=0, nullable=False)
+    rating_2 = Column(Integer, default=0, nullable=False)
+    rating_3 = Column(Integer, default=0, nullable=False)
+    rating_4 = Column(Integer, default=0, nullable=False)
+    rating_5 = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<FeedbackTotal(count={self.feedback_count}, sum={self.rating_sum})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -11,6 +11,13 @@ class Table(Base):
     capacity = Column(Integer, nullable=False)
     status = Column(String(20), default="available") 
     
+    # Occupancy, maintained by the order and payment controllers.
+    # current_order_id has no foreign key: order already references table,
+    # and archived orders must not be blocked by it
+    current_order_id = Column(Integer, nullable=True)
+    seated_since = Column(DateTime, nullable=True)
+    running_total = Column(DECIMAL(10, 2), default=0.00, nullable=False)
+    
     # Relationships
     orders = relationship("Order", back_populates="table")
     
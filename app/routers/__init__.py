@@ -12,6 +12,11 @@ from app.routers import (
     feedback,
     auth,
     dashboard,  # Thêm dashboard module vào đây
+    events,
+    kitchen,
+    batch,
+    floor,
+    analytics,
 )
 
 api_router = APIRouter()
@@ -25,4 +30,9 @@ api_router.include_router(order.router, prefix="/orders", tags=["Orders"])
 api_router.include_router(order_item.router, prefix="/order-items", tags=["Order Items"])
 api_router.include_router(payment.router, prefix="/payments", tags=["Payments"])
 api_router.include_router(feedback.router, prefix="/feedback", tags=["Feedback"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])  # Thêm dashboard router
\ No newline at end of file
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])  # Thêm dashboard router
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
+api_router.include_router(kitchen.router, prefix="/kitchen", tags=["Kitchen"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+api_router.include_router(floor.router, prefix="/floor", tags=["Floor"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
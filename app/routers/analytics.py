@@ -0,0 +1,183 @@
+from typing import Any, Optional
+from datetime import date, datetime, time, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.concurrency import run_in_db_executor
+from app.core.security import get_current_user
+from app.controllers import analytics as analytics_controller
+from app.controllers import menu_engineering as menu_engineering_controller
+from app.controllers import forecast as forecast_controller
+from app.schemas.analytics import SalesReport, MenuEngineeringReport, ForecastReport
+from app.schemas.waitstaff import Waitstaff
+
+router = APIRouter()
+
+def require_manager(current_user: Optional[Waitstaff]) -> None:
+    # Only managers can view analytics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+def resolve_range(start: Optional[datetime], end: Optional[datetime], default_days: int):
+    end = end or datetime.now()
+    start = start or end - timedelta(days=default_days)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    return start, end
+
+def resolve_day_window(start: Optional[date], end: Optional[date], default_days: int):
+    """Whole days start..end inclusive (default: the last default_days days up to today)"""
+    end = end or date.today()
+    start = start or end - timedelta(days=default_days - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+def validate_scope(scope: str) -> None:
+    if scope not in menu_engineering_controller.SCOPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid scope. Must be one of: {', '.join(menu_engineering_controller.SCOPES)}"
+        )
+
+@router.get("/sales", response_model=SalesReport)
+async def read_sales(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = "day",
+    group_by: Optional[str] = None,
+    heatmap: bool = False,
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Orders, units and revenue per hour/day/week bucket over [start, end)
+    (default: the last 30 days), optionally split by item, category, waiter,
+    table or payment method, with an optional hour-of-week heatmap.
+    """
+    require_manager(current_user)
+    if bucket not in analytics_controller.BUCKET_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid bucket. Must be one of: {', '.join(analytics_controller.BUCKET_SECONDS)}"
+        )
+    if group_by is not None and group_by not in analytics_controller.GROUP_BYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group_by. Must be one of: {', '.join(analytics_controller.GROUP_BYS)}"
+        )
+    start, end = resolve_range(start, end, default_days=30)
+    buckets = (end - start).total_seconds() / analytics_controller.BUCKET_SECONDS[bucket]
+    if buckets > analytics_controller.MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too long for {bucket} buckets (max {analytics_controller.MAX_BUCKETS})"
+        )
+    
+    # Fetch and NumPy aggregation run outside the event loop
+    return await run_in_db_executor(
+        analytics_controller.sales_report, db, start, end,
+        bucket=bucket, group_by=group_by, heatmap=heatmap, limit=limit
+    )
+
+@router.get("/menu-engineering", response_model=MenuEngineeringReport)
+async def read_menu_engineering(
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    scope: str = "category",
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Stars, plowhorses, puzzles and dogs: units, revenue, category share
+    and contribution margin of every menu item over whole days start..end
+    (default: the last 30 days), compared within its category or across
+    the menu. Reports are cached per window; refresh=true recomputes.
+    """
+    require_manager(current_user)
+    validate_scope(scope)
+    start, end = resolve_day_window(start, end, default_days=30)
+    report, cached = await run_in_db_executor(
+        menu_engineering_controller.get_report, db, start, end, scope=scope, refresh=refresh
+    )
+    response.headers["X-Cache"] = "HIT" if cached else "MISS"
+    return report
+
+@router.get("/menu-engineering.csv")
+async def export_menu_engineering(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    scope: str = "category",
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    The menu engineering report as a CSV file, one row per menu item.
+    """
+    require_manager(current_user)
+    validate_scope(scope)
+    start, end = resolve_day_window(start, end, default_days=30)
+    report, cached = await run_in_db_executor(
+        menu_engineering_controller.get_report, db, start, end, scope=scope, refresh=refresh
+    )
+    filename = f"menu-engineering-{start:%Y%m%d}-{(end - timedelta(days=1)):%Y%m%d}.csv"
+    return Response(
+        content=menu_engineering_controller.report_csv(report),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Cache": "HIT" if cached else "MISS",
+        }
+    )
+
+@router.get("/forecast", response_model=ForecastReport)
+async def read_forecast(
+    response: Response,
+    day: Optional[date] = None,
+    history_days: int = Query(365, ge=42, le=1100),
+    backtest_weeks: int = Query(4, ge=1, le=26),
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Units of every menu item expected on `day` (default: tomorrow, at most
+    six days ahead) and in the next service, from seasonal naive and
+    exponential smoothing models fitted on the last history_days days.
+    Backtest errors cover the last backtest_weeks weeks of the history.
+    Fitted models are cached; refresh=true refits them.
+    """
+    require_manager(current_user)
+    today = date.today()
+    day = day or today + timedelta(days=1)
+    if not today <= day < today + timedelta(days=7):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="day must be within the next 7 days"
+        )
+    if history_days // 7 < backtest_weeks + 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="history_days must cover at least two weeks more than backtest_weeks"
+        )
+    report, cached = await run_in_db_executor(
+        forecast_controller.forecast, db, day,
+        history_days=history_days, backtest_weeks=backtest_weeks, refresh=refresh
+    )
+    response.headers["X-Cache"] = "HIT" if cached else "MISS"
+    return report
@@ -11,6 +11,7 @@ from app.controllers import waitstaff as waitstaff_controller
 from app.core.security import create_access_token, get_current_user
 from app.schemas.waitstaff import Token, Waitstaff, Login
 from app.core.config import settings
+from app.core.principal import principal_cache
 
 router = APIRouter()
 
@@ -163,4 +164,19 @@ def get_user_info(
     """
     Get current user information
     """
-    return current_user
\ No newline at end of file
+    return current_user
+
+@router.get("/principal-cache/stats", response_model=Dict[str, Any])
+def get_principal_cache_stats(
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Hit rate and eviction counters of the authenticated principal cache
+    """
+    # Only managers can view cache statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return principal_cache.stats()
\ No newline at end of file
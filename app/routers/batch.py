@@ -0,0 +1,191 @@
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.access_policy import get_access
+from app.core.database import engine
+from app.core.security import get_current_user
+from app.routers import customer as customer_router
+from app.routers import order as order_router
+from app.routers import order_item as order_item_router
+from app.routers import payment as payment_router
+from app.routers import table as table_router
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.schemas.customer import Customer, CustomerCreate
+from app.schemas.order import Order, OrderCreate, OrderUpdate
+from app.schemas.order_item import OrderItem, OrderItemCreate
+from app.schemas.payment import Payment, PaymentCreate
+from app.schemas.table import Table, TableUpdate
+from app.schemas.waitstaff import Waitstaff
+
+router = APIRouter()
+
+class Operation(NamedTuple):
+    """A batchable endpoint: its handler plus how to map params onto it"""
+    handler: Callable[..., Any]
+    method: str
+    path: str
+    response_model: Type[BaseModel]
+    body: Optional[Tuple[str, Type[BaseModel]]] = None
+    path_params: Tuple[str, ...] = ()
+    query_params: Tuple[str, ...] = ()
+    # Header parameters that have no meaning inside a batch
+    fixed: Dict[str, Any] = {}
+
+# Sub-operations run through the same handlers as the single endpoints,
+# so validation and permission checks are identical
+OPERATIONS: Dict[str, Operation] = {
+    "customers.get_or_create": Operation(
+        customer_router.get_or_create_customer, "POST", "/api/v1/customers/get-or-create",
+        Customer, body=("customer_in", CustomerCreate)
+    ),
+    "orders.create": Operation(
+        order_router.create_order, "POST", "/api/v1/orders/",
+        Order, body=("order_in", OrderCreate), fixed={"idempotency_key": None}
+    ),
+    "orders.update": Operation(
+        order_router.update_order, "PUT", "/api/v1/orders/{order_id}",
+        Order, body=("order_in", OrderUpdate), path_params=("order_id",)
+    ),
+    "orders.update_status": Operation(
+        order_router.update_order_status, "PUT", "/api/v1/orders/{order_id}/status",
+        Order, path_params=("order_id",), query_params=("status",)
+    ),
+    "order_items.create": Operation(
+        order_item_router.create_order_item, "POST", "/api/v1/order-items/",
+        OrderItem, body=("order_item_in", OrderItemCreate)
+    ),
+    "order_items.update_status": Operation(
+        order_item_router.update_order_item_status, "PUT", "/api/v1/order-items/{order_item_id}/status",
+        OrderItem, path_params=("order_item_id",), query_params=("status",)
+    ),
+    "tables.update": Operation(
+        table_router.update_table, "PUT", "/api/v1/tables/{table_id}",
+        Table, body=("table_in", TableUpdate), path_params=("table_id",)
+    ),
+    "payments.create": Operation(
+        payment_router.create_payment, "POST", "/api/v1/payments/",
+        Payment, body=("payment_in", PaymentCreate), fixed={"idempotency_key": None}
+    ),
+}
+
+REFERENCE = re.compile(r"^\$(\d+)\.([A-Za-z_][\w.]*)$")
+
+def resolve_references(value: Any, results: List[Dict[str, Any]], index: int) -> Any:
+    """Replace "$N.field" strings with fields of earlier results"""
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        if not match:
+            return value
+        ref_index, path = int(match.group(1)), match.group(2)
+        if ref_index >= index:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{value} must reference an earlier operation"
+            )
+        current: Any = results[ref_index]
+        for part in path.split("."):
+            if not isinstance(current, dict) or part not in current:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{value} does not match a field of operation {ref_index}"
+                )
+            current = current[part]
+        return current
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results, index) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results, index) for item in value]
+    return value
+
+def run_operation(
+    db: Session, operation: Operation, params: Dict[str, Any], current_user: Waitstaff
+) -> Dict[str, Any]:
+    path = operation.path
+    kwargs: Dict[str, Any] = dict(operation.fixed)
+    params = dict(params)
+    for name in operation.path_params + operation.query_params:
+        if name not in params:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Missing parameter: {name}"
+            )
+        kwargs[name] = params.pop(name)
+        path = path.replace("{" + name + "}", str(kwargs[name]))
+
+    # Same access policy as the standalone endpoint
+    if not get_access(operation.method, path).allows(current_user.role):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    if operation.body:
+        body_name, body_schema = operation.body
+        try:
+            kwargs[body_name] = body_schema.model_validate(params)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=jsonable_encoder(e.errors())
+            )
+
+    result = operation.handler(db=db, current_user=current_user, **kwargs)
+    return operation.response_model.model_validate(result).model_dump(mode="json")
+
+@router.post("/", response_model=BatchResponse)
+def run_batch(
+    *,
+    batch_in: BatchRequest,
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Run several operations in one request and one database transaction.
+    Params may reference earlier results, e.g. {"customer_id": "$0.customer_id"}.
+    If any operation fails nothing is committed and the error names it.
+    """
+    for index, item in enumerate(batch_in.operations):
+        if item.op not in OPERATIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown operation {item.op} at index {index}. Must be one of: {', '.join(OPERATIONS)}"
+            )
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # Controller commits only release savepoints; the batch commits once
+        db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+        events.defer_events(db)
+        results: List[Dict[str, Any]] = []
+        try:
+            for index, item in enumerate(batch_in.operations):
+                try:
+                    params = resolve_references(item.params, results, index)
+                    results.append(run_operation(db, OPERATIONS[item.op], params, current_user))
+                except HTTPException as e:
+                    transaction.rollback()
+                    return JSONResponse(
+                        status_code=e.status_code,
+                        content={"detail": e.detail, "operation": index, "op": item.op}
+                    )
+            transaction.commit()
+            events.publish_pending(db)
+        except Exception:
+            if transaction.is_active:
+                transaction.rollback()
+            raise
+        finally:
+            db.close()
+
+    return {
+        "results": [
+            {"op": item.op, "result": result}
+            for item, result in zip(batch_in.operations, results)
+        ]
+    }
@@ -1,11 +1,14 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core import etag
 from app.core.security import get_current_user
 from app.controllers import category as category_controller
+from app.controllers import menu_catalog
 from app.schemas.category import Category, CategoryCreate, CategoryUpdate
 from app.schemas.waitstaff import Waitstaff
 
@@ -13,6 +16,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Category])
 def read_categories(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
     db: Session = Depends(get_db)
@@ -20,8 +24,16 @@ def read_categories(
     """
     Retrieve categories.
     """
-    categories = category_controller.get_categories(db, skip=skip, limit=limit)
-    return categories
+    # Served from the pre-serialized menu catalog
+    catalog = menu_catalog.get_catalog(db)
+    category_etag = etag.make_etag("category", skip, limit, version=catalog.version)
+    if etag.is_not_modified(request, category_etag):
+        return etag.not_modified_response(category_etag)
+    
+    content = catalog.filter_categories_json(skip=skip, limit=limit)
+    response = Response(content=content, media_type="application/json")
+    etag.set_etag_headers(response, category_etag)
+    return response
 
 @router.post("/", response_model=Category)
 def create_category(
@@ -57,13 +69,13 @@ def read_category(
     """
     Get category by ID.
     """
-    category = category_controller.get_category(db, category_id=category_id)
-    if not category:
+    content = menu_catalog.get_catalog(db).category_json.get(category_id)
+    if content is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
-    return category
+    return Response(content=content, media_type="application/json")
 
 @router.put("/{category_id}", response_model=Category)
 def update_category(
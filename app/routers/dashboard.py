@@ -1,119 +1,220 @@
-from typing import Any, Dict, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, distinct
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, case
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.cache import SingleFlightCache
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.core.concurrency import run_in_db_executor
+from app.core.security import get_current_user
+from app.controllers import rollup as rollup_controller
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.menu_item import MenuItem
 from app.models.table import Table
 from app.models.waitstaff import Waitstaff
-from app.models.payment import Payment
+from app.schemas.waitstaff import Waitstaff as WaitstaffSchema
+from app.models.rollup import SalesHourly, ItemSalesHourly, WaiterSalesHourly
 
 router = APIRouter()
 
+# Every manager screen polling at once shares one computation
+stats_cache = SingleFlightCache(
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    stale_ttl=settings.DASHBOARD_CACHE_STALE_SECONDS
+)
+
+def compute_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Run the dashboard aggregation queries (blocking)"""
+    # Tổng số đơn hàng và doanh thu, đọc từ bảng tổng hợp theo giờ
+    # (gồm cả đơn đã lưu trữ), không quét toàn bộ lịch sử đơn hàng
+    total_orders, total_revenue = db.query(
+        func.sum(SalesHourly.order_count),
+        func.sum(SalesHourly.revenue)
+    ).one()
+    total_orders = int(total_orders or 0)
+    total_revenue = total_revenue or 0
+
+    # Giá trị trung bình của đơn hàng
+    avg_order_value = 0
+    if total_orders > 0:
+        avg_order_value = total_revenue / total_orders
+
+    # Số bàn đang hoạt động và tổng số bàn, đọc từ trạng thái bàn đã lưu
+    # (không cần quét bảng order)
+    total_tables, active_tables = db.query(
+        func.count(Table.table_id),
+        func.sum(case((Table.status == "occupied", 1), else_=0))
+    ).one()
+    total_tables = total_tables or 0
+    active_tables = int(active_tables or 0)
+
+    # Các đơn hàng gần đây nhất (bàn nạp cùng truy vấn)
+    recent_orders = db.query(Order).options(
+        joinedload(Order.table)
+    ).order_by(Order.order_date.desc()).limit(5).all()
+
+    # Số món của các đơn gần đây, một truy vấn GROUP BY
+    items_counts = {}
+    if recent_orders:
+        items_counts = dict(db.query(
+            OrderItem.order_id, func.count(OrderItem.order_item_id)
+        ).filter(
+            OrderItem.order_id.in_([order.order_id for order in recent_orders])
+        ).group_by(OrderItem.order_id).all())
+
+    # Format đơn hàng để trả về
+    formatted_orders = []
+    for order in recent_orders:
+        formatted_orders.append({
+            "order_id": order.order_id,
+            "table_number": order.table.table_number if order.table else "N/A",
+            "table_id": order.table.table_id if order.table else None,
+            "items_count": items_counts.get(order.order_id, 0),
+            "total_amount": float(order.total_amount),
+            "status": order.status,
+            "order_time": order.order_date.isoformat()
+        })
+
+    # Các món ăn phổ biến nhất
+    item_counts = func.sum(ItemSalesHourly.line_count)
+    popular_items = db.query(
+        MenuItem.menu_item_id,
+        MenuItem.name,
+        item_counts.label('count')
+    ).join(
+        ItemSalesHourly, MenuItem.menu_item_id == ItemSalesHourly.menu_item_id
+    ).group_by(
+        MenuItem.menu_item_id
+    ).order_by(
+        item_counts.desc()
+    ).limit(5).all()
+
+    formatted_popular_items = [
+        {"id": item[0], "name": item[1], "count": int(item[2] or 0)} 
+        for item in popular_items
+    ]
+
+    # Staff performance (số đơn hàng đã phục vụ)
+    waiter_orders = db.query(
+        WaiterSalesHourly.waiter_id,
+        func.sum(WaiterSalesHourly.order_count).label('order_count')
+    ).group_by(WaiterSalesHourly.waiter_id).subquery()
+    staff_performance = db.query(
+        Waitstaff.staff_id,
+        Waitstaff.name,
+        func.coalesce(waiter_orders.c.order_count, 0)
+    ).outerjoin(
+        waiter_orders, Waitstaff.staff_id == waiter_orders.c.waiter_id
+    ).all()
+
+    # Tính % performance dựa trên số đơn hàng
+    max_orders = max([staff[2] for staff in staff_performance]) if staff_performance else 0
+
+    formatted_staff = []
+    for staff in staff_performance:
+        performance = int((staff[2] / max_orders * 100) if max_orders > 0 else 0)
+        formatted_staff.append({
+            "id": staff[0],
+            "name": staff[1],
+            "performance": performance
+        })
+
+    # Sắp xếp theo performance giảm dần
+    formatted_staff.sort(key=lambda x: x["performance"], reverse=True)
+
+    return {
+        "total_orders": total_orders,
+        "total_revenue": float(total_revenue),
+        "avg_order_value": float(avg_order_value),
+        "active_tables": active_tables,
+        "total_tables": total_tables,
+        "recent_orders": formatted_orders,
+        "popular_items": formatted_popular_items,
+        "staff_performance": formatted_staff[:5]  # Chỉ lấy top 5
+    }
+
+def compute_dashboard_stats_with_session() -> Dict[str, Any]:
+    # Refreshes can outlive the request that triggered them, so they use their own session
+    db = SessionLocal()
+    try:
+        return compute_dashboard_stats(db)
+    finally:
+        db.close()
+
+async def load_dashboard_stats() -> Dict[str, Any]:
+    return await run_in_db_executor(compute_dashboard_stats_with_session)
+
 @router.get("/stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics"""
+async def get_dashboard_stats(response: Response):
+    """
+    Get dashboard statistics. Served from a short-lived cache; the Age
+    header says how many seconds old the numbers are.
+    """
     try:
-        # Tổng số đơn hàng
-        total_orders = db.query(func.count(Order.order_id)).scalar() or 0
-        
-        # Tổng doanh thu
-        total_revenue = db.query(func.sum(Order.total_amount)).scalar() or 0
-        
-        # Giá trị trung bình của đơn hàng
-        avg_order_value = 0
-        if total_orders > 0:
-            avg_order_value = total_revenue / total_orders
-        
-        # Số bàn đang hoạt động (có đơn hàng đang pending hoặc processing)
-        active_tables = db.query(func.count(distinct(Order.table_id))).filter(
-            Order.status.in_(["pending", "processing"])
-        ).scalar() or 0
-        
-        # Tổng số bàn
-        total_tables = db.query(func.count(Table.table_id)).scalar() or 0
-        
-        # Các đơn hàng gần đây nhất
-        recent_orders = db.query(Order).order_by(Order.order_date.desc()).limit(5).all()
-        
-        # Format đơn hàng để trả về
-        formatted_orders = []
-        for order in recent_orders:
-            items_count = db.query(func.count(OrderItem.order_item_id)).filter(
-                OrderItem.order_id == order.order_id
-            ).scalar() or 0
-            
-            formatted_orders.append({
-                "order_id": order.order_id,
-                "table_number": order.table.table_number if order.table else "N/A",
-                "table_id": order.table.table_id if order.table else None,
-                "items_count": items_count,
-                "total_amount": float(order.total_amount),
-                "status": order.status,
-                "order_time": order.order_date.isoformat()
-            })
-        
-        # Các món ăn phổ biến nhất
-        popular_items = db.query(
-            MenuItem.menu_item_id,
-            MenuItem.name,
-            func.count(OrderItem.order_item_id).label('count')
-        ).join(
-            OrderItem, MenuItem.menu_item_id == OrderItem.menu_item_id
-        ).group_by(
-            MenuItem.menu_item_id
-        ).order_by(
-            func.count(OrderItem.order_item_id).desc()
-        ).limit(5).all()
-        
-        formatted_popular_items = [
-            {"id": item[0], "name": item[1], "count": item[2]} 
-            for item in popular_items
-        ]
-        
-        # Staff performance (số đơn hàng đã phục vụ)
-        staff_performance = db.query(
-            Waitstaff.staff_id,
-            Waitstaff.name,
-            func.count(Order.order_id).label('order_count')
-        ).outerjoin(
-            Order, Waitstaff.staff_id == Order.waiter_id
-        ).group_by(
-            Waitstaff.staff_id
-        ).all()
-        
-        # Tính % performance dựa trên số đơn hàng
-        max_orders = max([staff[2] for staff in staff_performance]) if staff_performance else 0
-        
-        formatted_staff = []
-        for staff in staff_performance:
-            performance = int((staff[2] / max_orders * 100) if max_orders > 0 else 0)
-            formatted_staff.append({
-                "id": staff[0],
-                "name": staff[1],
-                "performance": performance
-            })
-        
-        # Sắp xếp theo performance giảm dần
-        formatted_staff.sort(key=lambda x: x["performance"], reverse=True)
-        
-        return {
-            "total_orders": total_orders,
-            "total_revenue": float(total_revenue),
-            "avg_order_value": float(avg_order_value),
-            "active_tables": active_tables,
-            "total_tables": total_tables,
-            "recent_orders": formatted_orders,
-            "popular_items": formatted_popular_items,
-            "staff_performance": formatted_staff[:5]  # Chỉ lấy top 5
-        }
+        # Các truy vấn đồng bộ chạy ngoài event loop, chỉ một lần cho mọi request đồng thời
+        stats, age, outcome = await stats_cache.get("dashboard", load_dashboard_stats)
     except Exception as e:
         print(f"Error getting dashboard stats: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving dashboard statistics: {str(e)}"
-        )
\ No newline at end of file
+        )
+    response.headers["Age"] = str(int(age))
+    response.headers["X-Cache"] = outcome
+    return stats
+
+@router.get("/stats/cache", response_model=Dict[str, Any])
+def read_stats_cache(
+    current_user: Optional[WaitstaffSchema] = Depends(get_current_user)
+) -> Any:
+    """
+    Hit, miss and refresh counters and timings of the dashboard stats cache.
+    """
+    # Only managers can view cache statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return stats_cache.stats()
+
+@router.get("/rollups/stats", response_model=Dict[str, Any])
+def read_rollup_stats(
+    current_user: Optional[WaitstaffSchema] = Depends(get_current_user)
+) -> Any:
+    """
+    Pending work and timings of the sales rollup refresher.
+    """
+    # Only managers can view rollup statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return rollup_controller.refresher.stats()
+
+@router.post("/rollups/rebuild", response_model=Dict[str, Any])
+async def rebuild_rollups(
+    *,
+    db: Session = Depends(get_db),
+    days: Optional[int] = Query(None, ge=1),
+    current_user: Optional[WaitstaffSchema] = Depends(get_current_user)
+) -> Any:
+    """
+    Recompute the hourly sales rollups for the last `days` days, or all
+    history when omitted. Use rebuild_rollups.py for large backfills.
+    """
+    # Only managers can rebuild rollups
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    start = datetime.now() - timedelta(days=days) if days else None
+    # The rebuild runs outside the event loop; the cache is only touched from the loop
+    chunks = await run_in_db_executor(rollup_controller.rebuild_all, db, start=start)
+    stats_cache.invalidate("dashboard")
+    return {"chunks": chunks}
@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.core.access_policy import get_access
+from app.core.config import settings
+from app.core.events import broker, TOPICS
+from app.core.principal import resolve_principal_async
+from app.core.security import get_current_user
+from app.schemas.waitstaff import Waitstaff
+
+router = APIRouter()
+
+def parse_topics(topics: Optional[str]) -> List[str]:
+    """Comma separated topic list; empty means every topic"""
+    if not topics:
+        return list(TOPICS)
+    requested = [topic.strip() for topic in topics.split(",") if topic.strip()]
+    invalid = [topic for topic in requested if topic not in TOPICS]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid topic. Must be one of: {', '.join(TOPICS)}"
+        )
+    return requested
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = None,
+    table_id: Optional[int] = None,
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Server-Sent Events stream of order, item, table and payment changes.
+    Filter with ?topics=orders,payments and optionally ?table_id=.
+    """
+    subscription = broker.subscribe(parse_topics(topics), table_id=table_id)
+
+    async def event_stream():
+        try:
+            yield "retry: 3000\n: connected\n\n"
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENT_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.sse
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    topics: Optional[str] = None,
+    table_id: Optional[int] = None
+):
+    """
+    WebSocket variant of /stream. The HTTP auth middleware does not see
+    WebSocket connections, so the principal and the route's access policy
+    are checked here.
+    """
+    user = await resolve_principal_async(websocket)
+    if user is None or not get_access("GET", websocket.url.path).allows(user.role):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        selected = parse_topics(topics)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = broker.subscribe(selected, table_id=table_id)
+    # Quiet or filtered subscriptions may get no event for a long time, so
+    # the disconnect is watched for separately
+    disconnected = asyncio.ensure_future(wait_for_disconnect(websocket))
+    next_event = None
+    try:
+        while True:
+            next_event = asyncio.ensure_future(subscription.queue.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                break
+            await websocket.send_text(next_event.result().payload)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        for task in (next_event, disconnected):
+            if task is not None:
+                task.cancel()
+        broker.unsubscribe(subscription)
+
+async def wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client has gone; clients send nothing we use"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+@router.get("/stats", response_model=Dict[str, Any])
+def get_event_stats(
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Subscriber counts and fan-out timings of the event broker
+    """
+    # Only managers can view broker statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return broker.stats()
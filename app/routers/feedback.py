@@ -1,4 +1,5 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
+from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -34,15 +35,39 @@ def read_feedbacks(
 
 @router.get("/statistics")
 def get_feedback_statistics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
     db: Session = Depends(get_db),
     current_user: Optional[Waitstaff] = Depends(get_current_user)
 ) -> Any:
     """
-    Get feedback statistics.
+    Get feedback statistics, for all time or for the days start..end.
     """
-    stats = feedback_controller.get_rating_statistics(db)
+    if start is not None and end is not None and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    stats = feedback_controller.get_rating_statistics(db, start=start, end=end)
     return stats
 
+@router.post("/statistics/rebuild", response_model=Dict[str, Any])
+def rebuild_feedback_statistics(
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Recompute the rating histograms from the feedback tables.
+    """
+    # Only managers can rebuild statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    days = feedback_controller.rebuild_rating_statistics(db)
+    return {"days": days}
+
 @router.get("/by-order/{order_id}", response_model=List[Feedback])
 def read_feedbacks_by_order(
     order_id: int,
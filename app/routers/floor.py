@@ -0,0 +1,35 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core import etag
+from app.core.security import get_current_user
+from app.controllers import floor as floor_controller
+from app.schemas.floor import FloorSnapshot
+from app.schemas.waitstaff import Waitstaff
+
+router = APIRouter()
+
+@router.get("/", response_model=FloorSnapshot)
+def read_floor(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Snapshot of the whole floor: every table with its active orders,
+    item statuses, seating and order times, waiter and amount due.
+    """
+    # The ETag comes from the data itself, so a write made through any
+    # worker process changes it; an unchanged floor still costs the three
+    # queries, but not the transfer
+    floor_json = floor_controller.get_floor_json(db)
+    floor_etag = etag.make_content_etag(floor_json)
+    if etag.is_not_modified(request, floor_etag):
+        return etag.not_modified_response(floor_etag)
+    
+    response = Response(content=floor_json, media_type="application/json")
+    etag.set_etag_headers(response, floor_etag)
+    return response
@@ -0,0 +1,95 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.security import get_current_user
+from app.controllers import kitchen as kitchen_controller
+from app.schemas.kitchen import (
+    KitchenTicket, KitchenStation, KitchenBump, KitchenStationBump, KitchenBumpResult
+)
+from app.schemas.waitstaff import Waitstaff
+
+router = APIRouter()
+
+def parse_statuses(statuses: Optional[str]) -> List[str]:
+    if not statuses:
+        return list(kitchen_controller.ACTIVE_STATUSES)
+    requested = [s.strip() for s in statuses.split(",") if s.strip()]
+    invalid = [s for s in requested if s not in kitchen_controller.ACTIVE_STATUSES]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Must be one of: {', '.join(kitchen_controller.ACTIVE_STATUSES)}"
+        )
+    return requested
+
+def validate_target_status(target: str) -> None:
+    if target not in kitchen_controller.ALLOWED_FROM:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Must be one of: {', '.join(kitchen_controller.ALLOWED_FROM)}"
+        )
+
+@router.get("/stations", response_model=List[KitchenStation])
+def read_stations(
+    db: Session = Depends(get_db),
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Kitchen stations with their ticket counts per status.
+    """
+    stations = kitchen_controller.get_stations(db)
+    return [
+        {"station": station, "counts": counts}
+        for station, counts in sorted(stations.items())
+    ]
+
+@router.get("/stations/{station}/queue", response_model=List[KitchenTicket])
+def read_station_queue(
+    station: str,
+    statuses: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Active items of a station, oldest order first. Filter with ?statuses=pending,preparing.
+    """
+    return kitchen_controller.get_station_queue(db, station, parse_statuses(statuses))
+
+@router.post("/bump", response_model=KitchenBumpResult)
+def bump_items(
+    *,
+    db: Session = Depends(get_db),
+    bump_in: KitchenBump,
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Move many items, across orders, to a new status in one UPDATE.
+    """
+    validate_target_status(bump_in.status)
+    updated_ids = kitchen_controller.bulk_update_status(db, bump_in.order_item_ids, bump_in.status)
+    return {"status": bump_in.status, "order_item_ids": updated_ids}
+
+@router.post("/stations/{station}/bump", response_model=KitchenBumpResult)
+def bump_station(
+    *,
+    db: Session = Depends(get_db),
+    station: str,
+    bump_in: KitchenStationBump,
+    current_user: Waitstaff = Depends(get_current_user)
+) -> Any:
+    """
+    Move the oldest items of a station from one status to another.
+    """
+    validate_target_status(bump_in.status)
+    if bump_in.from_status not in kitchen_controller.ALLOWED_FROM[bump_in.status]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Items cannot move from {bump_in.from_status} to {bump_in.status}"
+        )
+    updated_ids = kitchen_controller.bump_station(
+        db, station, bump_in.from_status, bump_in.status, limit=bump_in.limit
+    )
+    return {"status": bump_in.status, "order_item_ids": updated_ids}
@@ -3,12 +3,19 @@ import os
 import shutil
 from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.async_database import get_async_db
+from app.core import etag
+from app.core.concurrency import run_in_db_executor
 from app.core.security import get_current_user
 from app.controllers import menu_item as menu_item_controller
+from app.controllers import menu_catalog
+from app.controllers import async_menu_item as async_menu_item_controller
 from app.schemas.menu_item import MenuItem, MenuItemCreate, MenuItemUpdate
 from app.schemas.waitstaff import Waitstaff
 
@@ -20,42 +27,48 @@ UPLOAD_DIR = Path("app/static/images")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.get("/", response_model=List[MenuItem])
-def read_menu_items(
+async def read_menu_items(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
     category_id: Optional[int] = None,
     available_only: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Retrieve menu items.
     """
-    if available_only:
-        menu_items = menu_item_controller.get_available_menu_items(
-            db, skip=skip, limit=limit, category_id=category_id
-        )
-    else:
-        menu_items = menu_item_controller.get_menu_items(
-            db, skip=skip, limit=limit, category_id=category_id
-        )
-    return menu_items
+    # Served from the pre-serialized menu catalog
+    catalog = await async_menu_item_controller.get_catalog(db)
+    menu_etag = etag.make_etag(
+        "menu", skip, limit, category_id, available_only, version=catalog.version
+    )
+    if etag.is_not_modified(request, menu_etag):
+        return etag.not_modified_response(menu_etag)
+    
+    content = catalog.filter_items_json(
+        skip=skip, limit=limit, category_id=category_id, available_only=available_only
+    )
+    response = Response(content=content, media_type="application/json")
+    etag.set_etag_headers(response, menu_etag)
+    return response
 
 @router.get("/{menu_item_id}", response_model=MenuItem)
-def read_menu_item(
+async def read_menu_item(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     menu_item_id: int
 ) -> Any:
     """
     Get menu item by ID.
     """
-    menu_item = menu_item_controller.get_menu_item(db, menu_item_id=menu_item_id)
-    if not menu_item:
+    content = (await async_menu_item_controller.get_catalog(db)).item_json.get(menu_item_id)
+    if content is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Menu item not found"
         )
-    return menu_item
+    return Response(content=content, media_type="application/json")
 
 @router.post("/", response_model=MenuItem)
 def create_menu_item(
@@ -200,7 +213,9 @@ async def upload_menu_item_image(
             detail="Not enough permissions"
         )
     
-    menu_item = menu_item_controller.get_menu_item(db, menu_item_id=menu_item_id)
+    menu_item = await run_in_db_executor(
+        menu_item_controller.get_menu_item, db, menu_item_id=menu_item_id
+    )
     if not menu_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -219,15 +234,18 @@ async def upload_menu_item_image(
     file_path = UPLOAD_DIR / filename
     
     # Save the uploaded file
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
+    def save_image():
+        with file_path.open("wb") as buffer:
+            shutil.copyfileobj(image.file, buffer)
+    await run_in_threadpool(save_image)
     
     # Update the menu item with the image URL
     image_url = f"/static/images/{filename}"
     
     # Update the menu item in the database
     menu_item_update = MenuItemUpdate(image_url=image_url)
-    updated_menu_item = menu_item_controller.update_menu_item(
+    updated_menu_item = await run_in_db_executor(
+        menu_item_controller.update_menu_item,
         db, menu_item_id=menu_item_id, menu_item=menu_item_update
     )
     
@@ -1,32 +1,37 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.async_database import get_async_db
 from app.core.security import get_current_user
+from app.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent
 from app.controllers import order as order_controller
-from app.controllers import customer as customer_controller
+from app.controllers import async_order as async_order_controller
+from app.controllers import order_ingest
+from app.controllers import archive as archive_controller
 from app.schemas.order import Order, OrderCreate, OrderUpdate, OrderWithDetails
 from app.schemas.waitstaff import Waitstaff
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Order])
-def read_orders(
+async def read_orders(
     skip: int = 0, 
     limit: int = 100,
     status: Optional[str] = None,
     customer_id: Optional[int] = None,
     table_id: Optional[int] = None,
     waiter_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[Waitstaff] = Depends(get_current_user)
 ) -> Any:
     """
     Retrieve orders.
     """
-    orders = order_controller.get_orders(
+    orders = await async_order_controller.get_orders(
         db, skip=skip, limit=limit, 
         status=status, customer_id=customer_id,
         table_id=table_id, waiter_id=waiter_id
@@ -38,29 +43,73 @@ def create_order(
     *,
     db: Session = Depends(get_db),
     order_in: OrderCreate,
-    current_user: Optional[Waitstaff] = Depends(get_current_user)
+    current_user: Optional[Waitstaff] = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ) -> Any:
     """
-    Create new order.
+    Create new order. Retries that send the same Idempotency-Key get the
+    first response back instead of creating a second order.
     """
     # Set the current user as the waiter if not specified
     if not order_in.waiter_id:
         order_in.waiter_id = current_user.staff_id
         
     # Create the order
-    return order_controller.create_order(db, order=order_in)
+    return run_idempotent(
+        "orders", idempotency_key, current_user.staff_id, order_in,
+        lambda: order_controller.create_order(db, order=order_in),
+        response_model=Order
+    )
 
-@router.get("/{order_id}", response_model=OrderWithDetails)
-def read_order(
+@router.get("/ingest/stats", response_model=Dict[str, Any])
+def read_ingest_stats(
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Queue depth and batch sizes of the customer order ingest pipeline.
+    """
+    # Only managers can view pipeline statistics
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return order_ingest.ingest.stats()
+
+@router.post("/archive", response_model=Dict[str, Any])
+def archive_orders(
     *,
     db: Session = Depends(get_db),
+    older_than_days: Optional[int] = Query(None, ge=0),
+    max_batches: Optional[int] = Query(None, ge=1),
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Move completed and cancelled orders older than older_than_days
+    (default ARCHIVE_AFTER_DAYS) into the archive tables.
+    """
+    # Only managers can archive orders
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    archived = archive_controller.archive_orders(
+        db, older_than_days=older_than_days, max_batches=max_batches
+    )
+    return {"archived": archived}
+
+@router.get("/{order_id}", response_model=OrderWithDetails)
+async def read_order(
+    *,
+    db: AsyncSession = Depends(get_async_db),
     order_id: int,
     current_user: Optional[Waitstaff] = Depends(get_current_user)
 ) -> Any:
     """
     Get order by ID with all details.
     """
-    order = order_controller.get_order(db, order_id=order_id)
+    order = await async_order_controller.get_order_with_details(db, order_id=order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,6 +136,31 @@ def update_order(
         )
     return order_controller.update_order(db, order_id=order_id, order=order_in)
 
+@router.post("/{order_id}/reconcile-total", response_model=Order)
+def reconcile_order_total(
+    *,
+    db: Session = Depends(get_db),
+    order_id: int,
+    current_user: Optional[Waitstaff] = Depends(get_current_user)
+) -> Any:
+    """
+    Recompute the order total from its items.
+    """
+    # Only managers can reconcile totals
+    if current_user.role != "Manager":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+        
+    order = order_controller.get_order(db, order_id=order_id)
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    return order_controller.reconcile_order_total(db, order_id=order_id)
+
 @router.delete("/{order_id}", response_model=Order)
 def delete_order(
     *,
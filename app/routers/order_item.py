@@ -8,7 +8,6 @@ from app.core.security import get_current_user
 from app.controllers import order_item as order_item_controller
 from app.controllers import order as order_controller
 from app.schemas.order_item import OrderItem, OrderItemCreate, OrderItemUpdate
-from app.schemas.order import OrderUpdate
 from app.schemas.waitstaff import Waitstaff
 
 router = APIRouter()
@@ -55,19 +54,8 @@ def create_order_item(
             detail="Order not found"
         )
         
-    # Create the order item
-    order_item = order_item_controller.create_order_item(db, order_item=order_item_in)
-    
-    # Recalculate order total
-    order_controller.update_order(
-        db, 
-        order_id=order_item_in.order_id, 
-        order=OrderUpdate(
-            total_amount=order_controller.calculate_order_total(db, order_item_in.order_id)
-        )
-    )
-    
-    return order_item
+    # Create the order item (the order total is updated in the same transaction)
+    return order_item_controller.create_order_item(db, order_item=order_item_in)
 
 @router.get("/{order_item_id}", response_model=OrderItem)
 def read_order_item(
@@ -105,21 +93,9 @@ def update_order_item(
             detail="Order item not found"
         )
         
-    updated_item = order_item_controller.update_order_item(
+    return order_item_controller.update_order_item(
         db, order_item_id=order_item_id, order_item=order_item_in
     )
-    
-    # Recalculate order total if quantity changed
-    if "quantity" in order_item_in.dict(exclude_unset=True):
-        order_controller.update_order(
-            db, 
-            order_id=order_item.order_id, 
-            order=OrderUpdate(
-                total_amount=order_controller.calculate_order_total(db, order_item.order_id)
-            )
-        )
-    
-    return updated_item
 
 @router.delete("/{order_item_id}", response_model=OrderItem)
 def delete_order_item(
@@ -137,20 +113,7 @@ def delete_order_item(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order item not found"
         )
-        
-    order_id = order_item.order_id
-    deleted_item = order_item_controller.delete_order_item(db, order_item_id=order_item_id)
-    
-    # Recalculate order total
-    order_controller.update_order(
-        db, 
-        order_id=order_id, 
-        order=OrderUpdate(
-            total_amount=order_controller.calculate_order_total(db, order_id)
-        )
-    )
-    
-    return deleted_item
+    return order_item_controller.delete_order_item(db, order_item_id=order_item_id)
 
 @router.put("/{order_item_id}/status", response_model=OrderItem)
 def update_order_item_status(
@@ -1,10 +1,11 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent
 from app.controllers import payment as payment_controller
 from app.controllers import order as order_controller
 from app.schemas.payment import Payment, PaymentCreate, PaymentUpdate
@@ -57,19 +58,13 @@ def create_payment(
     *,
     db: Session = Depends(get_db),
     payment_in: PaymentCreate,
-    current_user: Optional[Waitstaff] = Depends(get_current_user)
+    current_user: Optional[Waitstaff] = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ) -> Any:
     """
-    Create new payment.
+    Create new payment. Retries that send the same Idempotency-Key get the
+    first response back instead of recording a second payment.
     """
-    # Check if order exists
-    order = order_controller.get_order(db, order_id=payment_in.order_id)
-    if not order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
-        )
-        
     # Validate payment method
     valid_methods = ['cash', 'credit_card', 'debit_card', 'mobile_payment']
     if payment_in.payment_method not in valid_methods:
@@ -77,9 +72,24 @@ def create_payment(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid payment method. Must be one of: {', '.join(valid_methods)}"
         )
+    
+    def create():
+        # Check if order exists
+        order = order_controller.get_order(db, order_id=payment_in.order_id)
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
+            )
         
-    # Create the payment
-    return payment_controller.create_payment(db, payment=payment_in)
+        # Create the payment
+        return payment_controller.create_payment(db, payment=payment_in)
+    
+    # Replays return the stored response before the order is read
+    return run_idempotent(
+        "payments", idempotency_key, current_user.staff_id, payment_in,
+        create, response_model=Payment
+    )
 
 @router.get("/{payment_id}", response_model=Payment)
 def read_payment(
@@ -168,22 +178,21 @@ def check_order_fully_paid(
     current_user: Optional[Waitstaff] = Depends(get_current_user)
 ) -> Any:
     """
-    Check if an order is fully paid.
+    Check if an order is fully paid, from the order's running paid amount
+    and balance in one read.
     """
-    # First check if order exists
     order = order_controller.get_order(db, order_id=order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
-        
-    is_paid = payment_controller.is_order_fully_paid(db, order_id=order_id)
-    total_paid = payment_controller.get_total_payments_for_order(db, order_id=order_id)
     
+    balance_due = order.balance_due if order.balance_due is not None else order.total_amount - order.paid_amount
     return {
         "order_id": order_id,
         "total_amount": float(order.total_amount),
-        "total_paid": float(total_paid),
-        "is_fully_paid": is_paid
-    }
\ No newline at end of file
+        "total_paid": float(order.paid_amount),
+        "balance_due": float(balance_due),
+        "is_fully_paid": balance_due <= 0
+    }
@@ -1,28 +1,39 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.async_database import get_async_db
+from app.core import etag
 from app.core.security import get_current_user
 from app.controllers import table as table_controller
+from app.controllers import async_table as async_table_controller
 from app.schemas.table import Table, TableCreate, TableUpdate
 from app.schemas.waitstaff import Waitstaff
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Table])
-def read_tables(
+async def read_tables(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[Waitstaff] = Depends(get_current_user)  # Làm thành Optional
 ) -> Any:
     """
     Retrieve tables.
     """
     # Bỏ phần kiểm tra current_user
-    tables = table_controller.get_tables(db, skip=skip, limit=limit)
+    table_etag = etag.make_etag("table", skip, limit)
+    if etag.is_not_modified(request, table_etag):
+        return etag.not_modified_response(table_etag)
+    
+    tables = await async_table_controller.get_tables(db, skip=skip, limit=limit)
+    etag.set_etag_headers(response, table_etag)
     return tables
 
 @router.post("/", response_model=Table)
@@ -56,16 +67,16 @@ def create_table(
     return table_controller.create_table(db, table=table_in)
 
 @router.get("/{table_id}", response_model=Table)
-def read_table(
+async def read_table(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     table_id: int,
     current_user: Optional[Waitstaff] = Depends(get_current_user)
 ) -> Any:
     """
     Get table by ID.
     """
-    table = table_controller.get_table(db, table_id=table_id)
+    table = await async_table_controller.get_table(db, table_id=table_id)
     if not table:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,9 +1,10 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core import etag
 from app.core.security import get_current_user
 from app.controllers import waitstaff as waitstaff_controller
 from app.schemas.waitstaff import Waitstaff, WaitstaffCreate, WaitstaffUpdate
@@ -13,6 +14,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[WaitstaffSchema])
 def read_waitstaff(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -28,7 +31,12 @@ def read_waitstaff(
             detail="Not enough permissions"
         )
         
+    waitstaff_etag = etag.make_etag("waitstaff", skip, limit)
+    if etag.is_not_modified(request, waitstaff_etag):
+        return etag.not_modified_response(waitstaff_etag)
+        
     waitstaff = waitstaff_controller.get_waitstaffs(db, skip=skip, limit=limit)
+    etag.set_etag_headers(response, waitstaff_etag)
     return waitstaff
 
 @router.post("/", response_model=WaitstaffSchema)
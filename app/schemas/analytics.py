@@ -0,0 +1,104 @@
+from typing import Optional, List, Union, Dict
+from datetime import date, datetime
+from pydantic import BaseModel
+
+# One group's values per bucket, aligned with SalesReport.buckets
+class SalesSeries(BaseModel):
+    key: Optional[Union[int, str]] = None
+    label: str
+    orders: List[int]
+    quantity: List[int]
+    revenue: List[float]
+    total_orders: int
+    total_quantity: int
+    total_revenue: float
+
+# Hour-of-week matrices: 7 rows (Monday first) x 24 hours
+class SalesHeatmap(BaseModel):
+    orders: List[List[int]]
+    quantity: List[List[int]]
+    revenue: List[List[float]]
+
+class SalesReport(BaseModel):
+    start: datetime
+    end: datetime
+    bucket: str
+    group_by: Optional[str] = None
+    buckets: List[datetime]
+    series: List[SalesSeries]
+    heatmap: Optional[SalesHeatmap] = None
+    rows: int
+    fetch_ms: float
+    aggregate_ms: float
+
+class MenuEngineeringItem(BaseModel):
+    menu_item_id: int
+    name: str
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    price: float
+    cost: Optional[float] = None
+    units_sold: int
+    revenue: float
+    avg_price: float
+    # None for items without a cost
+    unit_margin: Optional[float] = None
+    total_margin: Optional[float] = None
+    menu_mix: float
+    category_share: float
+    category_revenue_share: float
+    popularity: str
+    profitability: str
+    classification: str
+
+class MenuEngineeringReport(BaseModel):
+    start: datetime
+    end: datetime
+    scope: str
+    items: List[MenuEngineeringItem]
+    summary: Dict[str, int]
+    items_without_cost: int
+    rows: int
+    fetch_ms: float
+    compute_ms: float
+
+# Units expected from each model, and from the model selected for the item
+class ForecastValues(BaseModel):
+    seasonal_naive: float
+    smoothing: float
+    selected: float
+
+class ForecastItem(BaseModel):
+    menu_item_id: int
+    name: str
+    model: str
+    alpha: float
+    next_day: ForecastValues
+    next_service: Optional[ForecastValues] = None
+    backtest_wape: Optional[float] = None
+
+class ForecastService(BaseModel):
+    name: str
+    start: datetime
+    end: datetime
+
+class ForecastError(BaseModel):
+    mae: Optional[float] = None
+    wape: Optional[float] = None
+
+class ForecastBacktest(BaseModel):
+    weeks: int
+    daily: Dict[str, ForecastError]
+    hourly: Dict[str, ForecastError]
+
+class ForecastReport(BaseModel):
+    generated_at: datetime
+    history_start: datetime
+    history_end: datetime
+    day: date
+    service: Optional[ForecastService] = None
+    items: List[ForecastItem]
+    backtest: ForecastBacktest
+    rows: int
+    fetch_ms: float
+    fit_ms: float
@@ -0,0 +1,18 @@
+from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+
+# One sub-operation. String params of the form "$N.field" are replaced
+# with that field of the result of operation N (e.g. "$0.customer_id")
+class BatchOperation(BaseModel):
+    op: str
+    params: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=50)
+
+class BatchOperationResult(BaseModel):
+    op: str
+    result: Any = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchOperationResult]
@@ -15,7 +15,7 @@ class FeedbackCreate(FeedbackBase):
 
 # Properties to receive on feedback update
 class FeedbackUpdate(FeedbackBase):
-    rating: Optional[int] = None
+    rating: Optional[int] = Field(None, ge=1, le=5)
     comment: Optional[str] = None
 
 # Properties shared by models stored in DB
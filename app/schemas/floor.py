@@ -0,0 +1,41 @@
+from typing import Optional, List
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel
+
+# One item of an active order
+class FloorOrderItem(BaseModel):
+    order_item_id: int
+    menu_item_id: int
+    menu_item_name: Optional[str] = None
+    quantity: int
+    special_request: Optional[str] = None
+    status: str
+
+# An active (pending or processing) order at a table
+class FloorOrder(BaseModel):
+    order_id: int
+    status: str
+    order_date: datetime
+    waiter_id: Optional[int] = None
+    waiter_name: Optional[str] = None
+    total_amount: Decimal
+    paid_amount: Decimal
+    amount_due: Decimal
+    items: List[FloorOrderItem] = []
+
+# A table with its occupancy and active orders
+class FloorTable(BaseModel):
+    table_id: int
+    table_number: str
+    capacity: int
+    status: Optional[str] = None
+    current_order_id: Optional[int] = None
+    seated_since: Optional[datetime] = None
+    running_total: Decimal
+    amount_due: Decimal
+    orders: List[FloorOrder] = []
+
+# The whole floor as one snapshot
+class FloorSnapshot(BaseModel):
+    tables: List[FloorTable]
@@ -0,0 +1,37 @@
+from typing import Optional, List, Dict
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# One order item as shown on a kitchen display
+class KitchenTicket(BaseModel):
+    order_item_id: int
+    order_id: int
+    table_id: Optional[int] = None
+    menu_item_id: int
+    menu_item_name: Optional[str] = None
+    category_id: Optional[int] = None
+    station: str
+    quantity: int
+    special_request: Optional[str] = None
+    status: str
+    order_date: datetime
+
+# Per-station ticket counts by status
+class KitchenStation(BaseModel):
+    station: str
+    counts: Dict[str, int]
+
+# Move many items, across orders, to a new status
+class KitchenBump(BaseModel):
+    order_item_ids: List[int] = Field(..., min_length=1)
+    status: str
+
+# Move the oldest items of a station from one status to another
+class KitchenStationBump(BaseModel):
+    from_status: str
+    status: str
+    limit: Optional[int] = Field(None, ge=1)
+
+class KitchenBumpResult(BaseModel):
+    status: str
+    order_item_ids: List[int]
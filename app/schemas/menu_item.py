@@ -13,14 +13,17 @@ class MenuItemBase(BaseModel):
     image_url: Optional[str] = None
 
 # Properties to receive on menu item creation
+# Cost is write-only here: the public menu is serialized from MenuItem,
+# managers read costs back through the menu engineering report
 class MenuItemCreate(MenuItemBase):
-    pass
+    cost: Optional[Decimal] = Field(None, ge=0)
 
 # Properties to receive on menu item update
 class MenuItemUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     price: Optional[Decimal] = None
+    cost: Optional[Decimal] = Field(None, ge=0)
     is_available: Optional[bool] = None
     category_id: Optional[int] = None
     image_url: Optional[str] = None
@@ -29,6 +29,8 @@ class OrderInDBBase(OrderBase):
     order_id: int
     order_date: datetime
     total_amount: Decimal = 0.0
+    paid_amount: Decimal = 0.0
+    balance_due: Optional[Decimal] = None
 
     class Config:
         from_attributes = True
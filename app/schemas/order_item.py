@@ -1,4 +1,5 @@
 from typing import Optional, List
+from decimal import Decimal
 from pydantic import BaseModel, Field
 
 from app.schemas.menu_item import MenuItem
@@ -26,6 +27,8 @@ class OrderItemUpdate(OrderItemBase):
 class OrderItemInDBBase(OrderItemBase):
     order_item_id: int
     order_id: int
+    unit_price: Decimal = 0.0
+    line_total: Decimal = 0.0
 
     class Config:
         from_attributes = True
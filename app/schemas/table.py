@@ -1,4 +1,6 @@
 from typing import Optional, List
+from datetime import datetime
+from decimal import Decimal
 from pydantic import BaseModel, Field
 
 # Shared properties
@@ -19,6 +21,9 @@ class TableUpdate(TableBase):
 # Properties shared by models stored in DB
 class TableInDBBase(TableBase):
     table_id: int
+    current_order_id: Optional[int] = None
+    seated_since: Optional[datetime] = None
+    running_total: Decimal = Decimal('0.00')
 
     class Config:
         from_attributes = True
@@ -680,4 +680,26 @@ document.addEventListener('DOMContentLoaded', function() {
     if (window.location.pathname === '/tables') {
         loadTables();
     }
-});
\ No newline at end of file
+});
+// Real-time updates: subscribe to /api/v1/events/stream and call onChange
+// (debounced) when an event arrives, instead of polling the full lists
+function subscribeEvents(topics, onChange, debounceMs = 500) {
+    if (!window.EventSource) {
+        return null;
+    }
+    let timer = null;
+    const source = new EventSource(`/api/v1/events/stream?topics=${topics.join(',')}`, { withCredentials: true });
+    const handler = function(e) {
+        clearTimeout(timer);
+        timer = setTimeout(function() { onChange(e); }, debounceMs);
+    };
+    source.onmessage = handler;
+    [
+        'order.created', 'order.updated', 'order.status', 'order.deleted',
+        'item.created', 'item.updated', 'item.status', 'item.deleted', 'item.batch_status',
+        'table.created', 'table.updated', 'table.deleted',
+        'payment.created', 'payment.updated', 'payment.deleted',
+        'resync'
+    ].forEach(type => source.addEventListener(type, handler));
+    return source;
+}
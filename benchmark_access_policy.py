@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.access_policy import route_policy
+
+# The prefix lists auth_middleware scanned before the compiled policy, as the baseline
+LEGACY_PUBLIC_ROUTES = [
+    '/login', '/admin-login', '/static', '/test', '/', '', '/api/v1/auth/login',
+    '/api/v1/auth/login/json', '/favicon.ico', '/menu', '/order', '/tables',
+    '/api/v1/tables', '/api/v1/tables/',
+]
+LEGACY_PUBLIC_API_ROUTES = [
+    '/api/v1/menu-items', '/api/v1/categories', '/api/v1/customer/orders', '/api/v1/dashboard/stats',
+    '/api/v1/tables', '/api/v1/tables/', '/api/v1/waitstaff', '/api/v1/customers', '/api/v1/orders',
+]
+LEGACY_WAITER_ROUTES = [
+    '/menu', '/tables', '/api/v1/menu-items', '/api/v1/menu-items/', '/api/v1/tables', '/api/v1/tables/',
+]
+LEGACY_AUTHENTICATED_ROUTES = ['/dashboard', '/menu', '/orders', '/tables', '/customers']
+
+def legacy_lookup(method: str, path: str) -> str:
+    if any(path.startswith(route) for route in LEGACY_PUBLIC_ROUTES):
+        return "public"
+    if method == "GET" and any(path.startswith(route) for route in LEGACY_PUBLIC_API_ROUTES):
+        return "public"
+    if any(path.startswith(route) for route in LEGACY_WAITER_ROUTES):
+        return "waiter"
+    if any(path.startswith(route) for route in LEGACY_AUTHENTICATED_ROUTES):
+        return "authenticated"
+    return "manager"
+
+TEMPLATES = [
+    "/", "/login", "/dashboard", "/static/css/{name}.css", "/static/js/vendor/{name}.js",
+    "/api/v1/menu-items/", "/api/v1/menu-items/{id}", "/api/v1/menu-items/{id}/toggle-availability",
+    "/api/v1/categories/{id}", "/api/v1/orders/", "/api/v1/orders/{id}", "/api/v1/orders/{id}/status",
+    "/api/v1/order-items/{id}", "/api/v1/tables/{id}", "/api/v1/kitchen/stations/{name}/queue",
+    "/api/v1/analytics/sales", "/api/v1/analytics/forecast", "/api/v1/payments/{id}",
+    "/api/v1/customer/orders/{name}", "/api/v1/dashboard/stats", "/api/v1/waitstaff/{id}",
+    "/api/v1/unknown/{name}/{id}/deeply/nested/path", "/favicon.ico",
+]
+METHODS = ["GET"] * 6 + ["POST", "PUT", "DELETE", "OPTIONS"]
+
+def mixed_paths(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        path = rng.choice(TEMPLATES).format(id=rng.randint(1, 100000), name=f"x{rng.randint(1, 999)}")
+        requests.append((rng.choice(METHODS), path))
+    return requests
+
+def timed(label: str, func, requests, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for method, path in requests:
+            func(method, path)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<32} {best * 1000:8.2f} ms  {best / len(requests) * 1e6:6.2f} us/lookup")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time route access-policy lookups over mixed request paths")
+    parser.add_argument("--paths", type=int, default=10_000, help="request paths to look up")
+    args = parser.parse_args()
+
+    requests = mixed_paths(args.paths)
+    print(f"{len(requests):,} mixed paths, {len(TEMPLATES)} route shapes")
+    timed("legacy prefix lists", legacy_lookup, requests)
+    timed("compiled policy trie", route_policy.lookup, requests)
+    # '' is in the legacy public list, so its scan stops at once for every path
+    legacy_public = sum(legacy_lookup(method, path) == "public" for method, path in requests)
+    trie_public = sum(route_policy.lookup(method, path).public for method, path in requests)
+    print(f"public decisions: legacy {legacy_public:,}, trie {trie_public:,}")
+
+    # Lookup cost follows the number of path segments, not the number of rules
+    for segments in (1, 4, 8, 16):
+        path = "/" + "/".join(f"s{index}" for index in range(segments))
+        timed(f"trie, {segments:>2}-segment path", route_policy.lookup, [("GET", path)] * args.paths)
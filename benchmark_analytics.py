@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.controllers import analytics as analytics_controller
+from app.controllers import forecast as forecast_controller
+
+def synthetic_items(rows: int, start: datetime, end: datetime, seed: int = 42):
+    """Order items with lunch/dinner peaks, already in columnar form"""
+    rng = np.random.default_rng(seed)
+    start_s, end_s = analytics_controller.to_seconds([start, end])
+    days = rng.integers(0, (end_s - start_s) // 86400, rows)
+    hours = rng.choice([11, 12, 13, 18, 19, 20, 21], rows)
+    timestamps = start_s + days * 86400 + hours * 3600 + rng.integers(0, 3600, rows)
+    order_ids = np.sort(rng.integers(1, rows // 3, rows))
+    return {
+        "timestamp": np.sort(timestamps),
+        "order_id": order_ids,
+        "menu_item_id": rng.integers(1, 501, rows),
+        "waiter_id": rng.integers(1, 41, rows),
+        "table_id": rng.integers(1, 61, rows),
+        "quantity": rng.integers(1, 4, rows).astype(np.float64),
+        "revenue": rng.uniform(3, 40, rows).round(2),
+    }
+
+def timed(label: str, func, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<32} {best * 1000:8.1f} ms")
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the NumPy sales aggregation on synthetic data")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="order items to aggregate")
+    parser.add_argument("--days", type=int, default=365, help="days of history")
+    args = parser.parse_args()
+
+    start, end = forecast_controller.history_window(datetime(2025, 1, 1).date(), args.days)
+    columns = synthetic_items(args.rows, start, end)
+    print(f"{args.rows:,} order items from {start.date()} to {end.date()}")
+
+    def run(bucket, group=None):
+        edges = analytics_controller.bucket_edges(start, end, bucket)
+        groups = columns[group] if group else None
+        analytics_controller.aggregate(
+            columns["timestamp"], columns["order_id"], columns["quantity"], columns["revenue"],
+            edges, groups
+        )
+
+    timed("hour buckets, no grouping", lambda: run("hour"))
+    timed("day buckets by item", lambda: run("day", "menu_item_id"))
+    timed("week buckets by waiter", lambda: run("week", "waiter_id"))
+    timed("day buckets by table", lambda: run("day", "table_id"))
+    timed("hour-of-week heatmap", lambda: analytics_controller.hour_of_week_heatmap(
+        columns["timestamp"], columns["order_id"], columns["quantity"], columns["revenue"]
+    ))
+
+    # Forecast models for 500 items, as fitted by /api/v1/analytics/forecast
+    item_ids = np.arange(1, 501)
+    weeks = (end - start).days // 7
+    for label, step in (("daily", 86400), ("hourly", 3600)):
+        timed(f"{label} forecast fit, 500 items", lambda: forecast_controller.fit(
+            forecast_controller.demand_series(columns, item_ids, start, weeks, step), backtest_weeks=4
+        ))
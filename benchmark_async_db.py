@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from decimal import Decimal
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Table and order list reads under many concurrent connections, sync Session "
+                    "in the threadpool vs AsyncSession, against a scratch database (tables are created and written to)"
+    )
+    parser.add_argument(
+        "--database-url", default=None,
+        help="scratch database to write to (default: a temporary SQLite file); the async URL is derived from it"
+    )
+    parser.add_argument("--connections", type=int, default=500, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=10, help="requests per connection and path")
+    parser.add_argument("--orders", type=int, default=200, help="orders to seed")
+    return parser.parse_args()
+
+# The app reads DATABASE_URL when it is imported
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.async_database import dispose_async_engine, get_async_database_url, get_async_db
+from app.core.database import Base, SessionLocal, engine, get_db
+from app.controllers import async_order as async_order_controller
+from app.controllers import async_table as async_table_controller
+from app.controllers import order as order_controller
+from app.controllers import table as table_controller
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.table import Table
+from app.schemas.order import Order, OrderCreate
+from app.schemas.order_item import OrderItemCreate
+from app.schemas.table import Table as TableSchema
+
+# The same reads as GET /api/v1/tables/ and /api/v1/orders/, without the
+# auth middleware, so only the database layer differs
+bench = FastAPI()
+
+@bench.get("/sync/tables")
+def sync_tables(db: Session = Depends(get_db)):
+    return [TableSchema.model_validate(table) for table in table_controller.get_tables(db)]
+
+@bench.get("/sync/orders")
+def sync_orders(db: Session = Depends(get_db)):
+    return [Order.model_validate(order) for order in order_controller.get_orders(db, limit=50)]
+
+@bench.get("/async/tables")
+async def async_tables(db: AsyncSession = Depends(get_async_db)):
+    return [TableSchema.model_validate(table) for table in await async_table_controller.get_tables(db)]
+
+@bench.get("/async/orders")
+async def async_orders(db: AsyncSession = Depends(get_async_db)):
+    return [Order.model_validate(order) for order in await async_order_controller.get_orders(db, limit=50)]
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        category = Category(name="Benchmark")
+        db.add(category)
+        db.flush()
+        db.add_all([
+            MenuItem(category_id=category.category_id, name=f"Item {index}", price=Decimal("5.00") + index)
+            for index in range(20)
+        ])
+        db.add_all([Table(table_number=f"B{index}", capacity=4) for index in range(40)])
+        db.commit()
+        menu_item_ids = [menu_item_id for (menu_item_id,) in db.query(MenuItem.menu_item_id).all()]
+        table_ids = [table_id for (table_id,) in db.query(Table.table_id).all()]
+        for index in range(args.orders):
+            order_controller.create_order(db, OrderCreate(table_id=table_ids[index % len(table_ids)], order_items=[
+                OrderItemCreate(menu_item_id=menu_item_ids[(index + item) % len(menu_item_ids)]) for item in range(3)
+            ]))
+    finally:
+        db.close()
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+async def run(label: str, path: str):
+    latencies, failures = [], 0
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def connection():
+            nonlocal failures
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(args.connections)))
+        elapsed = time.perf_counter() - started
+    print(
+        f"{label:<20} {len(latencies) / elapsed:10.1f} {percentile(latencies, 0.5) * 1000:10.2f}"
+        f" {percentile(latencies, 0.99) * 1000:10.2f} {failures:8}"
+    )
+
+async def main():
+    print(
+        f"{args.connections} connections x {args.requests} requests, "
+        f"sync {engine.url.get_backend_name()}, async {get_async_database_url().split('://')[0]}"
+    )
+    print(f"{'path':<20} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'failed':>8}")
+    for name in ("tables", "orders"):
+        await run(f"sync {name}", f"/sync/{name}")
+        await run(f"async {name}", f"/async/{name}")
+    await dispose_async_engine()
+
+if __name__ == "__main__":
+    seed()
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Tablets polling the table list with and without If-None-Match, "
+                    "against a scratch database (tables are created and written to)"
+    )
+    parser.add_argument(
+        "--database-url", default=None,
+        help="scratch database to write to (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--tablets", type=int, default=40, help="polling tablets")
+    parser.add_argument("--polls", type=int, default=50, help="polls per tablet")
+    parser.add_argument("--tables", type=int, default=40, help="tables on the floor")
+    parser.add_argument("--write-every", type=int, default=10, help="a table changes once every this many poll rounds")
+    return parser.parse_args()
+
+# The app reads DATABASE_URL when it is imported
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+
+import httpx
+
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.database import Base, SessionLocal, engine
+from app.controllers import table as table_controller
+from app.main import app as application
+from app.models.table import Table
+from app.schemas.table import TableUpdate
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all([Table(table_number=f"B{index}", capacity=4) for index in range(args.tables)])
+        db.commit()
+        return [table_id for (table_id,) in db.query(Table.table_id).all()]
+    finally:
+        db.close()
+
+def change_table(table_id: int, capacity: int):
+    """A waiter edits a table, as PUT /api/v1/tables/{id} would"""
+    db = SessionLocal()
+    try:
+        table_controller.update_table(db, table_id, TableUpdate(capacity=capacity))
+    finally:
+        db.close()
+
+def wire_bytes(response: httpx.Response) -> int:
+    """Status line, headers and body as sent over HTTP/1.1"""
+    headers = sum(len(name) + len(value) + 4 for name, value in response.headers.raw)
+    return len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n") + headers + 2 + len(response.content)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+async def run(label: str, conditional: bool, table_ids):
+    latencies, sent, not_modified = [], 0, 0
+    etags = {}
+    transport = httpx.ASGITransport(app=application)
+    # The auth middleware prints every request; keep the table readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+            async def poll(tablet: int):
+                nonlocal sent, not_modified
+                headers = {"If-None-Match": etags[tablet]} if conditional and tablet in etags else {}
+                started = time.perf_counter()
+                response = await client.get("/api/v1/tables/", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                sent += wire_bytes(response)
+                if response.status_code == 304:
+                    not_modified += 1
+                elif "etag" in response.headers:
+                    etags[tablet] = response.headers["etag"]
+
+            for round in range(args.polls):
+                if round and round % args.write_every == 0:
+                    change_table(table_ids[round % len(table_ids)], 4 + round % 3)
+                await asyncio.gather(*(poll(tablet) for tablet in range(args.tablets)))
+
+    polls = len(latencies)
+    print(
+        f"{label:<18} {not_modified / polls * 100:8.1f}% {sent / 1024:10.1f} {sent / polls:10.0f}"
+        f" {percentile(latencies, 0.5) * 1000:10.2f} {percentile(latencies, 0.99) * 1000:10.2f}"
+    )
+
+async def main(table_ids):
+    print(
+        f"{args.tablets} tablets x {args.polls} polls of GET /api/v1/tables/, {args.tables} tables, "
+        f"a write every {args.write_every} rounds"
+    )
+    print(f"{'client':<18} {'304 rate':>9} {'KiB sent':>10} {'B/poll':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    await run("unconditional", False, table_ids)
+    await run("If-None-Match", True, table_ids)
+
+if __name__ == "__main__":
+    asyncio.run(main(seed()))
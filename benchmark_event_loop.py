@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from decimal import Decimal
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Customer order latency while slow dashboard and analytics requests run, "
+                    "with their database work off and on the event loop, against a scratch "
+                    "database (tables are created and written to)"
+    )
+    parser.add_argument(
+        "--database-url", default=None,
+        help="scratch database to write to (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--customers", type=int, default=10, help="concurrent customers posting orders")
+    parser.add_argument("--orders", type=int, default=5, help="orders per customer")
+    parser.add_argument("--dashboards", type=int, default=4, help="concurrent dashboard pollers")
+    parser.add_argument("--analysts", type=int, default=4, help="concurrent sales report callers")
+    parser.add_argument("--pause-ms", type=float, default=100, help="pause between one caller's requests")
+    parser.add_argument(
+        "--slow-ms", type=float, default=100,
+        help="blocking time added to every dashboard and sales report computation, standing in for a long history"
+    )
+    return parser.parse_args()
+
+# The app reads its settings when it is imported: every dashboard request
+# recomputes, and customer orders are written in the request
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+os.environ["DASHBOARD_CACHE_TTL_SECONDS"] = "0"
+os.environ["DASHBOARD_CACHE_STALE_SECONDS"] = "0"
+os.environ["ORDER_INGEST_MODE"] = "sync"
+
+import httpx
+
+import app.main as main
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token, get_password_hash
+from app.controllers import analytics as analytics_controller
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.table import Table
+from app.models.waitstaff import Waitstaff
+from app.routers import analytics as analytics_router
+from app.routers import dashboard as dashboard_router
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        category = Category(name="Benchmark")
+        db.add(category)
+        db.flush()
+        db.add_all([
+            MenuItem(category_id=category.category_id, name=f"Item {index}", price=Decimal("5.00") + index)
+            for index in range(20)
+        ])
+        db.add_all([Table(table_number=f"B{index}", capacity=4) for index in range(20)])
+        manager = Waitstaff(
+            name="Manager", role="Manager", username="benchmark",
+            password_hash=get_password_hash("benchmark")
+        )
+        db.add(manager)
+        db.commit()
+        menu_item_ids = [menu_item_id for (menu_item_id,) in db.query(MenuItem.menu_item_id).all()]
+        table_ids = [table_id for (table_id,) in db.query(Table.table_id).all()]
+        return menu_item_ids, table_ids, create_access_token(manager.staff_id)
+    finally:
+        db.close()
+
+def slowed(func):
+    """A slower aggregation: the same work plus --slow-ms of blocking time"""
+    def wrapper(*func_args, **kwargs):
+        time.sleep(args.slow_ms / 1000)
+        return func(*func_args, **kwargs)
+    return wrapper
+
+async def run_on_loop(func, *func_args, **kwargs):
+    """The handlers before this change: blocking work straight on the event loop"""
+    return func(*func_args, **kwargs)
+
+@contextlib.contextmanager
+def blocking_handlers():
+    patched = [main, dashboard_router, analytics_router]
+    originals = [module.run_in_db_executor for module in patched]
+    for module in patched:
+        module.run_in_db_executor = run_on_loop
+    try:
+        yield
+    finally:
+        for module, original in zip(patched, originals):
+            module.run_in_db_executor = original
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+async def run(label: str, menu_item_ids, table_ids, token, load: bool):
+    latencies, failures, background = [], 0, 0
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=main.app)
+    headers = {"Authorization": f"Bearer {token}"}
+    # The auth middleware and the order handler print every request; keep the table readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+
+            async def customer(index: int):
+                nonlocal failures
+                for number in range(args.orders):
+                    body = {
+                        "customer": {"name": f"Guest {index}", "contact_number": f"09{index:04d}{number:04d}"},
+                        "table_id": table_ids[index % len(table_ids)],
+                        "order_items": [{"menu_item_id": menu_item_ids[(index + number) % len(menu_item_ids)]}],
+                    }
+                    started = time.perf_counter()
+                    response = await client.post("/api/v1/customer/orders", json=body)
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200 or response.json().get("status") != "success":
+                        failures += 1
+
+            async def poller(path: str):
+                nonlocal background
+                while not done.is_set():
+                    await client.get(path, headers=headers)
+                    background += 1
+                    await asyncio.sleep(args.pause_ms / 1000)
+
+            pollers = []
+            if load:
+                pollers = [asyncio.ensure_future(poller("/api/v1/dashboard/stats")) for _ in range(args.dashboards)]
+                pollers += [asyncio.ensure_future(poller("/api/v1/analytics/sales")) for _ in range(args.analysts)]
+                # Let the slow requests get going first
+                await asyncio.sleep(args.slow_ms / 1000)
+            started = time.perf_counter()
+            await asyncio.gather(*(customer(index) for index in range(args.customers)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await asyncio.gather(*pollers)
+
+    print(
+        f"{label:<30} {len(latencies) / elapsed:10.1f} {percentile(latencies, 0.5) * 1000:10.2f}"
+        f" {percentile(latencies, 0.99) * 1000:10.2f} {failures:8} {background:12}"
+    )
+
+async def main_benchmark(menu_item_ids, table_ids, token):
+    print(
+        f"{args.customers} customers x {args.orders} orders; {args.dashboards} dashboard and "
+        f"{args.analysts} sales report callers, each computation +{args.slow_ms:g} ms"
+    )
+    print(f"{'scenario':<30} {'orders/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'failed':>8} {'slow calls':>12}")
+    await run("orders alone", menu_item_ids, table_ids, token, load=False)
+    dashboard_router.compute_dashboard_stats_with_session = slowed(dashboard_router.compute_dashboard_stats_with_session)
+    analytics_controller.sales_report = slowed(analytics_controller.sales_report)
+    await run("with load, off the loop", menu_item_ids, table_ids, token, load=True)
+    with blocking_handlers():
+        await run("with load, on the loop (before)", menu_item_ids, table_ids, token, load=True)
+
+if __name__ == "__main__":
+    asyncio.run(main_benchmark(*seed()))
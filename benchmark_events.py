@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+import tracemalloc
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.events import EventBroker, TOPIC_ORDERS, TOPICS
+
+async def consume(subscription, received, done):
+    """A connected client: drains its queue and records when each event arrived"""
+    while True:
+        event = await subscription.queue.get()
+        if event.type == "stop":
+            done.set()
+            return
+        received.append((event.id, time.perf_counter()))
+
+def publish_from_thread(broker, events: int, interval: float, published):
+    """Controllers publish after commit from worker threads"""
+    for index in range(events):
+        published[index + 1] = time.perf_counter()
+        broker.publish(TOPIC_ORDERS, "order.status", {"order_id": index, "status": "processing"}, table_id=1)
+        time.sleep(interval)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+async def run(subscribers: int, events: int, interval: float):
+    broker = EventBroker(queue_size=100)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    clients = []
+    for index in range(subscribers):
+        # Mostly dashboards on every topic, some boards filtered to a table
+        if index % 4:
+            subscription = broker.subscribe(TOPICS)
+        else:
+            subscription = broker.subscribe([TOPIC_ORDERS], table_id=1)
+        received, done = [], asyncio.Event()
+        task = asyncio.ensure_future(consume(subscription, received, done))
+        clients.append((subscription, received, done, task))
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_connection = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / subscribers
+
+    published = {}
+    fanout_ms = []
+    publisher = threading.Thread(target=publish_from_thread, args=(broker, events, interval, published))
+    publisher.start()
+    while publisher.is_alive():
+        await asyncio.sleep(interval / 2)
+        fanout_ms.append(broker.last_fanout_ms)
+    publisher.join()
+    broker.publish(TOPIC_ORDERS, "stop", {}, table_id=1)
+    await asyncio.gather(*(done.wait() for _, _, done, _ in clients))
+
+    # Latency from publish to each subscriber's consumer, and to the last one per event
+    latencies, last = [], {}
+    for _, received, _, _ in clients:
+        for event_id, at in received:
+            latency = at - published[event_id]
+            latencies.append(latency)
+            last[event_id] = max(last.get(event_id, 0), latency)
+    dropped = sum(subscription.dropped for subscription, _, _, _ in clients)
+    for subscription, _, _, task in clients:
+        broker.unsubscribe(subscription)
+        task.cancel()
+
+    print(f"{subscribers:,} subscribers, {events} events, {broker.delivered:,} deliveries, {dropped} dropped")
+    print(f"{'memory per connection':<32} {per_connection / 1024:8.1f} KiB")
+    print(f"{'fan-out on the loop (max)':<32} {max(fanout_ms):8.2f} ms")
+    print(f"{'publish to client p50':<32} {percentile(latencies, 0.5) * 1000:8.2f} ms")
+    print(f"{'publish to client p99':<32} {percentile(latencies, 0.99) * 1000:8.2f} ms")
+    print(f"{'publish to last client p99':<32} {percentile(list(last.values()), 0.99) * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time event fan-out from a worker thread to many subscribers")
+    parser.add_argument("--subscribers", type=int, default=1000, help="connected clients")
+    parser.add_argument("--events", type=int, default=200, help="events to publish")
+    parser.add_argument("--interval-ms", type=float, default=5, help="pause between published events")
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.events, args.interval_ms / 1000))
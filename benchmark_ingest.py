@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from decimal import Decimal
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Customer orders per second, synchronous vs group-commit ingest, "
+                    "against a scratch database (tables are created and written to)"
+    )
+    parser.add_argument(
+        "--database-url", default=None,
+        help="scratch database to write to (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--orders", type=int, default=2000, help="orders per path")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent clients submitting orders")
+    parser.add_argument("--connections", type=int, default=4, help="database connections the synchronous path may use")
+    parser.add_argument("--items", type=int, default=3, help="items per order")
+    parser.add_argument("--batch-size", type=int, default=50, help="ingest micro-batch size")
+    parser.add_argument("--batch-ms", type=int, default=20, help="ingest micro-batch wait")
+    return parser.parse_args()
+
+# The app reads DATABASE_URL when it is imported
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.database import Base, SessionLocal, engine
+from app.controllers import order as order_controller
+from app.controllers.order_ingest import FAILED, OrderIngest
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.table import Table
+from app.schemas.customer import CustomerCreate
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+def seed(db):
+    category = Category(name="Benchmark")
+    db.add(category)
+    db.flush()
+    db.add_all([
+        MenuItem(category_id=category.category_id, name=f"Item {index}", price=Decimal("5.00") + index)
+        for index in range(20)
+    ])
+    db.add_all([Table(table_number=f"B{index}", capacity=4) for index in range(20)])
+    db.commit()
+    menu_item_ids = [menu_item_id for (menu_item_id,) in db.query(MenuItem.menu_item_id).all()]
+    table_ids = [table_id for (table_id,) in db.query(Table.table_id).all()]
+    return menu_item_ids, table_ids
+
+def fresh_database():
+    """Both paths start from the same empty tables"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        return seed(db)
+    finally:
+        db.close()
+
+def customer_orders(count: int, menu_item_ids, table_ids):
+    """Customer orders as the public order form sends them, a third from returning customers"""
+    entries = []
+    for index in range(count):
+        # Every third order reuses an earlier customer's contact number
+        number = index if index % 3 else index // 3
+        entries.append((
+            CustomerCreate(name=f"Guest {number}", contact_number=f"09{number:08d}"),
+            OrderCreate(table_id=table_ids[index % len(table_ids)], order_items=[
+                OrderItemCreate(menu_item_id=menu_item_ids[(index + item) % len(menu_item_ids)], quantity=1)
+                for item in range(args.items)
+            ]),
+        ))
+    return entries
+
+def run_clients(label: str, entries, place_order):
+    """args.clients threads place the orders; returns orders/sec and client latencies"""
+    latencies, failures = [], []
+    lock = threading.Lock()
+    position = iter(range(len(entries)))
+
+    def client():
+        while True:
+            with lock:
+                index = next(position, None)
+            if index is None:
+                return
+            started = time.perf_counter()
+            ok = place_order(*entries[index])
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    failures.append(index)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"{label:<24} {len(entries) / elapsed:10.1f} {latencies[len(latencies) // 2] * 1000:10.2f}"
+        f" {latencies[int(len(latencies) * 0.99)] * 1000:10.2f} {len(failures):8}"
+    )
+
+if __name__ == "__main__":
+    print(
+        f"{args.orders} orders of {args.items} items, {args.clients} clients, "
+        f"on {engine.url.get_backend_name()}"
+    )
+    print(f"{'path':<24} {'orders/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'failed':>8}")
+
+    # Synchronous: each request writes its own order, at most --connections at a time
+    connections = threading.Semaphore(args.connections)
+
+    def place_sync(customer, order):
+        with connections:
+            db = SessionLocal()
+            try:
+                order_controller.create_customer_order(db, customer, order)
+                return True
+            except Exception as e:
+                db.rollback()
+                print(f"Order failed: {str(e)}")
+                return False
+            finally:
+                db.close()
+
+    menu_item_ids, table_ids = fresh_database()
+    run_clients(f"sync, {args.connections} connections", customer_orders(args.orders, menu_item_ids, table_ids), place_sync)
+
+    # Ingest: requests only enqueue; one writer on one connection group-commits the batches.
+    # Clients wait for their confirmation, as a client polling its order token would.
+    ingest = OrderIngest(
+        batch_size=args.batch_size, batch_ms=args.batch_ms,
+        queue_size=args.orders, token_ttl=60
+    )
+
+    def place_queued(customer, order):
+        ticket = ingest.submit(customer, order)
+        ticket.done.wait()
+        return ticket.status != FAILED
+
+    menu_item_ids, table_ids = fresh_database()
+    run_clients("ingest, 1 connection", customer_orders(args.orders, menu_item_ids, table_ids), place_queued)
+    ingest.stop()
+    print(f"ingest batches: {ingest.stats()['batches']}, average size {ingest.stats()['avg_batch_size']:.1f}")
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from decimal import Decimal
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time order creation against a scratch database (tables are created and written to)"
+    )
+    parser.add_argument(
+        "--database-url", default=None,
+        help="scratch database to write to (default: a temporary SQLite file)"
+    )
+    parser.add_argument("--orders", type=int, default=200, help="orders per path and order size")
+    parser.add_argument("--sizes", default="1,10,50", help="items per order")
+    return parser.parse_args()
+
+# The app reads DATABASE_URL when it is imported
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+
+from sqlalchemy import event
+
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.database import Base, SessionLocal, engine
+from app.controllers import order as order_controller
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.table import Table
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+class StatementCounter:
+    """Statements and commits sent to the database (round trips)"""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self.on_statement)
+        event.listen(engine, "commit", self.on_commit)
+
+    def on_statement(self, *args):
+        self.statements += 1
+
+    def on_commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = self.commits = 0
+
+def legacy_create_order(db, order: OrderCreate) -> Order:
+    """
+    The previous create_order, as the baseline: three commits and one
+    MenuItem query per line item to compute the total.
+    """
+    db_order = Order(
+        customer_id=order.customer_id,
+        table_id=order.table_id,
+        waiter_id=order.waiter_id,
+        status=order.status,
+        total_amount=Decimal('0.00')
+    )
+    db.add(db_order)
+    db.commit()
+    db.refresh(db_order)
+
+    if order.order_items:
+        for item in order.order_items:
+            db.add(OrderItem(
+                order_id=db_order.order_id,
+                menu_item_id=item.menu_item_id,
+                quantity=item.quantity,
+                special_request=item.special_request,
+                status=item.status
+            ))
+        db.commit()
+
+        total = Decimal('0.00')
+        for order_item in db.query(OrderItem).filter(OrderItem.order_id == db_order.order_id).all():
+            menu_item = db.query(MenuItem).filter(MenuItem.menu_item_id == order_item.menu_item_id).first()
+            if menu_item:
+                total += menu_item.price * Decimal(order_item.quantity)
+        db_order.total_amount = total
+        db.commit()
+        db.refresh(db_order)
+    return db_order
+
+def seed(db, menu_items: int):
+    category = Category(name="Benchmark")
+    db.add(category)
+    db.flush()
+    db.add_all([
+        MenuItem(category_id=category.category_id, name=f"Item {index}", price=Decimal("5.00") + index)
+        for index in range(menu_items)
+    ])
+    table = Table(table_number="B1", capacity=4)
+    db.add(table)
+    db.commit()
+    menu_item_ids = [menu_item_id for (menu_item_id,) in db.query(MenuItem.menu_item_id).all()]
+    return menu_item_ids, table.table_id
+
+def run(label: str, create, counter: StatementCounter, orders):
+    latencies = []
+    counter.reset()
+    for order in orders:
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            create(db, order)
+            latencies.append(time.perf_counter() - started)
+        finally:
+            db.close()
+    latencies.sort()
+    print(
+        f"{label:<28} {counter.statements / len(orders):8.1f} {counter.commits / len(orders):8.1f}"
+        f" {latencies[len(latencies) // 2] * 1000:10.2f} {latencies[int(len(latencies) * 0.95)] * 1000:10.2f}"
+    )
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in args.sizes.split(",")]
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        menu_item_ids, table_id = seed(db, max(sizes))
+    finally:
+        db.close()
+    counter = StatementCounter()
+
+    print(f"{args.orders} orders per row on {engine.url.get_backend_name()}")
+    print(f"{'path':<28} {'stmts':>8} {'commits':>8} {'p50 ms':>10} {'p95 ms':>10}")
+    for size in sizes:
+        orders = [
+            OrderCreate(table_id=table_id, order_items=[
+                OrderItemCreate(menu_item_id=menu_item_ids[index % len(menu_item_ids)], quantity=2)
+                for index in range(size)
+            ])
+            for _ in range(args.orders)
+        ]
+        run(f"legacy, {size} items", legacy_create_order, counter, orders)
+        run(f"create_order, {size} items", order_controller.create_order, counter, orders)
@@ -23,6 +23,9 @@ from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.payment import Payment
 from app.models.feedback import Feedback
+from app.models.idempotency import IdempotencyRecord
+from app.models.archive import OrderArchive, OrderItemArchive, PaymentArchive, FeedbackArchive, ArchiveWatermark
+from app.models.rollup import SalesHourly, ItemSalesHourly, WaiterSalesHourly, FeedbackDaily, FeedbackTotal
 
 from app.core.config import settings
 from app.core.security import get_password_hash
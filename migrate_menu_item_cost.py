@@ -0,0 +1,51 @@
+import os
+import sys
+import csv
+import logging
+import argparse
+from decimal import Decimal
+from sqlalchemy import create_engine, inspect, text
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+engine = create_engine(settings.DATABASE_URL)
+
+def add_cost_column():
+    """Add menu_item.cost if missing"""
+    columns = {column["name"] for column in inspect(engine).get_columns("menu_item")}
+    if "cost" in columns:
+        logger.info("menu_item.cost already exists")
+        return
+    with engine.begin() as conn:
+        logger.info("Adding menu_item.cost")
+        conn.execute(text("ALTER TABLE menu_item ADD COLUMN cost DECIMAL(10, 2) NULL AFTER price"))
+
+def import_costs(path: str):
+    """Set costs from a CSV file with menu_item_id and cost columns"""
+    with open(path, newline="") as f:
+        rows = [
+            {"menu_item_id": int(row["menu_item_id"]), "cost": Decimal(row["cost"]) if row["cost"] else None}
+            for row in csv.DictReader(f)
+        ]
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE menu_item SET cost = :cost WHERE menu_item_id = :menu_item_id"), rows)
+    return len(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add menu item costs for contribution margins")
+    parser.add_argument("--costs", help="CSV file with menu_item_id,cost rows to import")
+    args = parser.parse_args()
+
+    logger.info("Migrating menu item costs")
+    add_cost_column()
+    if args.costs:
+        rows = import_costs(args.costs)
+        logger.info(f"Imported {rows} menu item costs")
+    logger.info("Menu item costs migrated")
@@ -0,0 +1,68 @@
+import os
+import sys
+import logging
+from sqlalchemy import create_engine, inspect, text
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+engine = create_engine(settings.DATABASE_URL)
+
+def add_balance_columns():
+    """Add order.paid_amount, order.balance_due and order_archive.paid_amount if missing"""
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("order")}
+    with engine.begin() as conn:
+        if "paid_amount" not in columns:
+            logger.info("Adding order.paid_amount")
+            conn.execute(text("ALTER TABLE `order` ADD COLUMN paid_amount DECIMAL(10, 2) NOT NULL DEFAULT 0.00"))
+        if "balance_due" not in columns:
+            logger.info("Adding order.balance_due")
+            conn.execute(text(
+                "ALTER TABLE `order` ADD COLUMN balance_due DECIMAL(10, 2) "
+                "GENERATED ALWAYS AS (total_amount - paid_amount) STORED"
+            ))
+        if inspector.has_table("order_archive"):
+            archive_columns = {column["name"] for column in inspector.get_columns("order_archive")}
+            if "paid_amount" not in archive_columns:
+                logger.info("Adding order_archive.paid_amount")
+                conn.execute(text("ALTER TABLE order_archive ADD COLUMN paid_amount DECIMAL(10, 2) NOT NULL DEFAULT 0.00"))
+
+def backfill_paid_amounts(batch_size: int = BATCH_SIZE):
+    """
+    Sum existing payments onto their orders, one primary key range per
+    transaction so the order table is never locked for long.
+    """
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT MAX(order_id) FROM `order`")).scalar() or 0
+
+    updated = 0
+    for start in range(0, max_id + 1, batch_size):
+        end = start + batch_size
+        with engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE `order` "
+                "SET paid_amount = COALESCE(("
+                "    SELECT SUM(payment.amount) FROM payment"
+                "    WHERE payment.order_id = `order`.order_id"
+                "), 0) "
+                "WHERE order_id >= :start AND order_id < :end"
+            ), {"start": start, "end": end})
+        updated += result.rowcount
+        logger.info(f"Backfilled orders {start} - {end - 1} ({updated} rows so far)")
+
+    return updated
+
+if __name__ == "__main__":
+    logger.info("Migrating order balances")
+    add_balance_columns()
+    rows = backfill_paid_amounts()
+    logger.info(f"Order balances migrated ({rows} rows backfilled)")
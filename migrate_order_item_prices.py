@@ -0,0 +1,78 @@
+import os
+import sys
+import logging
+from sqlalchemy import create_engine, inspect, text
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+engine = create_engine(settings.DATABASE_URL)
+
+def add_price_columns():
+    """Add the unit_price and line_total columns to order_item if missing"""
+    columns = {column["name"] for column in inspect(engine).get_columns("order_item")}
+    with engine.begin() as conn:
+        if "unit_price" not in columns:
+            logger.info("Adding order_item.unit_price")
+            conn.execute(text("ALTER TABLE order_item ADD COLUMN unit_price DECIMAL(10, 2) NULL"))
+        if "line_total" not in columns:
+            logger.info("Adding order_item.line_total")
+            conn.execute(text("ALTER TABLE order_item ADD COLUMN line_total DECIMAL(10, 2) NULL"))
+
+def backfill_prices(batch_size: int = BATCH_SIZE):
+    """
+    Copy the current menu price onto existing order items, one primary key
+    range per transaction so the table is never locked for long.
+    """
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT MAX(order_item_id) FROM order_item")).scalar() or 0
+
+    updated = 0
+    for start in range(0, max_id + 1, batch_size):
+        end = start + batch_size
+        with engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE order_item "
+                "SET unit_price = COALESCE(("
+                "    SELECT menu_item.price FROM menu_item"
+                "    WHERE menu_item.menu_item_id = order_item.menu_item_id"
+                "), 0) "
+                "WHERE order_item_id >= :start AND order_item_id < :end "
+                "AND unit_price IS NULL"
+            ), {"start": start, "end": end})
+            conn.execute(text(
+                "UPDATE order_item SET line_total = unit_price * quantity "
+                "WHERE order_item_id >= :start AND order_item_id < :end "
+                "AND line_total IS NULL"
+            ), {"start": start, "end": end})
+        updated += result.rowcount
+        logger.info(f"Backfilled order items {start} - {end - 1} ({updated} rows so far)")
+
+    return updated
+
+def enforce_not_null():
+    """Make the price columns NOT NULL once every row has been backfilled"""
+    if engine.dialect.name != "mysql":
+        logger.info(f"Skipping NOT NULL constraint on {engine.dialect.name}")
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE order_item "
+            "MODIFY COLUMN unit_price DECIMAL(10, 2) NOT NULL DEFAULT 0.00, "
+            "MODIFY COLUMN line_total DECIMAL(10, 2) NOT NULL DEFAULT 0.00"
+        ))
+
+if __name__ == "__main__":
+    logger.info("Migrating order_item prices")
+    add_price_columns()
+    rows = backfill_prices()
+    enforce_not_null()
+    logger.info(f"Order item prices migrated ({rows} rows backfilled)")
\ No newline at end of file
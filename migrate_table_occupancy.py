@@ -0,0 +1,49 @@
+import os
+import sys
+import logging
+from sqlalchemy import inspect, text
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.database import SessionLocal, engine
+from app.controllers import table as table_controller
+from app.models.table import Table
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def add_occupancy_columns():
+    """Add the occupancy columns to table if missing"""
+    columns = {column["name"] for column in inspect(engine).get_columns("table")}
+    with engine.begin() as conn:
+        if "current_order_id" not in columns:
+            logger.info("Adding table.current_order_id")
+            conn.execute(text("ALTER TABLE `table` ADD COLUMN current_order_id INTEGER NULL"))
+        if "seated_since" not in columns:
+            logger.info("Adding table.seated_since")
+            conn.execute(text("ALTER TABLE `table` ADD COLUMN seated_since DATETIME NULL"))
+        if "running_total" not in columns:
+            logger.info("Adding table.running_total")
+            conn.execute(text("ALTER TABLE `table` ADD COLUMN running_total DECIMAL(10, 2) NOT NULL DEFAULT 0.00"))
+
+def backfill_occupancy():
+    """Compute the occupancy of every table from its active orders, one table per transaction"""
+    db = SessionLocal()
+    try:
+        table_ids = [table_id for (table_id,) in db.query(Table.table_id).all()]
+        changed = 0
+        for table_id in table_ids:
+            if table_controller.sync_table_occupancy(db, table_id):
+                changed += 1
+            db.commit()
+        return changed
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    logger.info("Migrating table occupancy")
+    add_occupancy_columns()
+    tables = backfill_occupancy()
+    logger.info(f"Table occupancy migrated ({tables} tables updated)")
@@ -0,0 +1,21 @@
+import os
+import sys
+import logging
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.database import SessionLocal
+from app.controllers import feedback as feedback_controller
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        days = feedback_controller.rebuild_rating_statistics(db)
+    finally:
+        db.close()
+    logger.info(f"Feedback rating statistics rebuilt ({days} days)")
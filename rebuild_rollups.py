@@ -0,0 +1,39 @@
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import inspect, text
+
+# Thêm thư mục hiện tại vào sys.path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from app.core.database import SessionLocal, engine
+from app.controllers import rollup as rollup_controller
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def ensure_order_date_index():
+    """Rollup refreshes read orders by date; add the index on existing databases"""
+    indexes = {index["name"] for index in inspect(engine).get_indexes("order")}
+    if "ix_order_order_date" not in indexes:
+        logger.info("Adding index ix_order_order_date")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_order_order_date ON `order` (order_date)"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the hourly sales rollup tables")
+    parser.add_argument("--days", type=int, default=None,
+                        help="only rebuild the last N days (default: all history)")
+    args = parser.parse_args()
+
+    ensure_order_date_index()
+    start = datetime.now() - timedelta(days=args.days) if args.days else None
+    db = SessionLocal()
+    try:
+        chunks = rollup_controller.rebuild_all(db, start=start)
+    finally:
+        db.close()
+    logger.info(f"Sales rollups rebuilt ({chunks} days)")
@@ -0,0 +1,69 @@
+import os
+import tempfile
+
+# Tests run against a throwaway SQLite database, configured before the app is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from decimal import Decimal
+
+import app.models  # noqa: F401 (registers every model on Base.metadata)
+from app.core.database import Base, SessionLocal, engine
+from app.core.principal import principal_cache
+from app.core.security import create_access_token, get_password_hash
+from app.models.category import Category
+from app.models.menu_item import MenuItem
+from app.models.table import Table
+from app.models.waitstaff import Waitstaff
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+@pytest.fixture
+def manager(db):
+    user = Waitstaff(
+        name="Manager", role="Manager", username="manager",
+        password_hash=get_password_hash("secret")
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+@pytest.fixture
+def manager_headers(manager):
+    return {"Authorization": f"Bearer {create_access_token(manager.staff_id)}"}
+
+@pytest.fixture
+def menu(db):
+    """One category with two menu items, and one table"""
+    category = Category(name="Mains")
+    db.add(category)
+    db.flush()
+    items = [
+        MenuItem(category_id=category.category_id, name="Pho", price=Decimal("10.00")),
+        MenuItem(category_id=category.category_id, name="Bun Cha", price=Decimal("12.00")),
+    ]
+    db.add_all(items)
+    db.add(Table(table_number="T1", capacity=4))
+    db.commit()
+    return items
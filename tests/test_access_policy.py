@@ -0,0 +1,96 @@
+import re
+
+import pytest
+
+from app.core.access_policy import get_access
+from app.main import app
+
+# The prefix lists auth_middleware checked before the policy table. '' and
+# '/' were in public_routes, which made every path public, so the root
+# page is matched exactly here.
+LEGACY_PUBLIC_ROUTES = [
+    '/login', '/admin-login', '/static', '/test', '/api/v1/auth/login', '/api/v1/auth/login/json',
+    '/favicon.ico', '/menu', '/order', '/tables', '/api/v1/tables', '/api/v1/tables/',
+]
+LEGACY_PUBLIC_API_ROUTES = [
+    '/api/v1/menu-items', '/api/v1/categories', '/api/v1/customer/orders', '/api/v1/dashboard/stats',
+    '/api/v1/tables', '/api/v1/tables/', '/api/v1/waitstaff', '/api/v1/customers', '/api/v1/orders',
+]
+LEGACY_WAITER_ROUTES = [
+    '/menu', '/tables', '/api/v1/menu-items', '/api/v1/menu-items/', '/api/v1/tables', '/api/v1/tables/',
+]
+
+def legacy_allows(role, method, path):
+    if path == '/' or any(path.startswith(route) for route in LEGACY_PUBLIC_ROUTES):
+        return True
+    if method == "GET" and any(path.startswith(route) for route in LEGACY_PUBLIC_API_ROUTES):
+        return True
+    if role is None:
+        return False
+    if role == "Waiter" and not any(path.startswith(route) for route in LEGACY_WAITER_ROUTES):
+        return False
+    if path.startswith('/api/v1/menu-items') and method in ("PUT", "POST", "DELETE"):
+        return role == "Manager"
+    return True
+
+def policy_allows(role, method, path):
+    access = get_access(method, path)
+    return access.public or (role is not None and access.allows(role))
+
+ROLES = [None, "Waiter", "Cashier", "Manager"]
+SIGNED_OUT_AND_WAITER = [None, "Waiter"]
+
+# Where the policy deliberately differs from the lists, by reason
+EXPECTED_DIFFERENCES = {
+    # Customer, logout and API docs routes the lists only reached through ''
+    *((role, "POST", "/api/v1/customer/orders") for role in SIGNED_OUT_AND_WAITER),
+    *((role, "POST", "/api/v1/feedback/") for role in SIGNED_OUT_AND_WAITER),
+    *((role, "POST", "/api/v1/auth/logout") for role in SIGNED_OUT_AND_WAITER),
+    *((role, "GET", "/logout") for role in SIGNED_OUT_AND_WAITER),
+    *((role, "GET", path) for role in SIGNED_OUT_AND_WAITER
+      for path in ("/docs", "/docs/oauth2-redirect", "/redoc", "/api/v1/openapi.json")),
+    # Every page reads the signed-in role from check-auth, waiters included
+    ("Waiter", "GET", "/api/v1/auth/check-auth"),
+    # Staff and order data the routers already required a signed-in user for
+    *((None, "GET", path) for path in (
+        "/api/v1/customers/", "/api/v1/customers/1", "/api/v1/orders/", "/api/v1/orders/1",
+        "/api/v1/orders/ingest/stats", "/api/v1/waitstaff/", "/api/v1/waitstaff/1", "/api/v1/waitstaff/me",
+    )),
+    *((None, method, path) for method, path in (
+        ("POST", "/api/v1/tables/"), ("PUT", "/api/v1/tables/1"), ("DELETE", "/api/v1/tables/1"),
+    )),
+    # Prefix matches: '/order' took in '/orders', '/api/v1/dashboard/stats' its cache route
+    *((role, "GET", path) for role in SIGNED_OUT_AND_WAITER for path in ("/orders", "/api/v1/dashboard/stats/cache")),
+}
+
+def route_requests():
+    """Every (method, path) the app serves, path parameters filled in"""
+    requests = set()
+    for route in app.routes:
+        path = re.sub(r"\{[^}]+\}", "1", route.path)
+        for method in getattr(route, "methods", None) or {"GET"}:
+            if method != "HEAD":
+                requests.add((method, path))
+    return sorted(requests)
+
+def test_policy_matches_the_legacy_lists():
+    differences = {
+        (role, method, path)
+        for method, path in route_requests()
+        for role in ROLES
+        if legacy_allows(role, method, path) != policy_allows(role, method, path)
+    }
+    assert differences == EXPECTED_DIFFERENCES
+
+@pytest.mark.parametrize("method,path", [
+    ("POST", "/api/v1/orders/"),
+    ("PUT", "/api/v1/orders/1/status"),
+    ("POST", "/api/v1/order-items/"),
+    ("GET", "/api/v1/kitchen/stations"),
+    ("POST", "/api/v1/batch/"),
+    ("GET", "/api/v1/events/stream"),
+    ("PUT", "/api/v1/menu-items/1/toggle-availability"),
+])
+def test_waiters_only_work_the_menu_and_tables(method, path):
+    assert not get_access(method, path).allows("Waiter")
+    assert get_access(method, path).allows("Manager")
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.controllers import analytics as analytics_controller
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+def test_item_columns_leave_out_cancelled_items_and_orders(db, menu):
+    order_date = datetime(2024, 3, 4, 12)
+    for order_status, item_statuses in (
+        ("completed", ("delivered", "cancelled")),
+        ("cancelled", ("delivered",)),
+    ):
+        order = Order(order_date=order_date, status=order_status)
+        db.add(order)
+        db.flush()
+        for status in item_statuses:
+            db.add(OrderItem(
+                order_id=order.order_id, menu_item_id=menu[0].menu_item_id, quantity=1,
+                unit_price=Decimal("10.00"), line_total=Decimal("10.00"), status=status
+            ))
+    db.commit()
+
+    columns = analytics_controller.load_item_columns(db, order_date, order_date + timedelta(hours=1))
+    assert len(columns["timestamp"]) == 1
+    assert columns["revenue"].sum() == 10.0
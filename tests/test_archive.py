@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.controllers import archive as archive_controller
+from app.core.database import SessionLocal
+from app.models.archive import ArchiveWatermark
+from app.models.order import Order
+from app.models.payment import Payment
+
+def add_order(db, order_date, status="completed"):
+    order = Order(status=status, total_amount=Decimal("20.00"), order_date=order_date)
+    db.add(order)
+    db.commit()
+    return order
+
+def test_watermark_is_not_cached_before_the_first_archive(db):
+    old = datetime.now() - timedelta(days=400)
+    add_order(db, old)
+    assert archive_controller.get_archive_watermark(db) is None
+
+    # Archive from another session, as the cron script would from another process
+    archiver = SessionLocal()
+    try:
+        assert archive_controller.archive_orders(archiver, older_than_days=180) == 1
+    finally:
+        archiver.close()
+
+    assert archive_controller.get_archive_watermark(db) == old
+    assert archive_controller.needs_archive(db, old - timedelta(days=1))
+    orders = archive_controller.orders_source(db, old - timedelta(days=1), datetime.now())
+    assert len(db.execute(select(orders.c.order_id)).all()) == 1
+
+def test_watermark_only_moves_up(db):
+    newer = datetime.now() - timedelta(days=200)
+    older = datetime.now() - timedelta(days=300)
+    add_order(db, newer)
+    archive_controller.archive_orders(db, older_than_days=180)
+    add_order(db, older)
+    archive_controller.archive_orders(db, older_than_days=180)
+
+    assert archive_controller.get_archive_watermark(db) == newer
+
+def test_ensure_watermark_backfills_a_missing_row(db):
+    old = datetime.now() - timedelta(days=400)
+    add_order(db, old)
+    archive_controller.archive_orders(db, older_than_days=180)
+    db.query(ArchiveWatermark).delete()
+    db.commit()
+
+    assert archive_controller.ensure_watermark(db) == old
+
+def test_payments_source_reads_archived_late_payments(db):
+    order = add_order(db, datetime.now() - timedelta(days=400))
+    paid_at = datetime.now() - timedelta(days=100)
+    db.add(Payment(order_id=order.order_id, amount=Decimal("20.00"), payment_method="cash", payment_date=paid_at))
+    db.commit()
+    archive_controller.archive_orders(db, older_than_days=180)
+
+    assert archive_controller.get_archive_watermark(db, "payment_date") == paid_at
+    payments = archive_controller.payments_source(db, paid_at - timedelta(days=1), datetime.now())
+    assert [row.payment_date for row in db.execute(select(payments.c.payment_date))] == [paid_at]
+
+def test_archive_route_backfills_a_missing_watermark(db, client, manager_headers):
+    old = datetime.now() - timedelta(days=400)
+    add_order(db, old)
+    archive_controller.archive_orders(db, older_than_days=180)
+    db.query(ArchiveWatermark).delete()
+    db.commit()
+
+    # Nothing left to archive: the route still restores the watermark, like the script
+    response = client.post("/api/v1/orders/archive", headers=manager_headers)
+    assert response.status_code == 200
+    assert response.json() == {"archived": 0}
+    assert archive_controller.get_archive_watermark(db) == old
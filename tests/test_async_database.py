@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from app.controllers import menu_catalog
+from app.controllers import menu_item as menu_item_controller
+from app.controllers import order as order_controller
+from app.models.table import Table
+from app.schemas.menu_item import MenuItemCreate
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+def test_order_details_are_loaded_without_lazy_loads(client, manager_headers, menu, db):
+    table_id = db.query(Table.table_id).scalar()
+    order = order_controller.create_order(db, OrderCreate(table_id=table_id, order_items=[
+        OrderItemCreate(menu_item_id=menu_item.menu_item_id) for menu_item in menu
+    ]))
+    response = client.get(f"/api/v1/orders/{order.order_id}", headers=manager_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["order_items"]) == 2
+    assert body["table"]["table_number"] == "T1"
+
+def test_tables_read_through_the_async_session(client, menu):
+    response = client.get("/api/v1/tables/")
+    assert response.status_code == 200
+    assert [table["table_number"] for table in response.json()] == ["T1"]
+
+def test_menu_reads_see_sync_writes(client, menu, db):
+    menu_item = menu_item_controller.create_menu_item(db, MenuItemCreate(
+        category_id=menu[0].category_id, name="Goi Cuon", price=Decimal("6.00")
+    ))
+    response = client.get(f"/api/v1/menu-items/{menu_item.menu_item_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Goi Cuon"
+
+def test_install_keeps_a_catalog_refreshed_during_the_load(menu, db):
+    loaded_version = menu_catalog.get_version()
+    # A write refreshes the catalog while the async load is reading
+    refreshed = menu_catalog.refresh_catalog(db)
+    assert menu_catalog.install_catalog([], [], loaded_version) is refreshed
@@ -0,0 +1,69 @@
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+
+# The principal lookup: one Waitstaff row by primary key
+PRINCIPAL_QUERY = re.compile(r"FROM waitstaff\s+WHERE waitstaff\.staff_id = ", re.IGNORECASE)
+
+# Public GETs: the principal is never resolved
+PUBLIC_ENDPOINTS = (
+    "/api/v1/categories/",
+    "/api/v1/menu-items/",
+    "/api/v1/dashboard/stats",
+)
+
+ENDPOINTS = (
+    "/api/v1/auth/check-auth",
+    "/api/v1/auth/user-info",
+    "/api/v1/waitstaff/me",
+    "/api/v1/customers/",
+    "/api/v1/tables/",
+    "/api/v1/orders/",
+    "/api/v1/payments/",
+    "/api/v1/feedback/",
+    "/api/v1/feedback/statistics",
+    "/api/v1/kitchen/stations",
+    "/api/v1/floor/",
+    "/api/v1/analytics/sales",
+)
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def principal_queries(statements):
+    return sum(1 for statement in statements if PRINCIPAL_QUERY.search(statement))
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_authenticated_get_loads_the_principal_once(client, manager_headers, path):
+    # The principal cache starts empty (database fixture)
+    with count_statements() as statements:
+        response = client.get(path, headers=manager_headers)
+    assert response.status_code == 200
+    assert principal_queries(statements) == 1
+
+    # Cached principal: no Waitstaff row is loaded at all
+    with count_statements() as statements:
+        response = client.get(path, headers=manager_headers)
+    assert response.status_code == 200
+    assert principal_queries(statements) == 0
+
+@pytest.mark.parametrize("path", PUBLIC_ENDPOINTS)
+def test_public_get_never_loads_the_principal(client, manager_headers, path):
+    with count_statements() as statements:
+        response = client.get(path, headers=manager_headers)
+    assert response.status_code == 200
+    assert principal_queries(statements) == 0
@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.controllers import menu_catalog
+from app.controllers import menu_item as menu_item_controller
+from app.core import etag, events
+from app.core.database import engine
+from app.models.table import Table
+from app.schemas.menu_item import MenuItemCreate
+
+def test_failed_batch_leaves_the_table_version(client, manager_headers, menu, db):
+    table_id = db.query(Table.table_id).scalar()
+    version = etag.get_version("table")
+    response = client.post("/api/v1/batch/", headers=manager_headers, json={"operations": [
+        {"op": "tables.update", "params": {"table_id": table_id, "capacity": 6}},
+        {"op": "tables.update", "params": {"table_id": 999, "capacity": 2}},
+    ]})
+    assert response.status_code == 404
+    assert response.json()["operation"] == 1
+    assert etag.get_version("table") == version
+
+def test_successful_batch_bumps_the_table_version(client, manager_headers, menu, db):
+    table_id = db.query(Table.table_id).scalar()
+    version = etag.get_version("table")
+    response = client.post("/api/v1/batch/", headers=manager_headers, json={"operations": [
+        {"op": "tables.update", "params": {"table_id": table_id, "capacity": 6}},
+    ]})
+    assert response.status_code == 200
+    assert etag.get_version("table") > version
+
+def test_rolled_back_outer_transaction_leaves_the_catalog(menu):
+    version = menu_catalog.get_version()
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # As the batch router runs its operations
+        db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+        events.defer_events(db)
+        menu_item_controller.create_menu_item(db, MenuItemCreate(
+            category_id=menu[0].category_id, name="Goi Cuon", price=Decimal("6.00")
+        ))
+        transaction.rollback()
+        db.close()
+    assert menu_catalog.get_version() == version
@@ -0,0 +1,36 @@
+import asyncio
+
+from app.core.cache import MISS, SingleFlightCache
+
+def test_invalidate_during_a_miss_does_not_store_the_old_value():
+    cache = SingleFlightCache(ttl=60, stale_ttl=60)
+    release = asyncio.Event()
+    computed = []
+
+    async def compute():
+        computed.append(len(computed))
+        await release.wait()
+        return len(computed)
+
+    async def run():
+        waiter = asyncio.ensure_future(cache.get("key", compute))
+        await asyncio.sleep(0)
+        cache.invalidate("key")
+        release.set()
+        value, age, outcome = await waiter
+        assert (value, age, outcome) == (1, 0.0, MISS)
+        # The invalidated result was not kept: the next caller computes again
+        value, _, outcome = await cache.get("key", compute)
+        assert (value, outcome) == (2, MISS)
+
+    asyncio.run(run())
+
+def test_rollup_rebuild_invalidates_the_dashboard_stats(client, manager_headers):
+    from app.routers.dashboard import stats_cache
+    stats_cache.invalidate("dashboard")
+    first = client.get("/api/v1/dashboard/stats", headers=manager_headers)
+    assert first.headers["X-Cache"] == MISS
+    response = client.post("/api/v1/dashboard/rollups/rebuild", headers=manager_headers)
+    assert response.status_code == 200
+    again = client.get("/api/v1/dashboard/stats", headers=manager_headers)
+    assert again.headers["X-Cache"] == MISS
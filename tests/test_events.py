@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.events import broker
+from app.routers import events as events_router
+
+class ClosingWebSocket:
+    """A client that connects, then goes away without ever being sent anything"""
+
+    def __init__(self):
+        self.url = SimpleNamespace(path="/api/v1/events/ws")
+        self.accepted = False
+
+    async def accept(self):
+        self.accepted = True
+
+    async def close(self, code=1000):
+        pass
+
+    async def receive(self):
+        await asyncio.sleep(0.05)
+        return {"type": "websocket.disconnect", "code": 1001}
+
+    async def send_text(self, data):
+        raise AssertionError("no event was published")
+
+def test_websocket_unsubscribes_a_quiet_client_on_disconnect(monkeypatch):
+    async def principal(websocket):
+        return SimpleNamespace(role="Manager")
+    monkeypatch.setattr(events_router, "resolve_principal_async", principal)
+    websocket = ClosingWebSocket()
+
+    async def run():
+        # No payment event ever arrives, yet the handler returns and releases the subscription
+        await asyncio.wait_for(events_router.websocket_events(websocket, topics="payments"), timeout=2)
+
+    asyncio.run(run())
+    assert websocket.accepted
+    assert broker.subscriber_count() == 0
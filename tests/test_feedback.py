@@ -0,0 +1,23 @@
+from app.controllers import feedback as feedback_controller
+from app.models.order import Order
+from app.schemas.feedback import FeedbackCreate
+
+def test_update_rejects_bad_ratings_and_ignores_null(db, client, manager_headers):
+    order = Order()
+    db.add(order)
+    db.commit()
+    feedback = feedback_controller.create_feedback(db, FeedbackCreate(order_id=order.order_id, rating=4))
+    path = f"/api/v1/feedback/{feedback.feedback_id}"
+
+    response = client.put(path, json={"order_id": order.order_id, "rating": 6}, headers=manager_headers)
+    assert response.status_code == 422
+
+    response = client.put(
+        path, json={"order_id": order.order_id, "rating": None, "comment": "Great pho"}, headers=manager_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["rating"] == 4
+
+    stats = feedback_controller.get_rating_statistics(db)
+    assert stats["total"] == 1
+    assert stats["ratings"][4] == 1
@@ -0,0 +1,37 @@
+from sqlalchemy import update
+
+from app.controllers import order as order_controller
+from app.models.table import Table
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+def test_floor_etag_is_stable_and_follows_menu_renames(client, menu, manager_headers, db):
+    # The floor shows menu names through its active orders
+    order_controller.create_order(db, OrderCreate(
+        table_id=db.query(Table.table_id).scalar(),
+        order_items=[OrderItemCreate(menu_item_id=menu[0].menu_item_id)]
+    ))
+    response = client.get("/api/v1/floor", headers=manager_headers)
+    assert response.status_code == 200
+    assert "generated_at" not in response.json()
+    floor_etag = response.headers["ETag"]
+
+    cached = client.get("/api/v1/floor", headers={**manager_headers, "If-None-Match": floor_etag})
+    assert cached.status_code == 304
+
+    renamed = client.put(
+        f"/api/v1/menu-items/{menu[0].menu_item_id}", json={"name": "Pho Bo"}, headers=manager_headers
+    )
+    assert renamed.status_code == 200
+    response = client.get("/api/v1/floor", headers={**manager_headers, "If-None-Match": floor_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != floor_etag
+
+def test_floor_etag_follows_writes_this_process_did_not_see(client, menu, manager_headers, db):
+    floor_etag = client.get("/api/v1/floor", headers=manager_headers).headers["ETag"]
+    # As another worker process would: a committed write with no local event
+    db.execute(update(Table).values(capacity=8))
+    db.commit()
+    response = client.get("/api/v1/floor", headers={**manager_headers, "If-None-Match": floor_etag})
+    assert response.status_code == 200
+    assert response.json()["tables"][0]["capacity"] == 8
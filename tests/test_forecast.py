@@ -0,0 +1,53 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from app.controllers import forecast as forecast_controller
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+def place_order_today(db, menu):
+    order = Order(table_id=1, status="pending", total_amount=Decimal("10.00"), order_date=datetime.now())
+    db.add(order)
+    db.flush()
+    db.add(OrderItem(
+        order_id=order.order_id, menu_item_id=menu[0].menu_item_id, quantity=1,
+        unit_price=Decimal("10.00"), line_total=Decimal("10.00")
+    ))
+    db.commit()
+
+def test_demand_series_is_float_for_empty_history():
+    start = datetime(2025, 1, 6)
+    columns = {
+        "timestamp": np.array([], dtype=np.int64),
+        "menu_item_id": np.array([], dtype=np.int64),
+        "quantity": np.array([], dtype=np.float64),
+    }
+    series = forecast_controller.demand_series(columns, np.array([1, 2]), start, 8, 86400)
+    assert series.dtype == np.float64
+    assert series.shape == (2, 8, 7)
+    model = forecast_controller.fit(series, backtest_weeks=4)
+    assert not model["smoothing"].any()
+
+def test_forecast_with_no_history(db, menu):
+    # The only order is from today, which is outside the history window
+    place_order_today(db, menu)
+    forecast_controller.forecast_cache.clear()
+
+    report, cached = forecast_controller.forecast(db, date.today() + timedelta(days=1), history_days=56)
+
+    assert not cached
+    assert report["rows"] == 0
+    assert [item["next_day"]["selected"] for item in report["items"]] == [0.0, 0.0]
+    assert report["backtest"]["daily"]["selected"]["wape"] is None
+
+def test_forecast_endpoint_with_no_history(client, db, menu, manager_headers):
+    place_order_today(db, menu)
+
+    response = client.get(
+        "/api/v1/analytics/forecast?history_days=56&refresh=true", headers=manager_headers
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
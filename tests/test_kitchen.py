@@ -0,0 +1,64 @@
+import pytest
+
+from app.controllers import kitchen as kitchen_controller
+from app.controllers import order as order_controller
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+@pytest.fixture(autouse=True)
+def board(db):
+    kitchen_controller.board.load(db)
+    yield kitchen_controller.board
+    # The next test's database starts empty
+    kitchen_controller.board.loaded_at = None
+
+def place_order(db, menu):
+    return order_controller.create_order(db, OrderCreate(order_items=[
+        OrderItemCreate(menu_item_id=menu_item.menu_item_id) for menu_item in menu
+    ]))
+
+def test_queue_returns_copies(db, menu):
+    place_order(db, menu)
+    queue = kitchen_controller.get_station_queue(db, "Mains")
+    assert [ticket.status for ticket in queue] == ["pending", "pending"]
+
+    kitchen_controller.bulk_update_status(db, [queue[0].order_item_id], "preparing")
+    assert queue[0].status == "pending"
+    assert [ticket.status for ticket in kitchen_controller.get_station_queue(db, "Mains")] == ["preparing", "pending"]
+
+def test_cancelled_order_leaves_the_board(db, menu, board):
+    kept, cancelled = place_order(db, menu), place_order(db, menu)
+    order_controller.update_order_status(db, cancelled.order_id, "cancelled")
+
+    order_ids = {ticket.order_id for ticket in kitchen_controller.get_station_queue(db, "Mains")}
+    assert order_ids == {kept.order_id}
+    # Nor does a full resync bring it back
+    board.load(db)
+    order_ids = {ticket.order_id for ticket in kitchen_controller.get_station_queue(db, "Mains")}
+    assert order_ids == {kept.order_id}
+
+def test_event_during_a_pending_load_is_not_overwritten(db, menu, board, monkeypatch):
+    order = place_order(db, menu)
+    delivered = order.order_items[0].order_item_id
+    ticket_query = kitchen_controller._ticket_query
+
+    class RacingQuery:
+        """Rows read before an item is delivered, returned after its event"""
+
+        def __init__(self, query):
+            self.query = query
+
+        def filter(self, *criteria):
+            return RacingQuery(self.query.filter(*criteria))
+
+        def all(self):
+            rows = self.query.all()
+            board.on_order_item_event("item.status", {"order_item_id": delivered, "status": "delivered"})
+            return rows
+
+    monkeypatch.setattr(kitchen_controller, "_ticket_query", lambda db: RacingQuery(ticket_query(db)))
+    board._load_pending(db)
+    monkeypatch.setattr(kitchen_controller, "_ticket_query", ticket_query)
+    assert delivered not in board.tickets
+    # Its row was re-queued: the next read takes the committed status
+    assert delivered in board.pending_items
@@ -0,0 +1,23 @@
+import numpy as np
+
+from app.controllers import menu_engineering as menu_engineering_controller
+
+def test_uncosted_items_are_unknown_and_left_out_of_the_average():
+    units = np.array([10.0, 10.0, 10.0])
+    revenue = np.array([100.0, 100.0, 200.0])
+    price = np.array([10.0, 10.0, 20.0])
+    cost = np.array([4.0, 6.0, np.nan])
+    result = menu_engineering_controller.classify(units, revenue, price, cost, np.zeros(3, dtype=np.int64))
+
+    # Average margin of the costed items is 5: the uncosted item's 20 is not counted
+    assert result["profitable"].tolist() == [True, False, False]
+    classes = [menu_engineering_controller.CLASSES[index] for index in result["classification"]]
+    assert classes == ["star", "plowhorse", "unknown"]
+    assert np.isnan(result["unit_margin"][2])
+
+def test_report_of_uncosted_menu(client, menu, manager_headers):
+    response = client.get("/api/v1/analytics/menu-engineering?refresh=true", headers=manager_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["summary"]["unknown"] == 2
+    assert [item["unit_margin"] for item in report["items"]] == [None, None]
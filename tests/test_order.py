@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+from app.controllers import order as order_controller
+from app.models.table import Table
+from app.schemas.order import OrderCreate
+from app.schemas.order_item import OrderItemCreate
+
+def test_reconcile_moves_the_table_running_total_with_the_order(db, menu):
+    table = db.query(Table).first()
+    order = order_controller.create_order(db, OrderCreate(table_id=table.table_id, order_items=[
+        OrderItemCreate(menu_item_id=menu[0].menu_item_id, quantity=2)
+    ]))
+    db.refresh(table)
+    assert table.running_total == Decimal("20.00")
+
+    # Both counters drift the same way, e.g. after a manual edit
+    order.total_amount = Decimal("25.00")
+    table.running_total = Decimal("25.00")
+    db.commit()
+
+    order_controller.reconcile_order_total(db, order.order_id)
+    db.expire_all()
+    assert order.total_amount == Decimal("20.00")
+    assert table.running_total == Decimal("20.00")
@@ -0,0 +1,31 @@
+from decimal import Decimal
+
+from app.controllers import order_item as order_item_controller
+from app.models.order import Order
+from app.models.table import Table
+from app.schemas.order_item import OrderItemCreate, OrderItemUpdate
+
+def test_moving_an_item_moves_its_total(db, menu):
+    table = db.query(Table).first()
+    first, second = Order(table_id=table.table_id), Order(table_id=table.table_id)
+    db.add_all([first, second])
+    db.commit()
+    item = order_item_controller.create_order_item(db, OrderItemCreate(
+        order_id=first.order_id, menu_item_id=menu[0].menu_item_id, quantity=2
+    ))
+
+    # Only the order changes: the line total leaves one order for the other
+    order_item_controller.update_order_item(db, item.order_item_id, OrderItemUpdate(order_id=second.order_id))
+    db.expire_all()
+    assert first.total_amount == Decimal("0.00")
+    assert second.total_amount == Decimal("20.00")
+    assert table.running_total == Decimal("20.00")
+
+    # Moved back with a new quantity
+    order_item_controller.update_order_item(
+        db, item.order_item_id, OrderItemUpdate(order_id=first.order_id, quantity=3)
+    )
+    db.expire_all()
+    assert first.total_amount == Decimal("30.00")
+    assert second.total_amount == Decimal("0.00")
+    assert table.running_total == Decimal("30.00")